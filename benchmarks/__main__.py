@@ -0,0 +1,54 @@
+"""
+Run the benchmarks of the calendar, the star engine, the chart and its renderer, and the chart view.
+
+    python -m benchmarks [--filter calendar] [-n 100] [--seed 0] [--output results.json]
+    python -m benchmarks --compare before.json after.json
+
+Run from the repository root. Every operation is timed on its own and the p50, p95 and operations per second
+of every benchmark are printed and, with `--output`, written as JSON which can be diffed or compared between commits.
+The inputs are drawn from generators with fixed seeds, so two runs with the same `--seed` time the same work.
+The new moon ephemeris and the lunar table are installed first, as in a deployed worker, unless `--no-tables` is given.
+They are mapped from new_moons.bin and lunar_table.bin (see `manage.py build_lunar_table`), or built in memory.
+"""
+
+import argparse
+
+from core.tables import LunarTable, NewMoonEphemeris
+
+from . import bench_calendar, bench_chart, bench_date, bench_stars, bench_view  # noqa: F401, register the benchmarks
+from .runner import compare, get_benchmarks, metadata, run, save
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', action='append', default=[], help='only run the benchmarks whose name contains this, may be repeated')
+    parser.add_argument('-n', type=int, default=100, help='operations per benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--no-tables', action='store_true', help='do not install the lunar table and the new moon ephemeris')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two result files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    names = [name for name in get_benchmarks() if not args.filter or any(part in name for part in args.filter)]
+    if args.list:
+        print('\n'.join(names))
+        return
+
+    if not args.no_tables:
+        NewMoonEphemeris.install(NewMoonEphemeris.load_or_build('new_moons.bin', *NewMoonEphemeris.k_range(1800, 2200), save=False))
+        LunarTable.install(LunarTable.load_or_build('lunar_table.bin', 1899, 2100, save=False))
+
+    results = run(names, args.n, args.seed)
+    if args.output:
+        meta = metadata(args.n, args.seed)
+        meta['tables'] = not args.no_tables
+        save(args.output, meta, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import random
+
+from core.lunaryear import LunarYearUtil
+from core.utils import DateUtil
+
+from .runner import Case, benchmark, random_birthdates
+
+
+def clear_calendar_caches() -> None:
+    LunarYearUtil.year_info.cache_clear()
+    DateUtil._new_moon_series_cached.cache_clear()
+
+
+@benchmark('calendar.jd_from_date')
+def jd_from_date(rng: random.Random, n: int) -> Case:
+    return Case([lambda date=date: DateUtil.jd_from_date(date) for date in random_birthdates(rng, n)])
+
+
+@benchmark('calendar.solar_to_lunar.cold')
+def solar_to_lunar_cold(rng: random.Random, n: int) -> Case:
+    dates = [date.empty_hms() for date in random_birthdates(rng, n)]
+    return Case([lambda date=date: DateUtil.solar_to_lunar(date) for date in dates], prepare=clear_calendar_caches, warmup=False)
+
+
+@benchmark('calendar.solar_to_lunar.warm')
+def solar_to_lunar_warm(rng: random.Random, n: int) -> Case:
+    dates = [date.empty_hms() for date in random_birthdates(rng, n)]
+    return Case([lambda date=date: DateUtil.solar_to_lunar(date) for date in dates])
+
+
+@benchmark('calendar.lunar_to_solar')
+def lunar_to_solar(rng: random.Random, n: int) -> Case:
+    dates = [DateUtil.solar_to_lunar(date.empty_hms()) for date in random_birthdates(rng, n)]
+    return Case([lambda date=date: DateUtil.lunar_to_solar(date) for date in dates])
@@ -0,0 +1,38 @@
+import random
+
+from core.exceptions import InvalidPercentValue
+from core.main import LaSoTuVi
+
+from .runner import Case, benchmark, random_birthdates
+
+
+def random_charts(rng: random.Random, n: int, drawable: bool = False):
+    """
+    Draw `n` charts as (year, month, day, hour, minute, gender) tuples.
+    With `drawable`, charts with so many stars in a cell that the renderer rejects them are skipped.
+    """
+
+    charts = []
+    while len(charts) < n:
+        for date in random_birthdates(rng, n - len(charts)):
+            args = (date.year, date.month, date.day, date.hour, date.minute, rng.choice([1, -1]))
+            if drawable:
+                try:
+                    LaSoTuVi(*args[:5], gender=args[5], cur_year=2024).get_image_bytes()
+                except InvalidPercentValue:
+                    continue
+            charts.append(args)
+    return charts
+
+
+@benchmark('chart.LaSoTuVi')
+def chart(rng: random.Random, n: int) -> Case:
+    # Warm the code paths once, the timed charts are all different so their star caches miss
+    LaSoTuVi(2000, 1, 1, 12, 0, gender=1, cur_year=2024)
+    return Case([lambda args=args: LaSoTuVi(*args[:5], gender=args[5], cur_year=2024) for args in random_charts(rng, n)], warmup=False)
+
+
+@benchmark('chart.get_image')
+def get_image(rng: random.Random, n: int) -> Case:
+    charts = [LaSoTuVi(*args[:5], gender=args[5], cur_year=2024) for args in random_charts(rng, n, drawable=True)]
+    return Case([chart.get_image_bytes for chart in charts])
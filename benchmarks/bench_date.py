@@ -0,0 +1,34 @@
+import random
+
+from core.date import Date
+
+from .runner import Case, benchmark, random_birthdates
+
+# Creating, hashing and comparing a date take about a microsecond, under the resolution of the timer for a single
+# call, so every operation of these benchmarks handles a block of dates
+BLOCK = 100
+
+
+def date_blocks(rng: random.Random, n: int):
+    dates = random_birthdates(rng, n * BLOCK)
+    return [dates[i:i + BLOCK] for i in range(0, len(dates), BLOCK)]
+
+
+@benchmark('date.create.x100')
+def create(rng: random.Random, n: int) -> Case:
+    def operation(block):
+        for date in block:
+            Date(date.year, date.month, date.day, date.hour, date.minute)
+
+    return Case([lambda block=block: operation(block) for block in date_blocks(rng, n)])
+
+
+@benchmark('date.hash_compare.x100')
+def hash_compare(rng: random.Random, n: int) -> Case:
+    def operation(block):
+        seen = {}
+        first = block[0].empty_hms()
+        for date in block:
+            seen[date] = date < first
+
+    return Case([lambda block=block: operation(block) for block in date_blocks(rng, n)])
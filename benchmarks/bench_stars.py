@@ -0,0 +1,28 @@
+import random
+
+from core.tuvi.stars import sao
+from core.tuvi.stars.sao import SaoRegistry
+
+from .runner import Case, benchmark, random_birthdates
+
+# A main star, a star placed from the main ones, one placed from the whole chart and a yearly one
+STARS = ['SaoTuVi', 'SaoThienPhu', 'SaoHoaQuyen', 'SaoTuan', 'SaoLuuThaiTue']
+
+
+def clear_star_caches() -> None:
+    for star in SaoRegistry.get_subclasses():
+        star.an_sao.cache_clear()
+
+
+def make_an_sao_benchmark(star_name: str) -> None:
+    @benchmark(f'stars.an_sao.{star_name}')
+    def an_sao(rng: random.Random, n: int) -> Case:
+        star = getattr(sao, star_name)
+        dates = random_birthdates(rng, n)
+        genders = [rng.choice([1, -1]) for _ in dates]
+        # Every star cache is cleared, so the stars it is placed from are computed again too
+        return Case([lambda date=date, gender=gender: star.an_sao(date, 2024, gender) for date, gender in zip(dates, genders)], prepare=clear_star_caches, warmup=False)
+
+
+for name in STARS:
+    make_an_sao_benchmark(name)
@@ -0,0 +1,72 @@
+import os
+import random
+
+from .bench_chart import random_charts
+from .bench_stars import clear_star_caches
+from .runner import Case, benchmark
+
+_client = None
+
+
+def get_client():
+    """
+    Set Django up with a test database, like `manage.py test`, and return a test client.
+    Rate limiting is lifted, every request comes from the same address.
+    """
+
+    global _client
+    if _client is not None:
+        return _client
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horoscope.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('DEBUG', '1')
+    os.environ.setdefault('TUVI_WARMUP', '0')
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings, setup_test_environment
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+    override_settings(TUVI_RENDER_BURST=10 ** 9).enable()
+
+    _client = Client()
+    return _client
+
+
+def form_data(rng: random.Random, n: int):
+    return [{
+        'name': 'Benchmark',
+        'gender': 'M' if gender == 1 else 'F',
+        'year': str(year),
+        'month': str(month),
+        'day': str(day),
+        'hour': str(hour),
+        'minute': str(minute),
+        'cur_year': '2024',
+    } for year, month, day, hour, minute, gender in random_charts(rng, n, drawable=True)]
+
+
+def post(client, data) -> None:
+    response = client.post('/', data)
+    if response.status_code != 200:
+        raise RuntimeError(f'The chart form answered {response.status_code}.')
+
+
+@benchmark('view.chart.new')
+def new_chart(rng: random.Random, n: int) -> Case:
+    client = get_client()
+    post(client, form_data(random.Random(0), 1)[0])
+    # Picking drawable charts computed their stars, start every request from cold star caches
+    return Case([lambda data=data: post(client, data) for data in form_data(rng, n)], prepare=clear_star_caches, warmup=False)
+
+
+@benchmark('view.chart.cached')
+def cached_chart(rng: random.Random, n: int) -> Case:
+    # The warmup stores every chart, the timed requests are served from the image cache
+    client = get_client()
+    return Case([lambda data=data: post(client, data) for data in form_data(rng, n)])
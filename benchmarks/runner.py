@@ -0,0 +1,150 @@
+"""
+Benchmark registry, timing loop and result files.
+
+A benchmark is a function registered with `@benchmark(name)`. Given a seeded `random.Random` and a number of
+operations `n`, it returns a `Case`: the `n` operations to time and, optionally, a `prepare` function run before
+every operation, outside of the timed section (e.g. to clear caches for a cold run).
+Every operation is timed on its own, so the results have percentiles and not only a mean.
+"""
+
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Union
+
+from core.date import SolarDate
+from core.mixins import DateMixin
+
+
+class Case(NamedTuple):
+    operations: List[Callable[[], object]]
+    prepare: Union[Callable[[], None], None] = None
+    warmup: bool = True  # run every operation once before timing, set to False for cold runs
+
+
+_benchmarks: Dict[str, Callable[[random.Random, int], Case]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    def decorator(factory: Callable[[random.Random, int], Case]) -> Callable[[random.Random, int], Case]:
+        _benchmarks[name] = factory
+        return factory
+
+    return decorator
+
+
+def get_benchmarks() -> Dict[str, Callable[[random.Random, int], Case]]:
+    return _benchmarks
+
+
+def random_birthdates(rng: random.Random, n: int) -> List[SolarDate]:
+    """
+    Draw `n` birth dates and times, with years around 1985 like the people looking up their chart.
+    """
+
+    dates = []
+    for _ in range(n):
+        year = min(2020, max(1920, round(rng.gauss(1985, 15))))
+        month = rng.randint(1, 12)
+        day = rng.randint(1, DateMixin.days_of_month(month))
+        dates.append(SolarDate(year, month, day, rng.randint(0, 23), rng.randint(0, 59)))
+    return dates
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Return the `q` quantile of the sorted `values`, interpolated linearly.
+    """
+
+    position = (len(values) - 1) * q
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def run_case(case: Case) -> Dict[str, float]:
+    """
+    Time every operation of `case` and return the statistics, durations in microseconds.
+    """
+
+    if case.warmup:
+        for operation in case.operations:
+            operation()
+
+    timings = []
+    for operation in case.operations:
+        if case.prepare is not None:
+            case.prepare()
+        start = time.perf_counter_ns()
+        operation()
+        timings.append((time.perf_counter_ns() - start) / 1000)
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'n': len(timings),
+        'p50_us': round(percentile(timings, 0.5), 3),
+        'p95_us': round(percentile(timings, 0.95), 3),
+        'mean_us': round(total / len(timings), 3),
+        'ops_per_sec': round(len(timings) / total * 1e6, 1) if total else None,
+    }
+
+
+def run(names: List[str], n: int, seed: int, log: Callable[[str], None] = print) -> Dict[str, Dict[str, float]]:
+    """
+    Run the benchmarks `names` with `n` operations each. Every benchmark gets its own generator seeded with `seed`,
+    so adding or removing one does not change the inputs of the others.
+    """
+
+    results = {}
+    for name in names:
+        case = _benchmarks[name](random.Random(f'{seed}:{name}'), n)
+        results[name] = run_case(case)
+        stats = results[name]
+        log(f'{name:<36} p50 {stats["p50_us"]:>11.1f} us   p95 {stats["p95_us"]:>11.1f} us   {stats["ops_per_sec"]:>11.1f} ops/s')
+    return results
+
+
+def metadata(n: int, seed: int) -> Dict[str, object]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'n': n,
+        'seed': seed,
+    }
+
+
+def save(path: str, meta: Dict[str, object], results: Dict[str, Dict[str, float]]) -> None:
+    # Sorted keys and a stable layout, so the results of two commits diff cleanly
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(old_path: str, new_path: str, log: Callable[[str], None] = print) -> None:
+    """
+    Print the p50 and p95 of the benchmarks found in both result files, and their ratio new / old.
+    """
+
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    log(f'{"":<36} {old["meta"].get("commit") or old_path:>24} {new["meta"].get("commit") or new_path:>24}')
+    for name in sorted(set(old['results']) & set(new['results'])):
+        before, after = old['results'][name], new['results'][name]
+        ratio = after['p50_us'] / before['p50_us'] if before['p50_us'] else float('nan')
+        log(f'{name:<36} p50 {before["p50_us"]:>10.1f} -> {after["p50_us"]:>10.1f} us  p95 {before["p95_us"]:>10.1f} -> {after["p95_us"]:>10.1f} us  x{ratio:.2f}')
@@ -3,4 +3,7 @@
 set -o errexit
 
 python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+python manage.py build_lunar_table
+python manage.py build_lunar_table --timezone 8
+python manage.py build_lunar_table --timezone 9
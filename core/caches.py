@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import gc
+import sys
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Union
+
+
+class CacheStats(NamedTuple):
+    name: str
+    hits: int
+    misses: int
+    size: int
+    maxsize: Union[int, None]  # None for an unbounded cache
+    bytes: int  # estimated memory of the entries, keys and results included
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+def _estimate_bytes(cache: Callable) -> int:
+    """
+    Estimate the memory held by the entries of the `lru_cache` function `cache`: its dict, the links of the
+    LRU list, and the keys and results reachable from them. Objects shared with the rest of the program,
+    e.g. interned strings, are counted too, classes and functions are not.
+    """
+
+    # The C cache object does not expose its dict, but hands it to the garbage collector
+    entries = [referent for referent in gc.get_referents(cache) if type(referent) is dict and referent is not cache.__dict__]
+
+    seen = set()
+    total = 0
+    stack = entries
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type) or callable(obj):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+
+class CacheRegistry:
+    """
+    Every memoized function of `core`, registered by `cached` under its module and qualified name,
+    e.g. `core.utils.DateUtil.jdn_from_ymd`. Methods taking a `pattern` select the caches whose name
+    matches the shell-style pattern, e.g. `*.an_sao` or `core.utils.*`, all of them if it is None.
+    """
+
+    _caches: Dict[str, Callable] = {}
+
+    @classmethod
+    def register(cls, cache: Callable) -> None:
+        cls._caches[f'{cache.__module__}.{cache.__qualname__}'] = cache
+
+
+    @classmethod
+    def names(cls, pattern: Union[str, None] = None) -> List[str]:
+        return [name for name in cls._caches if pattern is None or fnmatchcase(name, pattern)]
+
+
+    @classmethod
+    def get(cls, name: str) -> Callable:
+        """
+        Return the cached function `name`, the one currently in use if it was resized.
+        """
+
+        return cls._caches[name]
+
+
+    @classmethod
+    def stats(cls, pattern: Union[str, None] = None, memory: bool = True) -> List[CacheStats]:
+        """
+        Return the statistics of the selected caches. Estimating their memory walks every entry,
+        pass `memory` False to skip it (`bytes` is then 0).
+        """
+
+        stats = []
+        for name in cls.names(pattern):
+            cache = cls._caches[name]
+            info = cache.cache_info()
+            stats.append(CacheStats(name, info.hits, info.misses, info.currsize, info.maxsize, _estimate_bytes(cache) if memory else 0))
+        return stats
+
+
+    @classmethod
+    def clear(cls, pattern: Union[str, None] = None) -> int:
+        """
+        Empty the selected caches and reset their statistics. Return the number of caches cleared.
+        """
+
+        names = cls.names(pattern)
+        for name in names:
+            cls._caches[name].cache_clear()
+        return len(names)
+
+
+    @classmethod
+    def resize(cls, pattern: Union[str, None], maxsize: Union[int, None]) -> int:
+        """
+        Give the selected caches a new `maxsize`, None for unbounded. Return the number of caches resized.
+
+        An `lru_cache` cannot change size, so a new, empty one replaces it where the function is defined:
+        on its class, or in its module and in every module which imported it by name.
+        """
+
+        names = cls.names(pattern)
+        for name in names:
+            old = cls._caches[name]
+            new = lru_cache(maxsize=maxsize)(old.__wrapped__)
+            cls._rebind(old, new)
+            cls._caches[name] = new
+        return len(names)
+
+
+    @staticmethod
+    def _rebind(old: Callable, new: Callable) -> None:
+        owner = sys.modules[old.__module__]
+        *path, attribute = old.__qualname__.split('.')
+        for part in path:
+            owner = getattr(owner, part)
+
+        if isinstance(owner, type):
+            descriptor = owner.__dict__[attribute]
+            setattr(owner, attribute, staticmethod(new) if isinstance(descriptor, staticmethod) else new)
+            return
+
+        for module in list(sys.modules.values()):
+            if getattr(module, attribute, None) is old:
+                setattr(module, attribute, new)
+
+
+def cached(maxsize: Union[int, None] = 128) -> Callable[[Callable], Callable]:
+    """
+    Memoize a function with `functools.lru_cache` and register it in `CacheRegistry`.
+    The function returned is the `lru_cache` one, calls pay nothing for the registration.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache = lru_cache(maxsize=maxsize)(func)
+        CacheRegistry.register(cache)
+        return cache
+
+    return decorator
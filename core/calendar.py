@@ -0,0 +1,65 @@
+from typing import NamedTuple, Tuple
+
+from .caches import cached
+from .date import SolarDate
+from .exceptions import InvalidDateException
+from .utils import DateUtil
+
+
+class CalendarCell(NamedTuple):
+    solar: SolarDate
+    lunar_year: int
+    lunar_month: int
+    lunar_day: int
+    leap: bool  # the lunar month is a leap month
+    can_chi: Tuple[int, int]  # can chi of the day, see `ZodiacUtil.zodiac_day_tuple`
+    weekday: int  # 0 is Sunday
+    in_month: bool  # the day belongs to the month of the grid, not to the previous or next one
+    first_of_lunar_month: bool
+
+
+class CalendarUtil:
+    """
+    Month pages of the perpetual lunar calendar (lich van nien).
+    """
+
+    GRID_SIZE = 42
+
+    @staticmethod
+    @cached(maxsize=256)
+    def month_grid(year: int, month: int, timezone: float = 7, first_weekday: int = 1) -> Tuple[CalendarCell, ...]:
+        """
+        Return the 6 weeks, 42 days grid of the solar month `month` of `year`, starting with the last day
+        `first_weekday` (0 is Sunday, 1 is Monday) on or before the 1st. Days of the neighbouring months fill
+        the first and last weeks and are marked with `in_month` False.
+
+        Like `DateUtil.iter_days`, the lunar month is looked up for the first cell and again only where a new moon
+        falls inside the grid, i.e. at most three times.
+        The grid is immutable and cached per (year, month, timezone, first_weekday).
+        """
+
+        if not 1 <= month <= 12 or not 0 <= first_weekday <= 6:
+            raise InvalidDateException('Invalid month')
+
+        jdn_first = DateUtil.jdn_from_ymd(year, month, 1)
+        jdn = jdn_first - (jdn_first + 1 - first_weekday) % 7
+        can_index = (jdn + 9) % 10 + 1
+        chi_index = (jdn + 1) % 12 + 1
+        weekday = (jdn + 1) % 7
+        jd_next_month_start = jdn
+
+        cells = []
+        for _ in range(CalendarUtil.GRID_SIZE):
+            solar_year, solar_month, solar_day = DateUtil.ymd_from_jdn(jdn)
+            if jdn >= jd_next_month_start:
+                lunar_year, lunar_month, leap, jd_month_start, jd_next_month_start = DateUtil.lunar_month_of_jdn(jdn, solar_year, timezone)
+            lunar_day = jdn - jd_month_start + 1
+
+            cells.append(CalendarCell(SolarDate(solar_year, solar_month, solar_day), lunar_year, lunar_month, lunar_day, leap, (can_index, chi_index), weekday, solar_month == month, lunar_day == 1))
+
+            jdn += 1
+            can_index = can_index % 10 + 1
+            chi_index = chi_index % 12 + 1
+            weekday = (weekday + 1) % 7
+
+        return tuple(cells)
@@ -0,0 +1,228 @@
+"""
+Compatibility of ages (hop tuoi) of two people, from the can chi of their lunar years of birth: the relation of
+the ngu hanh of their menh (nap am), of their can and of their chi.
+
+Years are given as their code in the 60 can chi cycle (see `Pillar.code`, Giap Ti being 0), so every relation is
+a 60 x 60 matrix computed once, and scoring many pairs is indexing these matrices with NumPy arrays of codes:
+
+    scores = CompatibilityUtil.score_many(CompatibilityUtil.year_code(1990), candidate_codes)
+    best, best_scores = CompatibilityUtil.top_k(CompatibilityUtil.year_code(1990), candidate_codes, 10)
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Tuple
+
+from .caches import cached
+from .date import SolarDate
+from .lunaryear import LunarYearUtil
+from .tutru import Pillar
+from .tuvi.utils import TuViUtil
+from .utils import DateUtil, NguHanhUtil
+
+# Relations by code, in the matrices of `CompatibilityUtil.relations`, 0 for none
+MENH_RELATIONS = ('', 'tuong sinh', 'binh hoa', 'tuong khac')
+CAN_RELATIONS = ('', 'hop', 'tuong khac')
+CHI_RELATIONS = ('', 'tam hop', 'luc hop', 'luc hai', 'luc xung')
+
+
+class CompatibilityWeights(NamedTuple):
+    """
+    Points of every relation, the score of a pair being their sum.
+    """
+
+    menh_tuong_sinh: float = 2
+    menh_binh_hoa: float = 1
+    menh_tuong_khac: float = -2
+    can_hop: float = 1
+    can_tuong_khac: float = -1
+    chi_tam_hop: float = 2
+    chi_luc_hop: float = 2
+    chi_luc_hai: float = -1
+    chi_luc_xung: float = -2
+
+
+class Compatibility(NamedTuple):
+    score: float
+    menh: str  # relation names, see `MENH_RELATIONS`, `CAN_RELATIONS` and `CHI_RELATIONS`
+    can: str
+    chi: str
+
+
+def _menh_relation(code1: int, code2: int) -> int:
+    ngu_hanh1, ngu_hanh2 = CompatibilityUtil.menh_ngu_hanh()[code1], CompatibilityUtil.menh_ngu_hanh()[code2]
+    if ngu_hanh1 == ngu_hanh2:
+        return 2
+    if NguHanhUtil.check_tuong_sinh(ngu_hanh1, ngu_hanh2):
+        return 1
+    if NguHanhUtil.check_tuong_khac(ngu_hanh1, ngu_hanh2):
+        return 3
+    return 0
+
+
+def _can_relation(can1: int, can2: int) -> int:
+    # Giap Ky, At Canh, Binh Tan, Dinh Nham and Mau Quy
+    if abs(can1 - can2) == 5:
+        return 1
+    if NguHanhUtil.check_tuong_khac(NguHanhUtil.ngu_hanh_of_can(can1), NguHanhUtil.ngu_hanh_of_can(can2)):
+        return 2
+    return 0
+
+
+def _chi_relation(chi1: int, chi2: int) -> int:
+    if chi1 == chi2:
+        return 0
+    # Than Ti Thin, Ty Dau Suu, Dan Ngo Tuat and Hoi Mao Mui
+    if (chi1 - chi2) % 4 == 0:
+        return 1
+    # Ti Suu, Dan Hoi, Mao Tuat, Thin Dau, Ty Than and Ngo Mui
+    if (chi1 + chi2) % 12 == 3:
+        return 2
+    # Ti Mui, Suu Ngo, Dan Ty, Mao Thin, Than Hoi and Dau Tuat
+    if (chi1 + chi2) % 12 == 9:
+        return 3
+    if abs(chi1 - chi2) == 6:
+        return 4
+    return 0
+
+
+def _points(weights: CompatibilityWeights) -> Tuple[Tuple[float, ...], Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Return the points of every menh, can and chi relation code with `weights`.
+    """
+
+    return (
+        (0, weights.menh_tuong_sinh, weights.menh_binh_hoa, weights.menh_tuong_khac),
+        (0, weights.can_hop, weights.can_tuong_khac),
+        (0, weights.chi_tam_hop, weights.chi_luc_hop, weights.chi_luc_hai, weights.chi_luc_xung),
+    )
+
+
+class CompatibilityUtil:
+    """
+    Scores of the compatibility of two lunar years of birth, see the module.
+    """
+
+    @staticmethod
+    def year_code(lunar_year: int) -> int:
+        """
+        Return the code of the lunar year `lunar_year` in the can chi cycle, Giap Ti (e.g. 1984) being 0.
+        """
+
+        return (lunar_year - 4) % 60
+
+
+    @staticmethod
+    def year_code_of_birth(birthdate: SolarDate, timezone: float = 7) -> int:
+        return CompatibilityUtil.year_code(DateUtil.solar_to_lunar(birthdate.empty_hms(), timezone).year)
+
+
+    @staticmethod
+    def year_codes_of_births(years, months, days, timezone: float = 7):
+        """
+        Same as `year_code_of_birth`, for NumPy integer arrays of solar years, months and days.
+        """
+
+        lunar_years = LunarYearUtil.lunar_dates_of_jdn_array(DateUtil.jdn_from_ymd_array(years, months, days), timezone)[0]
+        return (lunar_years - 4) % 60
+
+
+    @staticmethod
+    @cached(maxsize=1)
+    def menh_ngu_hanh():
+        """
+        Return the ngu hanh of the menh of every year code, as a tuple of `NguHanh`.
+        """
+
+        # The lunar year of July is always the solar one
+        return tuple(NguHanhUtil.ngu_hanh_from_string(TuViUtil.tim_menh(SolarDate(1984 + code, 7, 1)).split()[-1]) for code in range(60))
+
+
+    @staticmethod
+    @cached(maxsize=1)
+    def relations():
+        """
+        Return the relation codes of the menh, can and chi of every pair of year codes, as three 60 x 60 int8
+        NumPy arrays. The arrays are shared, do not modify them.
+        """
+
+        import numpy
+
+        pillars = [Pillar.from_code(code) for code in range(60)]
+        menh = numpy.array([[_menh_relation(code1, code2) for code2 in range(60)] for code1 in range(60)], dtype=numpy.int8)
+        can = numpy.array([[_can_relation(pillar1.can, pillar2.can) for pillar2 in pillars] for pillar1 in pillars], dtype=numpy.int8)
+        chi = numpy.array([[_chi_relation(pillar1.chi, pillar2.chi) for pillar2 in pillars] for pillar1 in pillars], dtype=numpy.int8)
+        for matrix in (menh, can, chi):
+            matrix.setflags(write=False)
+        return menh, can, chi
+
+
+    @staticmethod
+    @cached(maxsize=8)
+    def scores(weights: CompatibilityWeights = CompatibilityWeights()):
+        """
+        Return the score of every pair of year codes with `weights`, as a 60 x 60 float64 NumPy array.
+        The array is shared, do not modify it.
+        """
+
+        import numpy
+
+        menh, can, chi = CompatibilityUtil.relations()
+        menh_points, can_points, chi_points = (numpy.array(points, dtype=numpy.float64) for points in _points(weights))
+        scores = menh_points[menh] + can_points[can] + chi_points[chi]
+        scores.setflags(write=False)
+        return scores
+
+
+    @staticmethod
+    def compare(code1: int, code2: int, weights: CompatibilityWeights = CompatibilityWeights()) -> Compatibility:
+        """
+        Return the score of the year codes `code1` and `code2`, and their relations. NumPy is not needed.
+        """
+
+        pillar1, pillar2 = Pillar.from_code(code1), Pillar.from_code(code2)
+        menh, can, chi = _menh_relation(code1, code2), _can_relation(pillar1.can, pillar2.can), _chi_relation(pillar1.chi, pillar2.chi)
+        menh_points, can_points, chi_points = _points(weights)
+        return Compatibility(float(menh_points[menh] + can_points[can] + chi_points[chi]), MENH_RELATIONS[menh], CAN_RELATIONS[can], CHI_RELATIONS[chi])
+
+
+    @staticmethod
+    def score_many(code: int, codes, weights: CompatibilityWeights = CompatibilityWeights()):
+        """
+        Return the scores of the year code `code` with every code of the NumPy integer array `codes`.
+        """
+
+        return CompatibilityUtil.scores(weights)[code, codes]
+
+
+    @staticmethod
+    def score_matrix(codes1, codes2, weights: CompatibilityWeights = CompatibilityWeights()):
+        """
+        Return the scores of every pair of the NumPy integer arrays of year codes `codes1` and `codes2`,
+        as a (len(codes1), len(codes2)) array.
+        """
+
+        return CompatibilityUtil.scores(weights)[codes1[:, None], codes2[None, :]]
+
+
+    @staticmethod
+    def top_k(code: int, codes, k: int, weights: CompatibilityWeights = CompatibilityWeights()) -> Tuple[object, object]:
+        """
+        Return the indices in `codes` of the `k` year codes most compatible with `code`, and their scores,
+        the best first and the first in `codes` among equal scores. Only these `k` are sorted.
+        """
+
+        import numpy
+
+        scores = CompatibilityUtil.score_many(code, codes, weights)
+        k = min(k, len(scores))
+        if k <= 0:
+            return numpy.empty(0, dtype=numpy.int64), scores[:0]
+
+        # The k-th best score, then every index scoring better and the first ones scoring as much
+        threshold = numpy.partition(scores, len(scores) - k)[len(scores) - k]
+        better = numpy.flatnonzero(scores > threshold)
+        equal = numpy.flatnonzero(scores == threshold)[:k - len(better)]
+        selected = numpy.concatenate([better, equal])
+        selected = selected[numpy.lexsort((selected, -scores[selected]))]
+        return selected, scores[selected]
@@ -1,136 +1,120 @@
 from __future__ import annotations
 
+from operator import attrgetter
+
 from .exceptions import InvalidDateException
 from .mixins import DateMixin
 
 
 class Date(DateMixin):
     """
-    Date class.
+    Immutable date class.
+
+    The fields are packed into a single int, `ordinal`, which orders dates like (year, month, day, hour, minute, second)
+    and is also their hash. It is computed once, when the date is created, so dates are cheap to compare
+    and to use as cache keys.
+
+    A date is not a tuple, but iterates over its six fields like one, and has the `_fields`, `_make`, `_replace`
+    and `_asdict` of a named tuple.
     """
 
-    def __init__(self, year: int = 0, month: int = 0, day: int = 0, hour: int = 0, minute: int = 0, second: int = 0) -> None:
+    __slots__ = ('_year', '_month', '_day', '_hour', '_minute', '_second', '_ordinal')
+
+    _fields = ('year', 'month', 'day', 'hour', 'minute', 'second')
+
+    def __init__(self, year: int = 0, month: int = 1, day: int = 1, hour: int = 0, minute: int = 0, second: int = 0) -> None:
+        # The day is checked against 31 only, lunar months have 30 days whatever their number
+        if not (1 <= month <= 12 and 1 <= day <= 31 and 0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+            raise InvalidDateException(f'Invalid date {year}-{month}-{day} {hour}:{minute}:{second}')
+
         self._year = year
         self._month = month
         self._day = day
         self._hour = hour
         self._minute = minute
         self._second = second
+        self._ordinal = (((((year << 4 | month) << 5 | day) << 5 | hour) << 6 | minute) << 6) | second
+
+
+    # Read-only: setting a field raises AttributeError
+    year = property(attrgetter('_year'))
+    month = property(attrgetter('_month'))
+    day = property(attrgetter('_day'))
+    hour = property(attrgetter('_hour'))
+    minute = property(attrgetter('_minute'))
+    second = property(attrgetter('_second'))
+    ordinal = property(attrgetter('_ordinal'))
+
+
+    def __reduce__(self):
+        return type(self), tuple(self)
+
+
+    @classmethod
+    def _make(cls, iterable) -> Date:
+        return cls(*iterable)
+
 
+    def _replace(self, **changes) -> Date:
+        fields = [changes.pop(name, value) for name, value in zip(self._fields, self)]
+        if changes:
+            raise ValueError(f'Got unexpected field names: {list(changes)!r}')
+        return type(self)(*fields)
 
-    @property
-    def year(self) -> int:
-        return self._year
-    
-
-    @year.setter
-    def year(self, new_year: int) -> None:
-        self._year = new_year
-
-
-    @property
-    def month(self) -> int:
-        return self._month
-    
-
-    @month.setter
-    def month(self, new_month: int) -> None:
-        if not 1 <= new_month <= 12:
-            raise InvalidDateException('Invalid month')
-
-        self._month = new_month
-
-
-    @property
-    def day(self) -> int:
-        return self._day
-    
-
-    @day.setter
-    def day(self, new_day: int) -> None:
-        if self.month == 2:
-            if self.is_leap_year(self):
-                if not 1 <= new_day <= 29:
-                    raise InvalidDateException('Invalid day')
-            else:
-                if not 1 <= new_day <= 28:
-                    raise InvalidDateException('Invalid day')
-        else:
-            if not 1 <= new_day <= self.days_of_month(self.month):
-                raise InvalidDateException('Invalid day')
-            
-        self._day = new_day
-
-    
-    @property
-    def hour(self) -> int:
-        return self._hour
-    
-
-    @hour.setter
-    def hour(self, new_hour: int) -> None:
-        self._hour = new_hour
-
-
-    @property
-    def minute(self) -> int:
-        return self._minute
-    
-    
-    @minute.setter
-    def minute(self, new_minute: int) -> None:
-        self._minute = new_minute
-
-    
-    @property
-    def second(self) -> int:
-        return self._second
-    
-
-    @second.setter
-    def second(self, new_second: int) -> None:
-        self._second = new_second
+
+    def _asdict(self) -> dict:
+        return dict(zip(self._fields, self))
+
+
+    def __iter__(self):
+        return iter((self._year, self._month, self._day, self._hour, self._minute, self._second))
 
 
     def empty_hms(self) -> Date:
         """
         Reset hour, minute and second to zero.
+        A date which is already at midnight is returned as is.
         """
-        
-        return Date(self.year, self.month, self.day)
+
+        if not self._ordinal & 0x1FFFF:
+            return self
+        return Date(self._year, self._month, self._day)
+
 
     def __lt__(self, other):
-        if self.year != other.year:
-            return self.year < other.year
-        if self.month != other.month:
-            return self.month < other.month
-        if self.day != other.day:
-            return self.day < other.day
-        if self.hour != other.hour:
-            return self.hour < other.hour
-        if self.minute != other.minute:
-            return self.minute < other.minute
-        return self.second < other.second
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal < other._ordinal
 
 
     def __eq__(self, other):
-        return self.year == other.year and self.month == other.month and self.day == other.day and self.hour == other.hour and self.minute == other.minute and self.second == other.second
-    
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal == other._ordinal
+
 
     def __gt__(self, other):
-        return other < self
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal > other._ordinal
+
 
-    
     def __le__(self, other):
-        return self < other or self == other
-    
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal <= other._ordinal
+
 
     def __ge__(self, other):
-        return self > other or self == other
-    
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal >= other._ordinal
+
 
     def __ne__(self, other):
-        return self.year != other.year or self.month != other.month or self.day != other.day or self.hour != other.hour or self.minute != other.minute or self.second != other.second
+        if not isinstance(other, Date):
+            return NotImplemented
+        return self._ordinal != other._ordinal
 
 
     def __str__(self):
@@ -139,21 +123,23 @@ class Date(DateMixin):
 
     def __repr__(self):
         return f'{self.get_month_name(self.month)} {self.get_ordinal(self.day)}, {self.year} {str(self.hour).zfill(2)}:{str(self.minute).zfill(2)}:{str(self.second).zfill(2)}'
-    
+
 
     def __hash__(self):
-        return hash((self.year, self.month, self.day, self.hour, self.minute, self.second))
+        return self._ordinal
 
 
 class SolarDate(Date):
     """
     Class for solar date, a subclass of Date.
     """
-    pass
+
+    __slots__ = ()
 
 
 class LunarDate(Date):
     """
     Class for lunar date, a subclass of Date.
     """
-    pass
+
+    __slots__ = ()
@@ -1,8 +1,15 @@
 from enum import Enum
 from typing import Union, Tuple
+from .caches import cached
 from .exceptions import InvalidPercentValue, InvalidID
 from core.tuvi.elements.nguhanh import NguHanh
 
+from PIL import ImageFont
+
+
+FONT_PATH = 'fonts/Arial.ttf'
+BOLD_FONT_PATH = 'fonts/Arial Bold.ttf'
+
 
 class Color(Enum):
     RED = (255, 0, 0)
@@ -21,6 +28,15 @@ class FontSize(Enum):
     LARGE = 14
 
 
+@cached(maxsize=None)
+def get_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load a TrueType font once and reuse it for every later image.
+    """
+
+    return ImageFont.truetype(path, size)
+
+
 def get_position(topleft: Tuple[int, int], size: Tuple[int, int], width: Union[float, None] = None, height: Union[float, None] = None, width_percent: Union[float, None] = None, height_percent: Union[float, None] = None) -> Tuple[int, int]:
     if width_percent is not None and not 0 <= width_percent <= 100:
         raise InvalidPercentValue('Percent value must be between 0 and 100.')
@@ -57,3 +57,9 @@ class InvalidLoaiSao(Exception):
 
 class InvalidPercentValue(Exception):
     pass
+
+class InvalidLunarTable(Exception):
+    pass
+
+class InvalidNatalIndex(Exception):
+    pass
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+from typing import Dict, List, Tuple, Union
+
+from .date import SolarDate
+from .main import LaSoTuVi
+from .tuvi.elements.trangthai import TrangThai
+from .tuvi.stars.sao import SaoRegistry
+from .tuvi.utils import TuViUtil
+from .utils import DateUtil
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional, charts are written as NumPy `.npz` batches without it
+    pyarrow = None
+
+KEY_WIDTH = 17
+
+# Cell of every palace, as placed by `LaSoTuVi._init_name` and `_init_cung_than`
+PALACES = [
+    ('menh', TuViUtil.tim_vi_tri_menh),
+    ('phu_mau', TuViUtil.tim_cung_phu_mau),
+    ('phuc_duc', TuViUtil.tim_cung_phuc_duc),
+    ('dien_trach', TuViUtil.tim_cung_dien_trach),
+    ('quan_loc', TuViUtil.tim_cung_quan_loc),
+    ('no_boc', TuViUtil.tim_cung_no_boc),
+    ('thien_di', TuViUtil.tim_cung_thien_di),
+    ('tat_ach', TuViUtil.tim_cung_tat_ach),
+    ('tai_bach', TuViUtil.tim_cung_tai_bach),
+    ('tu_tuc', TuViUtil.tim_cung_tu_tuc),
+    ('phu_the', TuViUtil.tim_cung_phu_the),
+    ('huynh_de', TuViUtil.tim_cung_huynh_de),
+    ('than', TuViUtil.tim_vi_tri_than),
+]
+
+# 0 for a star whose trang thai is not printed
+TRANG_THAI = [TrangThai.NONE, TrangThai.MIEU, TrangThai.DAC, TrangThai.VUONG, TrangThai.BINH, TrangThai.HAM]
+TRANG_THAI_CODES = {trang_thai: code for code, trang_thai in enumerate(TRANG_THAI)}
+
+# The cuc is written as its number
+CUC = [None, None, 'Thuỷ nhị cục', 'Mộc tam cục', 'Kim tứ cục', 'Thổ ngũ cục', 'Hoả lục cục']
+CUC_NUMBERS = {name: number for number, name in enumerate(CUC) if name is not None}
+
+# (key, star cells, star trang thai codes, palace cells, menh code, cuc number)
+ChartRow = Tuple[str, Tuple[int, ...], Tuple[int, ...], Tuple[int, ...], int, int]
+
+
+def menh_names() -> List[str]:
+    """
+    Return the 30 menh, by code: the menh of a lunar year is shared by the two years of a pair of the sexagenary
+    cycle, its code is the index of the pair, 0 for Giap Ti and At Suu.
+    """
+
+    # 1984 is a Giap Ti year, and the lunar year of July is always the solar one
+    return [TuViUtil.tim_menh(SolarDate(1984 + 2 * code, 7, 1)) for code in range(30)]
+
+
+def columns() -> List[str]:
+    """
+    Return the names of the columns, in order: the key, the cell and the trang thai code of every registered star,
+    e.g. `cell_SaoTuVi` and `trang_thai_SaoTuVi`, the cell of every palace, e.g. `cung_menh`, the menh and the cuc.
+    """
+
+    names = [sao.__name__ for sao in SaoRegistry.get_subclasses()]
+    return ['key'] + [f'cell_{name}' for name in names] + [f'trang_thai_{name}' for name in names] + [f'cung_{palace}' for palace, _ in PALACES] + ['menh', 'cuc']
+
+
+def chart_row(chart: LaSoTuVi) -> ChartRow:
+    """
+    Return the row of `chart`. The trang thai of the stars are those set by the last chart built, call it right
+    after building `chart`.
+    """
+
+    index = {sao: i for i, sao in enumerate(SaoRegistry.get_subclasses())}
+    cells = [0] * len(index)
+    for cell in chart.diaban:
+        for star in cell.chinh_tinh + cell.phu_tinh_trai + cell.phu_tinh_phai:
+            cells[index[star]] = cell.ID
+        if cell.phu_tinh_duoi is not None:
+            cells[index[cell.phu_tinh_duoi]] = cell.ID
+    for sao in index:
+        if sao.name == 'Tuần':
+            cells[index[sao]] = chart.vi_tri_tuan
+        elif sao.name == 'Triệt':
+            cells[index[sao]] = chart.vi_tri_triet
+
+    birthdate = chart.birthdate
+    lunar_year = DateUtil.solar_to_lunar(birthdate.empty_hms()).year
+    return (
+        chart.key,
+        tuple(cells),
+        tuple(TRANG_THAI_CODES[sao.trang_thai] for sao in index),
+        tuple(find(birthdate) for _, find in PALACES),
+        (lunar_year - 4) % 60 // 2,
+        CUC_NUMBERS[TuViUtil.tim_cuc(birthdate)],
+    )
+
+
+def schema() -> Dict[str, object]:
+    """
+    Return what decodes the columns: the stars and their names, and the trang thai, menh and cuc of every code.
+    """
+
+    return {
+        'stars': [[sao.__name__, sao.name] for sao in SaoRegistry.get_subclasses()],
+        'palaces': [palace for palace, _ in PALACES],
+        'trang_thai': [trang_thai.value for trang_thai in TRANG_THAI],
+        'menh': menh_names(),
+        'cuc': CUC,
+    }
+
+
+class ColumnarWriter:
+    """
+    Write chart rows in column batches of `batch_size` rows, every column a fixed width: the key as 17 bytes,
+    everything else as uint8. With pyarrow, `path` is a Parquet file with a row group per batch, and the schema
+    of `schema()` in its metadata. Without it, or with `format` 'npz', `path` is a directory of `part-00000.npz`
+    files, one per batch, and a `schema.json`:
+
+        with ColumnarWriter('charts.parquet') as writer:
+            for key in keys:
+                writer.add(chart_row(LaSoTuVi.from_key(key)))
+
+    Only the rows of the current batch are kept in memory. `path` must not exist.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10_000, format: Union[str, None] = None) -> None:
+        if format is None:
+            format = 'npz' if pyarrow is None else 'parquet'
+        if format not in ('parquet', 'npz'):
+            raise ValueError(f'Invalid format {format!r}, expected parquet or npz')
+        if format == 'parquet' and pyarrow is None:
+            raise ImportError('Writing Parquet needs pyarrow')
+        # Batches are NumPy arrays in both formats, fail before any chart is computed
+        import numpy  # noqa: F401
+        if os.path.exists(path):
+            raise FileExistsError(f'{path} already exists')
+
+        self.path = path
+        self.batch_size = batch_size
+        self.format = format
+        self.rows = 0
+        self._batch: List[ChartRow] = []
+        self._parts = 0
+        self._columns = columns()
+        self._schema = schema()
+        self._parquet = None
+
+        if format == 'parquet':
+            fields = [pyarrow.field('key', pyarrow.binary(KEY_WIDTH))] + [pyarrow.field(name, pyarrow.uint8()) for name in self._columns[1:]]
+            self._arrow_schema = pyarrow.schema(fields, metadata={'charts': json.dumps(self._schema, ensure_ascii=False)})
+        else:
+            os.makedirs(path)
+            with open(os.path.join(path, 'schema.json'), 'w', encoding='utf-8') as f:
+                json.dump(self._schema, f, ensure_ascii=False)
+
+
+    def __enter__(self) -> ColumnarWriter:
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+    def add(self, row: ChartRow) -> None:
+        self._batch.append(row)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+
+    def flush(self) -> None:
+        """
+        Write the rows added since the last batch as a batch.
+        """
+
+        if not self._batch:
+            return
+
+        batch = self._arrays(self._batch)
+        if self.format == 'npz':
+            import numpy
+
+            numpy.savez(os.path.join(self.path, f'part-{self._parts:05d}.npz'), **batch)
+        else:
+            batch['key'] = batch['key'].tolist()
+            if self._parquet is None:
+                self._parquet = pyarrow.parquet.ParquetWriter(self.path, self._arrow_schema)
+            self._parquet.write_table(pyarrow.table(batch, schema=self._arrow_schema))
+
+        self.rows += len(self._batch)
+        self._parts += 1
+        self._batch = []
+
+
+    def close(self) -> None:
+        self.flush()
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+
+    def _arrays(self, rows: List[ChartRow]) -> Dict[str, object]:
+        import numpy
+
+        keys = [row[0] for row in rows]
+        if any(len(key) != KEY_WIDTH for key in keys):
+            raise ValueError(f'Chart keys must have {KEY_WIDTH} characters')
+
+        values = numpy.array([cells + trang_thai + palaces + (menh, cuc) for _, cells, trang_thai, palaces, menh, cuc in rows], dtype=numpy.uint8)
+        arrays = {'key': numpy.array(keys, dtype=f'S{KEY_WIDTH}')}
+        for i, name in enumerate(self._columns[1:]):
+            arrays[name] = numpy.ascontiguousarray(values[:, i])
+        return arrays
+
+
+def read_columns(path: str) -> Tuple[Dict[str, object], Dict[str, object]]:
+    """
+    Read back everything written by `ColumnarWriter` to `path`. Return the columns, as NumPy arrays, and the schema.
+    """
+
+    import numpy
+
+    if os.path.isdir(path):
+        with open(os.path.join(path, 'schema.json'), encoding='utf-8') as f:
+            charts_schema = json.load(f)
+        parts = []
+        for part in sorted(glob.glob(os.path.join(path, 'part-*.npz'))):
+            with numpy.load(part) as arrays:
+                parts.append(dict(arrays))
+        if not parts:
+            return {name: numpy.empty(0, dtype=f'S{KEY_WIDTH}' if name == 'key' else numpy.uint8) for name in columns()}, charts_schema
+        return {name: numpy.concatenate([part[name] for part in parts]) for name in parts[0]}, charts_schema
+
+    if pyarrow is None:
+        raise ImportError('Reading Parquet needs pyarrow')
+    table = pyarrow.parquet.read_table(path)
+    charts_schema = json.loads(table.schema.metadata[b'charts'])
+    arrays = {name: table.column(name).to_numpy() for name in table.column_names if name != 'key'}
+    arrays = {'key': numpy.array(table.column('key').to_pylist(), dtype=f'S{KEY_WIDTH}'), **arrays}
+    return arrays, charts_schema
@@ -0,0 +1,147 @@
+"""
+Choice of good days (chon ngay tot): the days of a range of solar months passing a set of `DayRules`.
+
+Every rule only depends on the can chi code of the day, its lunar day or its Julian Day Number, so the rules are
+turned once into lookup tables (`GoodDayUtil.masks`) and the scan is a walk over the days like `DateUtil.iter_days`,
+looking the lunar month up again only when a new moon is crossed:
+
+    rules = DayRules(birth_year_code=CompatibilityUtil.year_code(1990), avoid_chi=(1,))
+    days = GoodDayUtil.find(2025, 1, 2025, 12, rules)
+"""
+
+from __future__ import annotations
+
+from typing import FrozenSet, Iterator, List, NamedTuple, Tuple, Union
+
+from .caches import cached
+from .compatibility import CompatibilityUtil, CompatibilityWeights
+from .date import SolarDate
+from .exceptions import InvalidDateException
+from .solarterms import SolarTermUtil
+from .tutru import Pillar
+from .tuvi.elements.tietkhi import TietKhi
+from .utils import DateUtil
+
+TAM_NUONG = (3, 7, 13, 18, 22, 27)
+NGUYET_KY = (5, 14, 23)
+# The eves of the equinoxes and solstices are tu ly days, the eves of the Lap terms tu tuyet days
+TU_LY = (TietKhi.XUAN_PHAN, TietKhi.HA_CHI, TietKhi.THU_PHAN, TietKhi.DONG_CHI)
+TU_TUYET = (TietKhi.LAP_XUAN, TietKhi.LAP_HA, TietKhi.LAP_THU, TietKhi.LAP_DONG)
+
+
+class DayRules(NamedTuple):
+    birth_year_code: Union[int, None] = None  # year code of the person (see `CompatibilityUtil.year_code`), None to ignore
+    min_score: float = 0  # days whose can chi scores less with the year of birth are left out
+    weights: CompatibilityWeights = CompatibilityWeights()
+    avoid_chi: Tuple[int, ...] = ()  # chi indices of the days to leave out
+    avoid_lunar_days: Tuple[int, ...] = TAM_NUONG + NGUYET_KY
+    avoid_tu_ly_tu_tuyet: bool = True
+
+
+class GoodDay(NamedTuple):
+    solar: SolarDate
+    lunar_year: int
+    lunar_month: int
+    lunar_day: int
+    leap: bool
+    can_chi: Tuple[int, int]  # can chi of the day, see `ZodiacUtil.zodiac_day_tuple`
+    weekday: int  # 0 is Sunday
+    score: Union[float, None]  # compatibility of the can chi of the day with the year of birth, None without one
+
+
+class GoodDayUtil:
+    """
+    Good days of a range of months, see the module.
+    """
+
+    @staticmethod
+    @cached(maxsize=64)
+    def masks(rules: DayRules) -> Tuple[Tuple[Union[float, None, bool], ...], Tuple[bool, ...]]:
+        """
+        Return the lookup tables of `rules`: by day code (see `Pillar.code`), the score of the day with the year of
+        birth, None without one, or False if the day is left out; and by lunar day (0 unused), whether it is allowed.
+        """
+
+        if rules.birth_year_code is not None and not 0 <= rules.birth_year_code < 60:
+            raise ValueError(f'Invalid year code {rules.birth_year_code}')
+        if not all(1 <= chi <= 12 for chi in rules.avoid_chi):
+            raise ValueError('Invalid chi to avoid')
+
+        days = []
+        for code in range(60):
+            if Pillar.from_code(code).chi in rules.avoid_chi:
+                days.append(False)
+            elif rules.birth_year_code is None:
+                days.append(None)
+            else:
+                score = CompatibilityUtil.compare(rules.birth_year_code, code, rules.weights).score
+                days.append(score if score >= rules.min_score else False)
+
+        lunar_days = tuple(day not in rules.avoid_lunar_days for day in range(31))
+        return tuple(days), lunar_days
+
+
+    @staticmethod
+    @cached(maxsize=64)
+    def tu_ly_tu_tuyet(year: int, timezone: float = 7) -> FrozenSet[int]:
+        """
+        Return the Julian Day Numbers of the tu ly and tu tuyet days of the solar year `year`.
+        """
+
+        terms = SolarTermUtil.terms_of_year(year, timezone)
+        return frozenset(DateUtil.jdn_from_ymd(date.year, date.month, date.day) - 1 for term, date in terms if term in TU_LY or term in TU_TUYET)
+
+
+    @staticmethod
+    def iter_good_days(start: SolarDate, end: SolarDate, rules: DayRules = DayRules(), timezone: float = 7) -> Iterator[GoodDay]:
+        """
+        Iterate over the days from `start` to `end`, both included, passing `rules`.
+        """
+
+        days, lunar_days = GoodDayUtil.masks(rules)
+        jdn = DateUtil.jdn_from_ymd(start.year, start.month, start.day)
+        end_jdn = DateUtil.jdn_from_ymd(end.year, end.month, end.day)
+        if jdn > end_jdn:
+            return
+
+        year, month, day = start.year, start.month, start.day
+        code = (jdn + 49) % 60  # Giap Ti days are the JDNs 11 modulo 60
+        jd_next_month_start = jdn
+        excluded = GoodDayUtil.tu_ly_tu_tuyet(year, timezone) if rules.avoid_tu_ly_tu_tuyet else frozenset()
+
+        while True:
+            if jdn >= jd_next_month_start:
+                lunar_year, lunar_month, leap, jd_month_start, jd_next_month_start = DateUtil.lunar_month_of_jdn(jdn, year, timezone)
+
+            score = days[code]
+            if score is not False and lunar_days[jdn - jd_month_start + 1] and jdn not in excluded:
+                pillar = Pillar.from_code(code)
+                yield GoodDay(SolarDate(year, month, day), lunar_year, lunar_month, jdn - jd_month_start + 1, leap, (pillar.can, pillar.chi), (jdn + 1) % 7, score)
+
+            if jdn == end_jdn:
+                return
+
+            jdn += 1
+            day += 1
+            code = (code + 1) % 60
+            if day > 28 or jdn == 2299161:
+                # Might be the next month, or the first day of the Gregorian calendar
+                previous_year = year
+                year, month, day = DateUtil.ymd_from_jdn(jdn)
+                if rules.avoid_tu_ly_tu_tuyet and year != previous_year:
+                    excluded = GoodDayUtil.tu_ly_tu_tuyet(year, timezone)
+
+
+    @staticmethod
+    def find(first_year: int, first_month: int, last_year: int, last_month: int, rules: DayRules = DayRules(), timezone: float = 7) -> List[GoodDay]:
+        """
+        Return the days of the solar months from `first_month` of `first_year` to `last_month` of `last_year`,
+        both included, passing `rules`.
+        """
+
+        if not 1 <= first_month <= 12 or not 1 <= last_month <= 12:
+            raise InvalidDateException('Invalid month')
+
+        next_year, next_month = (last_year, last_month + 1) if last_month < 12 else (last_year + 1, 1)
+        end = DateUtil.ymd_from_jdn(DateUtil.jdn_from_ymd(next_year, next_month, 1) - 1)
+        return list(GoodDayUtil.iter_good_days(SolarDate(first_year, first_month, 1), SolarDate(*end), rules, timezone))
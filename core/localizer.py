@@ -1,6 +1,7 @@
 from typing import Callable, Any
 from abc import ABC, abstractmethod
-from functools import lru_cache
+
+from .caches import cached
 
 
 class Localizer(ABC):
@@ -33,7 +34,7 @@ class VNLocalizer(Localizer):
     
 
     @staticmethod
-    @lru_cache(maxsize=25)
+    @cached(maxsize=25)
     def _localize(s: str) -> str:
         """
         Vietnamese localizing a string.
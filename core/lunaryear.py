@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from math import floor
+from typing import List, NamedTuple, Tuple
+
+from .caches import cached
+from .exceptions import InvalidDateException
+
+
+class LunarYearInfo(NamedTuple):
+    """
+    The months of one lunar year, from the 1st month to the 12th, leap month included, at one timezone.
+    """
+
+    year: int
+    timezone: float
+    month_starts: Tuple[int, ...]  # Julian Day Number of the first day of every month, then of the 1st month of the next year
+    leap_month: int  # number of the month followed by a leap month, 0 if the year has none
+
+    @property
+    def length(self) -> int:
+        """
+        Number of days in the year.
+        """
+
+        return self.month_starts[-1] - self.month_starts[0]
+
+
+    def month_start(self, month: int, leap: bool = False) -> int:
+        """
+        Return the Julian Day Number of the first day of `month`, or of the leap month following it if `leap` is True.
+        """
+
+        if not 1 <= month <= 12 or leap and month != self.leap_month:
+            raise InvalidDateException('Invalid lunar month')
+
+        # The leap month comes right after the month it repeats, every month after them is shifted by one
+        i = month - 1
+        if self.leap_month and (month > self.leap_month or leap):
+            i += 1
+        return self.month_starts[i]
+
+
+    def locate(self, jdn: int) -> Tuple[int, bool, int, int]:
+        """
+        Find the month containing the day `jdn`. Return its number, whether it is the leap month,
+        and the Julian Day Numbers of its first day and of the first day of the next month.
+        """
+
+        i = bisect_right(self.month_starts, jdn) - 1
+        if not 0 <= i < len(self.month_starts) - 1:
+            raise InvalidDateException('Day out of the lunar year')
+
+        month = i + 1
+        leap = False
+        if self.leap_month and i >= self.leap_month:
+            month -= 1
+            leap = i == self.leap_month
+        return month, leap, self.month_starts[i], self.month_starts[i + 1]
+
+
+class LunarYearUtil:
+    """
+    Lunar years, described once by a `LunarYearInfo` and kept in a bounded cache, so converting dates
+    is a bisection in the months of their year.
+    """
+
+    CACHE_SIZE = 1024
+
+    @staticmethod
+    @cached(maxsize=CACHE_SIZE)
+    def year_info(year: int, timezone: float = 7) -> LunarYearInfo:
+        """
+        Return the description of the lunar year `year` at `timezone`.
+
+        The 1st to 10th months are in the period running from the 11th month of `year` - 1 to the 11th month of
+        `year`, the 11th and 12th months in the next one. Each period has 12 months, or 13 with a leap month.
+        """
+
+        months = LunarYearUtil._period_months(year - 1, timezone) + LunarYearUtil._period_months(year, timezone)
+
+        month_starts = []
+        leap_month = 0
+        for month_start, lunar_year, month, leap in months:
+            if lunar_year == year:
+                month_starts.append(month_start)
+                if leap:
+                    leap_month = month
+            elif month_starts:
+                # The 1st month of the next year
+                month_starts.append(month_start)
+                break
+
+        return LunarYearInfo(year, timezone, tuple(month_starts), leap_month)
+
+
+    @staticmethod
+    def _period_months(year: int, timezone: float) -> List[Tuple[int, int, int, bool]]:
+        """
+        Return the months from the 11th month of `year` to the one before the 11th month of `year` + 1,
+        as (first day, lunar year, month number, leap) tuples.
+        """
+
+        from .utils import DateUtil
+
+        a11 = DateUtil.get_lunar_month_11(year, timezone)
+        b11 = DateUtil.get_lunar_month_11(year + 1, timezone)
+        k = int(floor((a11 - DateUtil.jde_of_kth_new_moon(0)) / 29.530588861 + 0.5))
+        leap_offset = DateUtil.get_leap_month_offset(a11, timezone) if b11 - a11 > 365 else None
+
+        months = []
+        for i in range(13 if leap_offset is not None else 12):
+            month = i + 11
+            leap = False
+            if leap_offset is not None and i >= leap_offset:
+                month = i + 10
+                leap = i == leap_offset
+            if month > 12:
+                month -= 12
+            # The 11th and 12th months, and their leap month, belong to `year`
+            lunar_year = year if month >= 11 and i < 4 else year + 1
+            months.append((DateUtil.new_moon_tz_adjusted(k + i, timezone), lunar_year, month, leap))
+        return months
+
+
+    @staticmethod
+    def precompute(first_year: int, last_year: int, timezone: float = 7) -> List[LunarYearInfo]:
+        """
+        Describe the lunar years `first_year` to `last_year` and return them.
+        At most `CACHE_SIZE` years stay in the cache, the last ones of the range if it is longer.
+        """
+
+        return [LunarYearUtil.year_info(year, timezone) for year in range(first_year, last_year + 1)]
+
+
+    @staticmethod
+    @cached(maxsize=8)
+    def month_arrays(first_year: int, last_year: int, timezone: float = 7):
+        """
+        Return the months of the lunar years `first_year` to `last_year` as NumPy arrays: the first day of every month
+        (followed by that of the 1st month of `last_year` + 1), and the lunar year, month number and leap flag of every month.
+        """
+
+        import numpy
+
+        starts, years, months, leaps = [], [], [], []
+        for info in LunarYearUtil.precompute(first_year, last_year, timezone):
+            for i, month_start in enumerate(info.month_starts[:-1]):
+                month, leap, _, _ = info.locate(month_start)
+                starts.append(month_start)
+                years.append(info.year)
+                months.append(month)
+                leaps.append(leap)
+        starts.append(info.month_starts[-1])
+
+        arrays = numpy.array(starts, dtype=numpy.int64), numpy.array(years), numpy.array(months), numpy.array(leaps)
+        # Shared by every caller through the cache
+        for array in arrays:
+            array.flags.writeable = False
+        return arrays
+
+
+    @staticmethod
+    def lunar_dates_of_jdn_array(jdns, timezone: float = 7):
+        """
+        Convert the NumPy array of Julian Day Numbers `jdns` to lunar dates, returned as arrays of lunar years,
+        months, days and leap flags. Same as `DateUtil.solar_to_lunar` for every element, with one bisection
+        per day in the months of the lunar years `jdns` spans.
+        """
+
+        from .utils import DateUtil
+
+        # The lunar year of a day is its solar year or the previous one
+        first_year = DateUtil.ymd_from_jdn(int(jdns.min()))[0] - 1
+        last_year = DateUtil.ymd_from_jdn(int(jdns.max()))[0]
+        starts, years, months, leaps = LunarYearUtil.month_arrays(first_year, last_year, timezone)
+
+        i = starts.searchsorted(jdns, side='right') - 1
+        return years[i], months[i], jdns - starts[i] + 1, leaps[i]
+
+
+    @staticmethod
+    def year_of_jdn(jdn: int, year: int, timezone: float = 7) -> LunarYearInfo:
+        """
+        Return the lunar year containing the day `jdn`, which falls in the solar year `year`.
+        """
+
+        info = LunarYearUtil.year_info(year, timezone)
+        if jdn < info.month_starts[0]:
+            # Before the lunar new year, still in the previous lunar year
+            info = LunarYearUtil.year_info(year - 1, timezone)
+        return info
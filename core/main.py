@@ -7,13 +7,14 @@ from core.tuvi.elements.trangthai import TrangThai
 from core.tuvi.stars.sao import SaoRegistry
 from core.tuvi.utils import TuViUtil
 from core.utils import ZodiacUtil, DateUtil
+from core.tutru import TuTru
 from core.exceptions import InvalidGioiTinh, InvalidViTri
 from core.localizer import VNLocalizer
-from core.draw import Color, FontSize, get_position, get_color, get_color_by_nguhanh
+from core.draw import Color, FontSize, FONT_PATH, BOLD_FONT_PATH, get_font, get_position, get_color, get_color_by_nguhanh
 
 from typing import Union, List
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import io
 import base64
 from datetime import datetime, timedelta
@@ -55,9 +56,12 @@ class LaSoTuVi:
         """
         Prepare all positions of stars. 
         NOTE: This is a private method, should not be called outside this class scope.
+        NOTE: The trang thai of a star is a class attribute, set by `SaoRegistry.place` for this chart and kept
+        until the next chart is built: reading a chart is only right before another one is built, and building
+        charts in several threads at once is not thread-safe (hence one render per process, see TUVI_MAX_CONCURRENT_RENDERS).
         """
-        for sao in SaoRegistry.get_subclasses():
-            vi_tri = sao.an_sao(self.birthdate, self.cur_year, self.gender)
+        saos = SaoRegistry.get_subclasses()
+        for sao, vi_tri in zip(saos, SaoRegistry.place(self.birthdate, self.cur_year, self.gender)):
             if sao.name == 'Tuần':
                 self.vi_tri_tuan = vi_tri
             elif sao.name == 'Triệt':
@@ -211,10 +215,90 @@ class LaSoTuVi:
         return can[0] + '. ' + chi
 
     
+    @staticmethod
+    def make_key(year: int, month: int, day: int, hour: int, minute: int, gender: int, cur_year: int) -> str:
+        """
+        Return the canonical key of the chart built from these arguments, i.e. `199511221030M2023`.
+        The name is not part of the key.
+        """
+
+        if gender == GioiTinh.NAM.value:
+            gender_code = 'M'
+        elif gender == GioiTinh.NU.value:
+            gender_code = 'F'
+        else:
+            raise InvalidGioiTinh('Gioi tinh khong hop le.')
+
+        return f'{year:04d}{month:02d}{day:02d}{hour:02d}{minute:02d}{gender_code}{cur_year:04d}'
+
+
+    @staticmethod
+    def from_key(key: str, hoten: str = 'Tử vi Tiến Minh') -> 'LaSoTuVi':
+        """
+        Build the chart whose canonical key is `key`, the reverse of `make_key`.
+        """
+
+        year, month, day, hour, minute = int(key[0:4]), int(key[4:6]), int(key[6:8]), int(key[8:10]), int(key[10:12])
+        if key[12] == 'M':
+            gender = GioiTinh.NAM.value
+        elif key[12] == 'F':
+            gender = GioiTinh.NU.value
+        else:
+            raise InvalidGioiTinh('Gioi tinh khong hop le.')
+
+        return LaSoTuVi(year, month, day, hour, minute, gender=gender, cur_year=int(key[13:17]), hoten=hoten)
+
+
+    @property
+    def key(self) -> str:
+        return self.make_key(self.old_year, self.old_month, self.old_day, self.old_hour, self.old_minute, self.gender, self.cur_year)
+
+
+    def to_dict(self) -> dict:
+        """
+        Return the chart as plain data, small enough to be stored or sent as JSON.
+        Stars are `[name, trang thai]` pairs, the trang thai being None when it is not printed.
+        """
+
+        cells = []
+        for cell in self.diaban:
+            cells.append({
+                'id': cell.ID,
+                'name': cell.name,
+                'zodiac': cell.zodiac,
+                'dai_han': cell.dai_han,
+                'tieu_han': cell.tieu_han,
+                'nguyet_han': cell.nguyet_han,
+                'chinh_tinh': [[star.name, star.trang_thai.value] for star in cell.chinh_tinh],
+                'phu_tinh_trai': [[star.name, star.trang_thai.value] for star in cell.phu_tinh_trai],
+                'phu_tinh_phai': [[star.name, star.trang_thai.value] for star in cell.phu_tinh_phai],
+                'phu_tinh_duoi': cell.phu_tinh_duoi.name if cell.phu_tinh_duoi is not None else None,
+            })
+
+        return {
+            'key': self.key,
+            'hoten': self.hoten,
+            'am_duong': TuViUtil.tim_am_duong(self.birthdate, self.gender),
+            'menh': TuViUtil.tim_menh(self.birthdate),
+            'cuc': TuViUtil.tim_cuc(self.birthdate),
+            'tuan': self.vi_tri_tuan,
+            'triet': self.vi_tri_triet,
+            'cells': cells,
+        }
+
+
     def get_image(self) -> str:
         """
         Return horoscope image, in the format of base64 encoded byte string. 
         """
+
+        return base64.b64encode(self.get_image_bytes()).decode()
+
+
+    def get_image_bytes(self) -> bytes:
+        """
+        Return horoscope image as PNG bytes.
+        """
         
         # Define image size and background color
         width, height = 800, 800
@@ -227,14 +311,12 @@ class LaSoTuVi:
         draw = ImageDraw.Draw(image)
 
         # Create fonts
-        font_path = 'fonts/Arial.ttf'
-        bold_font_path = 'fonts/Arial Bold.ttf'
-        font_small = ImageFont.truetype(font_path, FontSize.SMALL.value)
-        font_medium = ImageFont.truetype(font_path, FontSize.MEDIUM.value)
-        font_large = ImageFont.truetype(font_path, FontSize.LARGE.value)
-        font_small_bold = ImageFont.truetype(bold_font_path, FontSize.SMALL.value)
-        font_medium_bold = ImageFont.truetype(bold_font_path, FontSize.MEDIUM.value)
-        font_large_bold = ImageFont.truetype(bold_font_path, FontSize.LARGE.value)
+        font_small = get_font(FONT_PATH, FontSize.SMALL.value)
+        font_medium = get_font(FONT_PATH, FontSize.MEDIUM.value)
+        font_large = get_font(FONT_PATH, FontSize.LARGE.value)
+        font_small_bold = get_font(BOLD_FONT_PATH, FontSize.SMALL.value)
+        font_medium_bold = get_font(BOLD_FONT_PATH, FontSize.MEDIUM.value)
+        font_large_bold = get_font(BOLD_FONT_PATH, FontSize.LARGE.value)
 
         # Cell width and height
         cell_size = 200
@@ -387,25 +469,26 @@ class LaSoTuVi:
 
         # Ngay, Thang, Nam, Gio
         lunar_date = DateUtil.solar_to_lunar(self.birthdate.empty_hms())
+        tu_tru = TuTru.from_date(self.birthdate)
         # Nam
         draw.text(get_position((0, 0), (width, height), width_percent=31.25, height_percent=38), 'Năm:', fill=Color.BLACK.value, font=font_small_bold)
         draw.text(get_position((0, 0), (width, height), width_percent=43.75, height_percent=38), str(self.old_year), fill=Color.BLUE.value, font=font_small)
-        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=38), ZodiacUtil.zodiac_year(lunar_date), fill=Color.BLUE.value, font=font_small)
+        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=38), tu_tru.year.name, fill=Color.BLUE.value, font=font_small)
         
         # Thang
         draw.text(get_position((0, 0), (width, height), width_percent=31.25, height_percent=40), 'Tháng:', fill=Color.BLACK.value, font=font_small_bold)
         draw.text(get_position((0, 0), (width, height), width_percent=43.75, height_percent=40), f'{str(self.old_month).zfill(2)} ({str(lunar_date.month).zfill(2)})', fill=Color.BLUE.value, font=font_small)
-        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=40), ZodiacUtil.zodiac_month(lunar_date), fill=Color.BLUE.value, font=font_small)
+        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=40), tu_tru.month.name, fill=Color.BLUE.value, font=font_small)
         
         # Ngay
         draw.text(get_position((0, 0), (width, height), width_percent=31.25, height_percent=42), 'Ngày:', fill=Color.BLACK.value, font=font_small_bold)
         draw.text(get_position((0, 0), (width, height), width_percent=43.75, height_percent=42), f'{str(self.old_day).zfill(2)} ({str(lunar_date.day).zfill(2)})', fill=Color.BLUE.value, font=font_small)
-        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=42), ZodiacUtil.zodiac_day(self.birthdate), fill=Color.BLUE.value, font=font_small)
+        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=42), tu_tru.day.name, fill=Color.BLUE.value, font=font_small)
         
         # Gio
         draw.text(get_position((0, 0), (width, height), width_percent=31.25, height_percent=44), 'Giờ:', fill=Color.BLACK.value, font=font_small_bold)
         draw.text(get_position((0, 0), (width, height), width_percent=43.75, height_percent=44), f'{str(self.old_hour).zfill(2)} giờ {str(self.old_minute).zfill(2)} phút', fill=Color.BLUE.value, font=font_small)
-        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=44), ZodiacUtil.zodiac_hour(self.birthdate), fill=Color.BLUE.value, font=font_small)
+        draw.text(get_position((0, 0), (width, height), width_percent=60, height_percent=44), tu_tru.hour.name, fill=Color.BLUE.value, font=font_small)
         
         # Nam xem
         draw.text(get_position((0, 0), (width, height), width_percent=31.25, height_percent=47), 'Năm xem:', fill=Color.BLACK.value, font=font_small_bold)
@@ -481,9 +564,4 @@ class LaSoTuVi:
         image_buffer.seek(0)
         
         # Get image byte value
-        image_bytes = image_buffer.getvalue()
-
-        # Base64 encoding
-        base64_encoded = base64.b64encode(image_bytes).decode()
-
-        return base64_encoded
+        return image_buffer.getvalue()
@@ -1,13 +1,15 @@
-from functools import lru_cache
 from typing import Union
 from math import pi
 
+from .caches import cached
 from .exceptions import InvalidMonthException
 
 
 class DateMixin:
+    __slots__ = ()
+
     @staticmethod
-    @lru_cache(maxsize=35)
+    @cached(maxsize=35)
     def get_ordinal(number: int) -> str:
         """
         Get ordinal suffix of number in range [1, 31].
@@ -24,7 +26,7 @@ class DateMixin:
 
 
     @staticmethod
-    @lru_cache(maxsize=25)
+    @cached(maxsize=25)
     def days_of_month(month: int, leap: bool = False) -> int:
         """
         Get the number of days in month `month`.
@@ -40,7 +42,7 @@ class DateMixin:
     
 
     @staticmethod
-    @lru_cache(maxsize=15)
+    @cached(maxsize=15)
     def get_month_name(month: int) -> str:
         """
         Get the month name given `month`, i.e, 1 to January.
@@ -70,13 +72,11 @@ class DateMixin:
 class AngleMixin:
     @staticmethod
     def to_radians(degrees: Union[float, int]) -> float:
-        result = degrees * pi / 180.0
-        while result >= 2 * pi:
-            result -= 2 * pi
-        while result < 0:
-            result += 2 * pi
+        """
+        Convert `degrees` to radians, reduced to [0; 2*pi).
+        """
 
-        return result
+        return (degrees * pi / 180.0) % (2 * pi)
     
     
     @staticmethod
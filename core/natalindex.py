@@ -0,0 +1,401 @@
+"""
+Inverted index of the natal charts: for every star, cell and trang thai, and every palace and cell, the set of natal
+charts placing it there, as a bitset over the whole natal domain.
+
+A natal chart only depends on the can chi of the lunar year of birth, the lunar month and day, the chi of the hour
+and the gender, so the domain is finite: 60 * 12 * 30 * 12 * 2 = 518400 natal keys, some of which (the 30th day of
+some months) no birth reaches. The index is built once, from one example birth per key, and saved to a file
+which is memory mapped, like the lunar tables. Queries combine bitsets and take milliseconds:
+
+    index = NatalIndex.load('natal_index.bin')
+    found = index.star('Tử Vi', palace='menh') & index.star('Thiên Phủ', palace='menh') & index.star('Hoá Lộc', palace='menh')
+    len(found), found.births(limit=5)
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import unicodedata
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple, Union
+
+try:
+    import numpy
+except ImportError as e:  # the index is a NumPy structure, unlike the optional batch paths elsewhere in core
+    raise ImportError('core.natalindex needs NumPy, install requirements-batch.txt') from e
+
+from .date import SolarDate
+from .exceptions import InvalidNatalIndex
+from .export import PALACES, TRANG_THAI, TRANG_THAI_CODES
+from .lunaryear import LunarYearUtil
+from .tuvi.elements.gioitinh import GioiTinh
+from .tuvi.elements.trangthai import TrangThai
+from .tuvi.stars.sao import Sao, SaoRegistry
+from .utils import DateUtil
+
+DAYS = 60 * 12 * 30  # lunar (year can chi, month, day) of the domain
+SIZE = DAYS * 12 * 2
+NBYTES = SIZE // 8
+
+# One hour in every chi, from Ti (0:00, 23:00 is the Ti hour of the next day) to Hoi
+HOURS = [0] + list(range(1, 23, 2))
+
+_POPCOUNT = numpy.array([bin(byte).count('1') for byte in range(256)], dtype=numpy.uint8)
+
+
+def natal_stars() -> List[Sao]:
+    """
+    Return the stars placed from the birth alone. The Luu stars are placed for the current year.
+    """
+
+    return [sao for sao in SaoRegistry.get_subclasses() if not sao.name.startswith('L. ')]
+
+
+class NatalKey(NamedTuple):
+    can_chi: int  # of the lunar year of birth, 0 for Giap Ti to 59 for Quy Hoi
+    month: int  # lunar, a leap month counting as the month it repeats
+    day: int  # lunar
+    hour: int  # chi, 1 for Ti to 12 for Hoi
+    gender: int
+
+    @property
+    def code(self) -> int:
+        """
+        The index of the key in the natal domain, and of its bit in the bitsets.
+        """
+
+        day = (self.can_chi * 12 + self.month - 1) * 30 + self.day - 1
+        return (day * 12 + self.hour - 1) * 2 + (self.gender == GioiTinh.NU.value)
+
+
+    @staticmethod
+    def from_code(code: int) -> NatalKey:
+        code, female = divmod(code, 2)
+        code, hour = divmod(code, 12)
+        code, day = divmod(code, 30)
+        can_chi, month = divmod(code, 12)
+        return NatalKey(can_chi, month + 1, day + 1, hour + 1, GioiTinh.NU.value if female else GioiTinh.NAM.value)
+
+
+    @staticmethod
+    def of_birth(birthdate: SolarDate, gender: int) -> NatalKey:
+        """
+        Return the key of the chart of a birth, with the solar date and time `birthdate`.
+        """
+
+        if birthdate.hour >= 23:
+            # The Ti hour of the next day, as in `LaSoTuVi`
+            birthdate = SolarDate(*DateUtil.ymd_from_jdn(DateUtil.jdn_from_ymd(birthdate.year, birthdate.month, birthdate.day) + 1))
+        lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
+        return NatalKey((lunar_date.year - 4) % 60, lunar_date.month, lunar_date.day, (birthdate.hour + 1) // 2 % 12 + 1, gender)
+
+
+class NatalSet:
+    """
+    A set of natal keys, as a bitset. Sets of the same index combine with `&`, `|` and `-`, `~` is the complement
+    in the keys a birth reaches.
+    """
+
+    __slots__ = ('index', 'bits')
+
+    def __init__(self, index: NatalIndex, bits) -> None:
+        self.index = index
+        self.bits = bits
+
+
+    def __and__(self, other: NatalSet) -> NatalSet:
+        return NatalSet(self.index, self.bits & other.bits)
+
+
+    def __or__(self, other: NatalSet) -> NatalSet:
+        return NatalSet(self.index, self.bits | other.bits)
+
+
+    def __sub__(self, other: NatalSet) -> NatalSet:
+        return NatalSet(self.index, self.bits & ~other.bits)
+
+
+    def __invert__(self) -> NatalSet:
+        return self.index.domain() - self
+
+
+    def __len__(self) -> int:
+        return int(_POPCOUNT[self.bits].sum(dtype=numpy.int64))
+
+
+    def __bool__(self) -> bool:
+        return bool(self.bits.any())
+
+
+    def __contains__(self, key: NatalKey) -> bool:
+        code = key.code
+        return bool(self.bits[code >> 3] >> (code & 7) & 1)
+
+
+    def codes(self, limit: Union[int, None] = None):
+        """
+        Return the codes of the keys in the set, in order, as a NumPy array.
+        """
+
+        codes = numpy.flatnonzero(numpy.unpackbits(self.bits, bitorder='little'))
+        return codes[:limit]
+
+
+    def keys(self, limit: Union[int, None] = None) -> List[NatalKey]:
+        return [NatalKey.from_code(code) for code in self.codes(limit).tolist()]
+
+
+    def births(self, limit: Union[int, None] = None) -> List[Tuple[SolarDate, int]]:
+        """
+        Return an example birth of every key in the set, as (solar birthdate, gender) tuples.
+        """
+
+        return [self.index.birth(code) for code in self.codes(limit).tolist()]
+
+
+def _fold(name: str) -> str:
+    """
+    Return `name` without case and diacritics, so 'Hóa Lộc' finds the star Hoá Lộc.
+    """
+
+    name = ''.join(c for c in unicodedata.normalize('NFD', name) if not unicodedata.combining(c))
+    return name.replace('đ', 'd').replace('Đ', 'D').lower()
+
+
+def _example_days(first_year: int, last_year: int):
+    """
+    Return the Julian Day Number of an example solar day of every lunar (year can chi, month, day) of the domain,
+    0 for those no day of `first_year` to `last_year` reaches. Days of leap months are only used for lack of
+    another one, and the days closest to 2000 are preferred.
+    """
+
+    jdns = numpy.arange(DateUtil.jdn_from_ymd(first_year, 1, 1), DateUtil.jdn_from_ymd(last_year, 12, 31) + 1, dtype=numpy.int64)
+    years, months, days, leaps = LunarYearUtil.lunar_dates_of_jdn_array(jdns, 7)
+    slots = ((years - 4) % 60 * 12 + months - 1) * 30 + days - 1
+
+    order = numpy.lexsort((numpy.abs(jdns - DateUtil.jdn_from_ymd(2000, 1, 1)), leaps))
+    first = numpy.unique(slots[order], return_index=True)[1]
+    examples = numpy.zeros(DAYS, dtype=numpy.int32)
+    examples[slots[order][first]] = jdns[order][first]
+    return examples
+
+
+def _place(slots: List[Tuple[int, int]]):
+    """
+    Place the natal stars and palaces of every birth of the (slot, jdn) days `slots`. Return a (stars + palaces, births)
+    array of codes: the cell, plus 16 times the trang thai code for a star, 0 for the births not placed.
+    """
+
+    stars = natal_stars()
+    none = TrangThai.NONE
+    placed = numpy.zeros((len(stars) + len(PALACES), len(slots) * 24), dtype=numpy.uint8)
+    for i, (slot, jdn) in enumerate(slots):
+        year, month, day = DateUtil.ymd_from_jdn(jdn)
+        for chi, hour in enumerate(HOURS):
+            birthdate = SolarDate(year, month, day, hour, 0)
+            for female, gender in enumerate((GioiTinh.NAM.value, GioiTinh.NU.value)):
+                column = (i * 12 + chi) * 2 + female
+                for row, sao in enumerate(stars):
+                    # Placed without cache, for the trang thai
+                    sao.trang_thai = none
+                    cell = sao.an_sao.__wrapped__(birthdate, 2000, gender)
+                    placed[row, column] = cell | TRANG_THAI_CODES[sao.trang_thai] << 4
+                for row, (_, find) in enumerate(PALACES, len(stars)):
+                    placed[row, column] = find(birthdate)
+    return placed
+
+
+def _place_year(args: Tuple[int, List[int]]):
+    can_chi, jdns = args
+    slots = [(slot, jdn) for slot, jdn in enumerate(jdns, can_chi * 360) if jdn]
+    return can_chi, [slot for slot, _ in slots], _place(slots)
+
+
+class NatalIndex:
+    """
+    The bitsets of the natal charts, see the module. Rows are bitsets of `SIZE` bits, bit `code` being the key
+    of that code: row 0 holds the keys reached by a birth, then a row per (star, cell, trang thai) and per
+    (palace, cell) found in the domain, as listed in `entries`.
+    """
+
+    MAGIC = b'TVNI'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sH2xII')
+
+    def __init__(self, entries: List[Tuple[str, str, int, Union[str, None]]], examples, bits) -> None:
+        self.entries = entries
+        self.examples = examples
+        self.bits = bits
+        self._rows: Dict[Tuple[str, str, int], List[Tuple[int, Union[str, None]]]] = {}
+        for row, (kind, name, cell, trang_thai) in enumerate(entries, 1):
+            self._rows.setdefault((kind, name, cell), []).append((row, trang_thai))
+
+        self._stars: Dict[str, str] = {}
+        folded: Dict[str, set] = {}
+        for sao in natal_stars():
+            self._stars[sao.__name__] = self._stars[sao.name] = sao.__name__
+            folded.setdefault(_fold(sao.name), set()).add(sao.__name__)
+        for name, classes in folded.items():
+            if len(classes) == 1:
+                self._stars.setdefault(name, next(iter(classes)))
+
+
+    @staticmethod
+    def build(first_year: int = 1800, last_year: int = 2200, can_chis: Union[List[int], None] = None, months: Union[List[int], None] = None,
+              processes: Union[int, None] = None, log: Callable[[str], None] = print) -> NatalIndex:
+        """
+        Place the natal stars and palaces of an example birth of every natal key, its solar day taken in `first_year`
+        to `last_year`, with `processes` worker processes (all the CPUs if None, none but this one if 1). `can_chis`
+        and `months` limit the build to these year can chi and lunar months, e.g. for tests.
+
+        Every birth places every star, over half a million births: install the lunar tables first.
+        """
+
+        examples = _example_days(first_year, last_year).reshape(60, 12, 30)
+        if can_chis is not None:
+            examples[numpy.isin(numpy.arange(60), can_chis, invert=True)] = 0
+        if months is not None:
+            examples[:, numpy.isin(numpy.arange(1, 13), months, invert=True)] = 0
+        examples = examples.ravel()
+
+        tasks = [(can_chi, examples[can_chi * 360:(can_chi + 1) * 360].tolist()) for can_chi in range(60) if examples[can_chi * 360:(can_chi + 1) * 360].any()]
+        stars = natal_stars()
+        placed = numpy.zeros((len(stars) + len(PALACES), SIZE), dtype=numpy.uint8)
+
+        def collect(results: Iterator) -> None:
+            for done, (can_chi, slots, year_placed) in enumerate(results, 1):
+                columns = (numpy.array(slots, dtype=numpy.int64)[:, None] * 24 + numpy.arange(24)).ravel()
+                placed[:, columns] = year_placed
+                log(f'{done}/{len(tasks)} years')
+
+        if processes == 1:
+            collect(map(_place_year, tasks))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                collect(pool.imap_unordered(_place_year, tasks))
+
+        entries = []
+        rows = [numpy.packbits(placed[0] != 0, bitorder='little')]
+        for row, values in enumerate(placed):
+            if row < len(stars):
+                kind, name = 'star', stars[row].__name__
+            else:
+                kind, name = 'palace', PALACES[row - len(stars)][0]
+            for value in numpy.flatnonzero(numpy.bincount(values, minlength=256)[1:]) + 1:
+                cell, trang_thai = int(value) & 15, int(value) >> 4
+                entries.append((kind, name, cell, TRANG_THAI[trang_thai].value if kind == 'star' else None))
+                rows.append(numpy.packbits(values == value, bitorder='little'))
+        return NatalIndex(entries, examples, numpy.stack(rows))
+
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to `path`, replacing the file atomically.
+        """
+
+        meta = json.dumps({'entries': self.entries}, ensure_ascii=False).encode()
+        meta += b' ' * (-(self._HEADER.size + len(meta)) % 8)
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self.MAGIC, self.VERSION, len(self.bits), len(meta)))
+            f.write(meta)
+            f.write(self.examples.astype('<i4').tobytes())
+            f.write(numpy.ascontiguousarray(self.bits).tobytes())
+        os.replace(temp_path, path)
+
+
+    @classmethod
+    def load(cls, path: str) -> NatalIndex:
+        """
+        Map the index saved at `path` into memory.
+        """
+
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < cls._HEADER.size:
+            raise InvalidNatalIndex('Natal index file is truncated.')
+
+        magic, version, rows, meta_size = cls._HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise InvalidNatalIndex('Unknown natal index file format.')
+        offset = cls._HEADER.size + meta_size
+        if len(buffer) != offset + 4 * DAYS + rows * NBYTES:
+            raise InvalidNatalIndex('Natal index file is truncated.')
+
+        entries = [tuple(entry) for entry in json.loads(buffer[cls._HEADER.size:offset])['entries']]
+        examples = numpy.frombuffer(buffer, dtype='<i4', count=DAYS, offset=offset)
+        bits = numpy.frombuffer(buffer, dtype=numpy.uint8, count=rows * NBYTES, offset=offset + 4 * DAYS).reshape(rows, NBYTES)
+        return NatalIndex(entries, examples, bits)
+
+
+    def domain(self) -> NatalSet:
+        """
+        Return the keys reached by a birth.
+        """
+
+        return NatalSet(self, self.bits[0])
+
+
+    def empty(self) -> NatalSet:
+        return NatalSet(self, numpy.zeros(NBYTES, dtype=numpy.uint8))
+
+
+    def star(self, star: Union[str, Sao], cell: Union[int, None] = None, palace: Union[str, None] = None,
+             trang_thai: Union[TrangThai, str, None] = None) -> NatalSet:
+        """
+        Return the keys placing `star`, its class, class name or name, in `cell` (1 to 12) or in `palace`, e.g. 'menh'
+        (see `core.export.PALACES`), anywhere if both are None, with the trang thai `trang_thai` if it is given.
+        """
+
+        name = self._star_name(star)
+        if isinstance(trang_thai, TrangThai):
+            trang_thai = trang_thai.value
+        if cell is not None and palace is not None:
+            raise ValueError('Give either a cell or a palace')
+
+        found = self.empty()
+        for star_cell in ([cell] if cell is not None else range(1, 13)):
+            rows = [row for row, value in self._rows.get(('star', name, star_cell), []) if trang_thai is None or value == trang_thai]
+            if not rows:
+                continue
+            in_cell = NatalSet(self, numpy.bitwise_or.reduce(self.bits[rows], axis=0))
+            found = found | (in_cell if palace is None else in_cell & self.palace(palace, star_cell))
+        return found
+
+
+    def palace(self, palace: str, cell: int) -> NatalSet:
+        """
+        Return the keys whose palace `palace` is in `cell`.
+        """
+
+        if palace not in (name for name, _ in PALACES):
+            raise ValueError(f'Unknown palace {palace!r}, expected one of {", ".join(name for name, _ in PALACES)}')
+        rows = [row for row, _ in self._rows.get(('palace', palace, cell), [])]
+        return NatalSet(self, self.bits[rows[0]]) if rows else self.empty()
+
+
+    def birth(self, code: int) -> Tuple[SolarDate, int]:
+        """
+        Return an example birth of the key `code`, as a (solar birthdate, gender) tuple.
+        """
+
+        key = NatalKey.from_code(code)
+        jdn = int(self.examples[code // 24])
+        if not jdn:
+            raise KeyError(f'No birth reaches {key}')
+        year, month, day = DateUtil.ymd_from_jdn(jdn)
+        return SolarDate(year, month, day, HOURS[key.hour - 1], 0), key.gender
+
+
+    def _star_name(self, star: Union[str, Sao]) -> str:
+        if isinstance(star, type):
+            star = star.__name__
+        name = self._stars.get(star) or self._stars.get(_fold(star))
+        if name is None:
+            raise ValueError(f'Unknown natal star {star!r}')
+        return name
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, List, Union
+
+from .tuvi.stars.sao import SaoRegistry
+
+
+class StarCall:
+    """
+    One call of a star's `an_sao`: its duration in nanoseconds, children included, whether the cache of `an_sao`
+    answered it, and the `an_sao` calls of other stars it made.
+    """
+
+    __slots__ = ('star', 'ns', 'hit', 'children')
+
+    def __init__(self, star: str) -> None:
+        self.star = star
+        self.ns = 0
+        self.hit = False
+        self.children: List[StarCall] = []
+
+
+    @property
+    def self_ns(self) -> int:
+        """
+        Duration of the call, without the nested `an_sao` calls.
+        """
+
+        return self.ns - sum(child.ns for child in self.children)
+
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'star': self.star,
+            'us': self.ns / 1000,
+            'hit': self.hit,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+class StarProfiler:
+    """
+    Record the `an_sao` calls of every registered star, e.g. those made by `LaSoTuVi._prepare`:
+
+        with StarProfiler() as profiler:
+            LaSoTuVi(1990, 5, 17, 8, 30, gender=1, cur_year=2024)
+        profiler.report()
+        profiler.save_folded('chart.folded')
+
+    While the profiler is active, the `an_sao` of every star is replaced by a wrapper timing it, and restored
+    when it exits. Nothing is wrapped the rest of the time, so charts built without profiler are not slowed down.
+    Only the calls of the thread which entered the profiler are recorded, and one profiler can be active at a time.
+    """
+
+    _active: Union[StarProfiler, None] = None
+    _lock = threading.Lock()
+
+    def __init__(self, root: str = 'LaSoTuVi._prepare') -> None:
+        self.root = root
+        self.calls: List[StarCall] = []  # calls made outside of any other `an_sao`, in order
+        self._stack: List[StarCall] = []
+        self._originals = {}
+        self._thread = None
+
+
+    def __enter__(self) -> StarProfiler:
+        with StarProfiler._lock:
+            if StarProfiler._active is not None:
+                raise RuntimeError('A star profiler is already active')
+            StarProfiler._active = self
+
+        self._thread = threading.get_ident()
+        for sao in SaoRegistry.get_subclasses():
+            original = sao.__dict__['an_sao']
+            self._originals[sao] = original
+            sao.an_sao = staticmethod(self._wrap(sao.__name__, original.__func__))
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        for sao, original in self._originals.items():
+            sao.an_sao = original
+        self._originals = {}
+        StarProfiler._active = None
+
+
+    def _wrap(self, star: str, an_sao: Callable) -> Callable:
+        @wraps(an_sao)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != self._thread:
+                return an_sao(*args, **kwargs)
+
+            call = StarCall(star)
+            (self._stack[-1].children if self._stack else self.calls).append(call)
+            self._stack.append(call)
+            hits = an_sao.cache_info().hits
+            start = time.perf_counter_ns()
+            try:
+                return an_sao(*args, **kwargs)
+            finally:
+                call.ns = time.perf_counter_ns() - start
+                call.hit = an_sao.cache_info().hits > hits
+                self._stack.pop()
+
+        wrapper.cache_info = an_sao.cache_info
+        wrapper.cache_clear = an_sao.cache_clear
+        # The uncached function, as on the `lru_cache` one
+        wrapper.__wrapped__ = an_sao.__wrapped__
+        return wrapper
+
+
+    def _walk(self):
+        stack = [(call, (call.star,)) for call in reversed(self.calls)]
+        while stack:
+            call, path = stack.pop()
+            yield call, path
+            stack.extend((child, path + (child.star,)) for child in reversed(call.children))
+
+
+    def report(self) -> List[Dict[str, object]]:
+        """
+        Summarize the calls per star class, the slowest first: number of calls and cache hits, total and self time
+        in microseconds, and the number of `an_sao` calls it made per nested star.
+        """
+
+        stars = {}
+        for call, _ in self._walk():
+            star = stars.setdefault(call.star, {'star': call.star, 'calls': 0, 'hits': 0, 'total_us': 0.0, 'self_us': 0.0, 'nested': Counter()})
+            star['calls'] += 1
+            star['hits'] += call.hit
+            star['total_us'] += call.ns / 1000
+            star['self_us'] += call.self_ns / 1000
+            star['nested'].update(child.star for child in call.children)
+
+        for star in stars.values():
+            star['nested'] = dict(star['nested'])
+        return sorted(stars.values(), key=lambda star: star['total_us'], reverse=True)
+
+
+    def folded(self) -> str:
+        """
+        Return the calls as folded stacks, one `root;star;nested star <self time in ns>` line per call path,
+        the input of flame graph tools such as flamegraph.pl or speedscope.
+        """
+
+        samples = Counter()
+        for call, path in self._walk():
+            samples[';'.join((self.root,) + path)] += call.self_ns
+        return ''.join(f'{stack} {ns}\n' for stack, ns in samples.items())
+
+
+    def save_folded(self, path: str) -> None:
+        with open(path, 'w') as f:
+            f.write(self.folded())
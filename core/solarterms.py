@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from math import pi
+from typing import List, Tuple
+
+from .caches import cached
+from .date import Date
+from .tuvi.elements.tietkhi import TietKhi
+
+
+TIET_KHI_NAMES = (
+    'Tiểu hàn', 'Đại hàn', 'Lập xuân', 'Vũ thủy', 'Kinh trập', 'Xuân phân',
+    'Thanh minh', 'Cốc vũ', 'Lập hạ', 'Tiểu mãn', 'Mang chủng', 'Hạ chí',
+    'Tiểu thử', 'Đại thử', 'Lập thu', 'Xử thử', 'Bạch lộ', 'Thu phân',
+    'Hàn lộ', 'Sương giáng', 'Lập đông', 'Tiểu tuyết', 'Đại tuyết', 'Đông chí',
+)
+
+
+class SolarTermUtil:
+    """
+    The 24 solar terms (tiet khi).
+
+    Term instants are found by root finding on `DateUtil.sun_longitude` and kept in one flat array of Julian days (UT).
+    With `_table` = (first_year, instants), `instants[24 * (year - first_year) + i]` is the start of term `i` of `year`.
+    The array covers a contiguous range of years and is extended on demand, so every query is a bisection
+    or an index computation. Queries only extend it while it spans at most `MAX_TABLE_YEARS` years, the terms of
+    years further away are computed for the query alone (and kept in a small cache), so a request for a far
+    year neither stalls on thousands of years of terms nor grows the table for good. `precompute` is not limited.
+    """
+
+    TROPICAL_YEAR = 365.2421896698
+    PRECISION = 1e-6  # in days, about 0.1 second
+    MAX_TABLE_YEARS = 500
+
+    _table: Tuple[int, array] = (0, array('d'))
+    _lock = threading.Lock()
+
+    @staticmethod
+    def term_longitude(term: int) -> int:
+        """
+        Return the sun longitude in degrees at which term `term` (see `TietKhi`) starts.
+        """
+
+        return (285 + 15 * term) % 360
+
+
+    @staticmethod
+    def find_term_instant(year: int, term: int) -> float:
+        """
+        Compute the instant, in Julian day (UT), at which term `term` of `year` starts.
+        """
+
+        from .utils import DateUtil
+
+        target = SolarTermUtil.term_longitude(term)
+        # Tieu han starts around January 5th
+        jd = DateUtil.jdn_from_ymd(year, 1, 5) + term * SolarTermUtil.TROPICAL_YEAR / 24
+        rate = 360 / SolarTermUtil.TROPICAL_YEAR
+
+        for _ in range(50):
+            delta = (DateUtil.sun_longitude(jd) * 180 / pi - target + 180) % 360 - 180
+            step = delta / rate
+            jd -= step
+            if abs(step) < SolarTermUtil.PRECISION:
+                break
+
+        return jd
+
+
+    @classmethod
+    def precompute(cls, first_year: int, last_year: int) -> None:
+        """
+        Make sure the terms of `first_year` to `last_year` are computed.
+        """
+
+        if cls._covers(first_year, last_year):
+            return
+
+        with cls._lock:
+            covered_first_year, instants = cls._table
+            if not instants:
+                cls._table = (first_year, cls._compute_years(first_year, last_year))
+                return
+
+            covered_last_year = covered_first_year + len(instants) // 24 - 1
+            if first_year < covered_first_year:
+                instants = cls._compute_years(first_year, covered_first_year - 1) + instants
+            if last_year > covered_last_year:
+                instants = instants + cls._compute_years(covered_last_year + 1, last_year)
+
+            # Publish the extended table at once, readers never see it half built
+            cls._table = (min(first_year, covered_first_year), instants)
+
+
+    @classmethod
+    def _covers(cls, first_year: int, last_year: int) -> bool:
+        covered_first_year, instants = cls._table
+        return bool(instants) and covered_first_year <= first_year and last_year < covered_first_year + len(instants) // 24
+
+
+    @staticmethod
+    def _compute_years(first_year: int, last_year: int) -> array:
+        return array('d', (SolarTermUtil.find_term_instant(year, term) for year in range(first_year, last_year + 1) for term in range(24)))
+
+
+    @staticmethod
+    @cached(maxsize=32)
+    def _year_instants(year: int) -> array:
+        return SolarTermUtil._compute_years(year, year)
+
+
+    @classmethod
+    def _instants(cls, first_year: int, last_year: int) -> Tuple[int, array]:
+        """
+        Return (first year, instants) covering the terms of `first_year` to `last_year`: the table, extended if it
+        would still span at most `MAX_TABLE_YEARS` years, or else the terms of these years alone.
+        """
+
+        if not cls._covers(first_year, last_year):
+            covered_first_year, instants = cls._table
+            if instants:
+                span = max(last_year, covered_first_year + len(instants) // 24 - 1) - min(first_year, covered_first_year) + 1
+            else:
+                span = last_year - first_year + 1
+            if span > cls.MAX_TABLE_YEARS:
+                return first_year, array('d', chain.from_iterable(cls._year_instants(year) for year in range(first_year, last_year + 1)))
+            cls.precompute(first_year, last_year)
+        return cls._table
+
+
+    @classmethod
+    def _instants_around(cls, jd_from: float, jd_to: float) -> Tuple[int, array]:
+        from .utils import DateUtil
+
+        # One year of margin on each side, the first terms of a year are in effect since the end of the previous one
+        return cls._instants(DateUtil.ymd_from_jdn(int(jd_from + 0.5))[0] - 1, DateUtil.ymd_from_jdn(int(jd_to + 0.5))[0] + 1)
+
+
+    @classmethod
+    def terms_of_year(cls, year: int, timezone: float = 7) -> List[Tuple[TietKhi, Date]]:
+        """
+        Return the 24 terms of `year` with the local date and time at which each starts.
+        """
+
+        from .utils import DateUtil
+
+        first_year, instants = cls._instants(year, year)
+        offset = 24 * (year - first_year)
+        return [(TietKhi(term), DateUtil.date_from_jd(instants[offset + term] + timezone / 24)) for term in range(24)]
+
+
+    @classmethod
+    def term_of_date(cls, date: Date, timezone: float = 7) -> Tuple[TietKhi, Date]:
+        """
+        Return the term in effect at the local date and time `date`, with the local date and time at which it started.
+        """
+
+        from .utils import DateUtil
+
+        jd = DateUtil.jd_from_date(date) - timezone / 24
+        _, instants = cls._instants_around(jd, jd)
+
+        i = bisect_right(instants, jd) - 1
+        return TietKhi(i % 24), DateUtil.date_from_jd(instants[i] + timezone / 24)
+
+
+    @classmethod
+    def has_principal_term(cls, jd_from: float, jd_to: float) -> bool:
+        """
+        Check whether a principal term (trung khi) starts in [`jd_from`, `jd_to`), in Julian days (UT).
+        """
+
+        _, instants = cls._instants_around(jd_from, jd_to)
+
+        i = bisect_left(instants, jd_from)
+        while i < len(instants) and instants[i] < jd_to:
+            if i % 2 == 1:
+                return True
+            i += 1
+        return False
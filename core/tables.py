@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from math import floor
+from typing import Dict, Set, Tuple, Union
+
+from .exceptions import InvalidLunarTable
+
+try:
+    import numpy
+except ImportError:  # optional, only makes `NewMoonEphemeris.build` faster
+    numpy = None
+
+
+class NewMoonEphemeris:
+    """
+    Read-only array of the new moons `k_start` to `k_end` - 1, in Julian Ephemeris Day, as computed by
+    `DateUtil.new_moon_series`.
+
+    The float64 values are kept in an `array` or directly in a memory mapped file, like `LunarTable`,
+    and only one ephemeris is installed at a time. `DateUtil.jde_of_kth_new_moon` falls back to the series
+    for any `k` out of its range.
+    """
+
+    MAGIC = b'TVNM'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sH2xii')
+
+    _installed: Union[NewMoonEphemeris, None] = None
+
+    def __init__(self, k_start: int, jdes: Union[array, memoryview]) -> None:
+        self.k_start = k_start
+        self.k_end = k_start + len(jdes)
+        self.jdes = jdes
+
+
+    def jde(self, k: int) -> Union[float, None]:
+        """
+        Return the `k`-th new moon in Julian Ephemeris Day, or None if `k` is not in the ephemeris.
+        """
+
+        if self.k_start <= k < self.k_end:
+            return self.jdes[k - self.k_start]
+        return None
+
+
+    @staticmethod
+    def k_range(first_year: int, last_year: int) -> Tuple[int, int]:
+        """
+        Return the range of `k` needed by the lunar calendar of `first_year` to `last_year`, with a margin of
+        a couple of months on each side.
+        """
+
+        from .utils import DateUtil
+
+        jde_0 = DateUtil.new_moon_series(0)
+        k_start = int(floor((DateUtil.jdn_from_ymd(first_year, 1, 1) - 0.5 - jde_0) / 29.530588861)) - 2
+        k_end = int(floor((DateUtil.jdn_from_ymd(last_year, 12, 31) - 0.5 - jde_0) / 29.530588861)) + 3
+        return k_start, k_end
+
+
+    @staticmethod
+    def build(k_start: int, k_end: int) -> NewMoonEphemeris:
+        """
+        Compute the new moons `k_start` to `k_end` - 1, all at once with NumPy if it is installed.
+        """
+
+        from .utils import DateUtil
+
+        if numpy is None:
+            return NewMoonEphemeris(k_start, array('d', (DateUtil.new_moon_series(k) for k in range(k_start, k_end))))
+
+        jdes = array('d')
+        jdes.frombytes(DateUtil.new_moon_series(numpy.arange(k_start, k_end, dtype=numpy.float64), numpy.sin).tobytes())
+        return NewMoonEphemeris(k_start, jdes)
+
+
+    def save(self, path: str) -> None:
+        """
+        Write the ephemeris to `path`, replacing the file atomically.
+        """
+
+        jdes = array('d', self.jdes)
+        if sys.byteorder != 'little':
+            jdes.byteswap()
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self.MAGIC, self.VERSION, self.k_start, len(jdes)))
+            f.write(jdes.tobytes())
+        os.replace(temp_path, path)
+
+
+    @classmethod
+    def load(cls, path: str) -> NewMoonEphemeris:
+        """
+        Map the ephemeris saved at `path` into memory.
+        """
+
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < cls._HEADER.size:
+            raise InvalidLunarTable('New moon ephemeris file is truncated.')
+
+        magic, version, k_start, n = cls._HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise InvalidLunarTable('Unknown new moon ephemeris file format.')
+        if len(buffer) != cls._HEADER.size + 8 * n:
+            raise InvalidLunarTable('New moon ephemeris file is truncated.')
+
+        jdes = memoryview(buffer)[cls._HEADER.size:].cast('d')
+        if sys.byteorder != 'little':
+            jdes = array('d', jdes)
+            jdes.byteswap()
+
+        return NewMoonEphemeris(k_start, jdes)
+
+
+    @classmethod
+    def load_or_build(cls, path: str, k_start: int, k_end: int, save: bool = True) -> NewMoonEphemeris:
+        """
+        Load the ephemeris at `path` if it exists and covers `k_start` to `k_end` - 1, otherwise build it
+        and, with `save`, try to save it.
+        """
+
+        try:
+            ephemeris = cls.load(path)
+            if ephemeris.k_start <= k_start and ephemeris.k_end >= k_end:
+                return ephemeris
+        except (OSError, ValueError, InvalidLunarTable):
+            pass
+
+        ephemeris = cls.build(k_start, k_end)
+        if save:
+            try:
+                ephemeris.save(path)
+            except OSError:
+                pass
+        return ephemeris
+
+
+    @classmethod
+    def install(cls, ephemeris: NewMoonEphemeris) -> None:
+        cls._installed = ephemeris
+
+
+    @classmethod
+    def uninstall(cls) -> None:
+        cls._installed = None
+
+
+    @classmethod
+    def get(cls) -> Union[NewMoonEphemeris, None]:
+        return cls._installed
+
+
+class LunarTable:
+    """
+    Flat, read-only lunar calendar index for one timezone.
+
+    `month_starts[i]` is the day number of the (`k_start` + i)-th new moon, `month_11[i]` is the first day of the
+    11th lunar month of year `first_year` + i and `leap_offsets[i]` is the leap month offset counted from it.
+
+    The numbers are kept in `array`s, or directly in a memory mapped file, instead of lists of Python ints.
+    Reading an element creates a fresh int and never writes to the shared pages, so workers forked from a
+    preloaded master (or mapping the same file) keep sharing a single copy of the table.
+
+    One table is installed per timezone. Timezones are offsets in hours and may be fractional, e.g. 5.5 for UTC+5:30.
+    After `enable_lazy`, the table of a timezone is built (or loaded) the first time it is asked for.
+    """
+
+    MAGIC = b'TVLT'
+    VERSION = 1
+    _HEADER = struct.Struct('<4sH2xdiiii')
+
+    _installed: Dict[float, LunarTable] = {}
+    _lazy: Union[Tuple[int, int, Union[str, None]], None] = None
+    _lock = threading.RLock()
+    _building: Set[float] = set()
+
+    def __init__(self, timezone: Union[int, float], first_year: int, last_year: int, k_start: int, month_starts: Union[array, memoryview], month_11: Union[array, memoryview], leap_offsets: Union[array, memoryview]) -> None:
+        if len(month_11) != last_year - first_year + 1 or len(leap_offsets) != len(month_11):
+            raise InvalidLunarTable('Lunar table does not cover its year range.')
+
+        self.timezone = timezone
+        self.first_year = first_year
+        self.last_year = last_year
+        self.k_start = k_start
+        self.k_end = k_start + len(month_starts)
+        self.month_starts = month_starts
+        self.month_11 = month_11
+        self.leap_offsets = leap_offsets
+
+
+    def new_moon(self, k: int) -> Union[int, None]:
+        """
+        Return the day number of the `k`-th new moon, or None if `k` is not in the table.
+        """
+
+        if self.k_start <= k < self.k_end:
+            return self.month_starts[k - self.k_start]
+        return None
+
+
+    def lunar_month_11(self, year: int) -> Union[int, None]:
+        """
+        Return the first day of the 11th lunar month of `year`, or None if `year` is not in the table.
+        """
+
+        if self.first_year <= year <= self.last_year:
+            return self.month_11[year - self.first_year]
+        return None
+
+
+    def leap_month_offset(self, jd: float) -> Union[int, None]:
+        """
+        Return the leap month offset following the 11th lunar month starting at day `jd`,
+        or None if no year of the table starts its 11th month on that day.
+        """
+
+        i = bisect_left(self.month_11, jd)
+        if i < len(self.month_11) and self.month_11[i] == jd:
+            return self.leap_offsets[i]
+        return None
+
+
+    @staticmethod
+    def build(first_year: int, last_year: int, timezone: Union[int, float] = 7) -> LunarTable:
+        """
+        Compute the table for lunar years `first_year` to `last_year` with the series in `DateUtil`.
+        """
+
+        from .utils import DateUtil
+
+        k_start, k_end = NewMoonEphemeris.k_range(first_year, last_year)
+        month_starts = array('i', (DateUtil.new_moon_tz_adjusted(k, timezone) for k in range(k_start, k_end)))
+
+        # Serve the new moons from the months computed above while searching the 11th and leap months,
+        # instead of evaluating the series again for each year. Only the finished table is ever installed:
+        # other threads must not look up a table still being built.
+        def new_moon(k: int, timezone: Union[int, float]) -> int:
+            if k_start <= k < k_end:
+                return month_starts[k - k_start]
+            return DateUtil.new_moon_tz_adjusted(k, timezone)
+
+        month_11 = array('i', (DateUtil.series_lunar_month_11(year, timezone, new_moon) for year in range(first_year, last_year + 1)))
+        leap_offsets = array('b', (DateUtil.series_leap_month_offset(jd, timezone, new_moon) for jd in month_11))
+
+        return LunarTable(timezone, first_year, last_year, k_start, month_starts, month_11, leap_offsets)
+
+
+    def save(self, path: str) -> None:
+        """
+        Write the table to `path`. The file is replaced atomically, so concurrent workers never read half a table.
+        """
+
+        header = self._HEADER.pack(self.MAGIC, self.VERSION, self.timezone, self.first_year, self.last_year, self.k_start, len(self.month_starts))
+        parts = [array('i', self.month_starts), array('i', self.month_11), array('b', self.leap_offsets)]
+        if sys.byteorder != 'little':
+            for part in parts:
+                part.byteswap()
+
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            for part in parts:
+                f.write(part.tobytes())
+        os.replace(temp_path, path)
+
+
+    @classmethod
+    def load(cls, path: str) -> LunarTable:
+        """
+        Map the table saved at `path` into memory. The pages are shared with every other process mapping it.
+        """
+
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(buffer) < cls._HEADER.size:
+            raise InvalidLunarTable('Lunar table file is truncated.')
+
+        magic, version, timezone, first_year, last_year, k_start, n_months = cls._HEADER.unpack_from(buffer)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise InvalidLunarTable('Unknown lunar table file format.')
+
+        n_years = last_year - first_year + 1
+        if len(buffer) != cls._HEADER.size + 4 * n_months + 4 * n_years + n_years:
+            raise InvalidLunarTable('Lunar table file is truncated.')
+
+        view = memoryview(buffer)
+        offset = cls._HEADER.size
+        month_starts = view[offset:offset + 4 * n_months].cast('i')
+        offset += 4 * n_months
+        month_11 = view[offset:offset + 4 * n_years].cast('i')
+        offset += 4 * n_years
+        leap_offsets = view[offset:offset + n_years].cast('b')
+
+        if sys.byteorder != 'little':
+            month_starts, month_11 = array('i', month_starts), array('i', month_11)
+            month_starts.byteswap()
+            month_11.byteswap()
+
+        return LunarTable(timezone, first_year, last_year, k_start, month_starts, month_11, leap_offsets)
+
+
+    @classmethod
+    def load_or_build(cls, path: str, first_year: int, last_year: int, timezone: Union[int, float] = 7, save: bool = True) -> LunarTable:
+        """
+        Load the table at `path` if it exists and covers the requested range, otherwise build it and, with `save`,
+        try to save it.
+        """
+
+        try:
+            table = cls.load(path)
+            if table.timezone == timezone and table.first_year <= first_year and table.last_year >= last_year:
+                return table
+        except (OSError, ValueError, InvalidLunarTable):
+            pass
+
+        table = cls.build(first_year, last_year, timezone)
+        if save:
+            try:
+                table.save(path)
+            except OSError:
+                pass
+        return table
+
+
+    @classmethod
+    def install(cls, table: LunarTable) -> None:
+        """
+        Make `DateUtil` answer lookups for the table's timezone from `table`.
+        """
+
+        cls._installed[table.timezone] = table
+
+
+    @classmethod
+    def uninstall(cls, timezone: Union[int, float]) -> None:
+        cls._installed.pop(timezone, None)
+
+
+    @classmethod
+    def get(cls, timezone: Union[int, float]) -> Union[LunarTable, None]:
+        """
+        Return the installed table for `timezone`, or None.
+        """
+
+        table = cls._installed.get(timezone)
+        if table is None and cls._lazy is not None:
+            table = cls._install_lazily(timezone)
+        return table
+
+
+    @classmethod
+    def enable_lazy(cls, first_year: int, last_year: int, path: Union[str, None] = None) -> None:
+        """
+        Build the table of `first_year` to `last_year` for any timezone without one, the first time it is asked for.
+        With `path`, tables are mapped from `path_for_timezone(path, timezone)` when `build_lunar_table` wrote them
+        there. Tables are never saved here, a missing file only costs a build in memory.
+        """
+
+        cls._lazy = (first_year, last_year, path)
+
+
+    @classmethod
+    def disable_lazy(cls) -> None:
+        cls._lazy = None
+
+
+    @classmethod
+    def _install_lazily(cls, timezone: Union[int, float]) -> Union[LunarTable, None]:
+        with cls._lock:
+            table = cls._installed.get(timezone)
+            # The build itself looks the table up, it has to use the series meanwhile
+            if table is not None or cls._lazy is None or timezone in cls._building:
+                return table
+
+            first_year, last_year, path = cls._lazy
+            cls._building.add(timezone)
+            try:
+                if path is None:
+                    table = cls.build(first_year, last_year, timezone)
+                else:
+                    table = cls.load_or_build(cls.path_for_timezone(path, timezone), first_year, last_year, timezone, save=False)
+            finally:
+                cls._building.discard(timezone)
+            cls.install(table)
+            return table
+
+
+    @staticmethod
+    def path_for_timezone(path: str, timezone: Union[int, float]) -> str:
+        """
+        Return the file of the table for `timezone`, next to `path`, the file of the table for UTC+7.
+        For example, lunar_table.bin becomes lunar_table.utc+5.5.bin for UTC+5:30.
+        """
+
+        if timezone == 7:
+            return path
+
+        root, extension = os.path.splitext(path)
+        return f'{root}.utc{timezone:+g}{extension}'
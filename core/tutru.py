@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import Dict, NamedTuple, Tuple
+
+from .date import SolarDate
+from .lunaryear import LunarYearUtil
+from .tuvi.elements.nguhanh import NguHanh
+from .utils import DateUtil, NguHanhUtil, ZodiacUtil
+
+
+class Pillar(NamedTuple):
+    """
+    One pillar, a can chi index tuple.
+    """
+
+    can: int
+    chi: int
+
+    @property
+    def name(self) -> str:
+        return ZodiacUtil.can_chi_name(self.can, self.chi)
+
+
+    @property
+    def ngu_hanh(self) -> Tuple[NguHanh, NguHanh]:
+        """
+        Ngu hanh of the can and of the chi.
+        """
+
+        return NguHanhUtil.ngu_hanh_of_can(self.can), NguHanhUtil.ngu_hanh_of_chi(self.chi)
+
+
+    @property
+    def code(self) -> int:
+        """
+        Position of the pillar in the 60 can chi cycle, Giap Ti being 0. It fits in 6 bits.
+        """
+
+        return (6 * (self.can - 1) - 5 * (self.chi - 1)) % 60
+
+
+    @staticmethod
+    def from_code(code: int) -> Pillar:
+        return Pillar(code % 10 + 1, code % 12 + 1)
+
+
+class TuTru(NamedTuple):
+    """
+    The four pillars (tu tru) of a birth: can chi of the year, month, day and hour, the eight characters (bat tu).
+
+    Like the center of the chart, the year and month pillars follow the lunar date, the day and hour pillars
+    the solar one.
+    """
+
+    year: Pillar
+    month: Pillar
+    day: Pillar
+    hour: Pillar
+
+    @staticmethod
+    def from_date(date: SolarDate, timezone: float = 7) -> TuTru:
+        """
+        Compute the four pillars of the solar date and time `date`. From 23:00 on, the Ti hour and the day
+        are those of the next day, as in `LaSoTuVi`.
+        """
+
+        jdn = DateUtil.jdn_from_ymd(date.year, date.month, date.day)
+        hour = date.hour
+        if hour >= 23:
+            jdn += 1
+            hour = 0
+
+        lunar_year, lunar_month, _, _, _ = DateUtil.lunar_month_of_jdn(jdn, DateUtil.ymd_from_jdn(jdn)[0], timezone)
+        return TuTru(
+            Pillar(*ZodiacUtil.year_can_chi(lunar_year)),
+            Pillar(*ZodiacUtil.month_can_chi(lunar_year, lunar_month)),
+            Pillar(*ZodiacUtil.day_can_chi(jdn)),
+            Pillar(*ZodiacUtil.hour_can_chi(jdn, hour)),
+        )
+
+
+    @property
+    def characters(self) -> Tuple[str, ...]:
+        """
+        The eight characters, can then chi of every pillar.
+        """
+
+        return tuple(name for pillar in self for name in (ZodiacUtil.CAN_NAMES[pillar.can], ZodiacUtil.CHI_NAMES[pillar.chi]))
+
+
+    @property
+    def ngu_hanh(self) -> Tuple[NguHanh, ...]:
+        """
+        Ngu hanh of the eight characters.
+        """
+
+        return tuple(ngu_hanh for pillar in self for ngu_hanh in pillar.ngu_hanh)
+
+
+    @property
+    def balance(self) -> Dict[NguHanh, int]:
+        """
+        Number of characters of every ngu hanh, the five of them included.
+        """
+
+        counts = {ngu_hanh: 0 for ngu_hanh in NguHanh if ngu_hanh.value is not None}
+        for ngu_hanh in self.ngu_hanh:
+            counts[ngu_hanh] += 1
+        return counts
+
+
+    def encode(self) -> int:
+        """
+        Pack the four pillars in 24 bits, 6 bits per pillar from the year in the high bits to the hour in the low ones.
+        """
+
+        return self.year.code << 18 | self.month.code << 12 | self.day.code << 6 | self.hour.code
+
+
+    @staticmethod
+    def decode(code: int) -> TuTru:
+        return TuTru(*(Pillar.from_code(code >> shift & 0x3F) for shift in (18, 12, 6, 0)))
+
+
+class TuTruUtil:
+    """
+    Four pillars of whole arrays of birthdates at once, with NumPy.
+    """
+
+    @staticmethod
+    def batch(years, months, days, hours, timezone: float = 7):
+        """
+        Compute the four pillars of the solar dates given as NumPy integer arrays of years, months, days and hours.
+        Return the can and chi indices as two (n, 4) arrays, with the year, month, day and hour pillars in this order.
+        """
+
+        import numpy
+
+        jdns = DateUtil.jdn_from_ymd_array(years, months, days)
+        late = hours >= 23
+        jdns = jdns + late
+        hours = numpy.where(late, 0, hours)
+
+        lunar_years, lunar_months, _, _ = LunarYearUtil.lunar_dates_of_jdn_array(jdns, timezone)
+        pillars = [
+            ZodiacUtil.year_can_chi(lunar_years),
+            ZodiacUtil.month_can_chi(lunar_years, lunar_months),
+            ZodiacUtil.day_can_chi(jdns),
+            ZodiacUtil.hour_can_chi(jdns, hours),
+        ]
+        return numpy.stack([can for can, _ in pillars], axis=1), numpy.stack([chi for _, chi in pillars], axis=1)
+
+
+    @staticmethod
+    def encode(can, chi):
+        """
+        Pack the (n, 4) can and chi arrays returned by `batch` into an array of 24 bit codes, as `TuTru.encode`.
+        """
+
+        codes = (6 * (can - 1) - 5 * (chi - 1)) % 60
+        return codes[:, 0] << 18 | codes[:, 1] << 12 | codes[:, 2] << 6 | codes[:, 3]
+
+
+    @staticmethod
+    def ngu_hanh(can, chi):
+        """
+        Return the ngu hanh values (see `NguHanh`) of the eight characters of the (n, 4) can and chi arrays,
+        as an (n, 8) array ordered like `TuTru.ngu_hanh`.
+        """
+
+        import numpy
+
+        arrays = NguHanhUtil.arrays()
+        return numpy.stack([arrays.can[can], arrays.chi[chi]], axis=2).reshape(len(can), 8)
+
+
+    @staticmethod
+    def balance(can, chi):
+        """
+        Return the number of characters of every ngu hanh for the (n, 4) can and chi arrays, as an (n, 5) array
+        whose column i counts the ngu hanh of value i + 1.
+        """
+
+        import numpy
+
+        ngu_hanh = TuTruUtil.ngu_hanh(can, chi)
+        return (ngu_hanh[:, :, None] == numpy.arange(1, 6)).sum(axis=1)
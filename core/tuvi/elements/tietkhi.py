@@ -0,0 +1,33 @@
+from enum import Enum
+
+
+class TietKhi(Enum):
+    """
+    The 24 solar terms, in their order within a solar year. Term `i` starts when the apparent longitude
+    of the sun reaches (285 + 15 * i) mod 360 degrees. Odd terms are the principal terms (trung khi).
+    """
+
+    TIEU_HAN = 0
+    DAI_HAN = 1
+    LAP_XUAN = 2
+    VU_THUY = 3
+    KINH_TRAP = 4
+    XUAN_PHAN = 5
+    THANH_MINH = 6
+    COC_VU = 7
+    LAP_HA = 8
+    TIEU_MAN = 9
+    MANG_CHUNG = 10
+    HA_CHI = 11
+    TIEU_THU = 12
+    DAI_THU = 13
+    LAP_THU = 14
+    XU_THU = 15
+    BACH_LO = 16
+    THU_PHAN = 17
+    HAN_LO = 18
+    SUONG_GIANG = 19
+    LAP_DONG = 20
+    TIEU_TUYET = 21
+    DAI_TUYET = 22
+    DONG_CHI = 23
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
 from typing import Tuple, Union, List
-from functools import lru_cache
 from datetime import datetime
 
+from core.caches import cached
 from core.date import Date, LunarDate, SolarDate
 from core.tuvi.elements.amduong import AmDuong
 from core.tuvi.elements.nguhanh import NguHanh
@@ -31,7 +31,7 @@ class Sao(ABC):
 
     @staticmethod
     @abstractmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         """
         Given date of birth `birthdate` and generated year `cur_year`, return the position of this star
@@ -59,6 +59,27 @@ class SaoRegistry:
         return cls._subclasses
 
 
+    @classmethod
+    def place(cls, birthdate: SolarDate, cur_year: int, gender: Union[int, None]) -> List[int]:
+        """
+        Place every registered star, in the order of `get_subclasses`, and leave the `trang_thai` of each one
+        set for this birth. The trang thai are class attributes shared by every thread: not thread-safe.
+        """
+        # The trang thai of a star is set while placing it, which its cache skips: after a hit it would still be
+        # the one of the last birth placing the star. Reset them, and place again the stars left without one.
+        none = TrangThai.NONE
+        bright = [sao for sao in cls._subclasses if sao.trang_thai is not none]
+        for sao in bright:
+            sao.trang_thai = none
+
+        vi_tri = [sao.an_sao(birthdate, cur_year, gender) for sao in cls._subclasses]
+
+        for sao in bright:
+            if sao.trang_thai is none:
+                sao.an_sao.__wrapped__(birthdate, cur_year, gender)
+        return vi_tri
+
+
 class SaoTuVi(Sao):
     name = "Tử Vi"
     am_duong = AmDuong.DUONG
@@ -70,7 +91,7 @@ class SaoTuVi(Sao):
     
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         cuc = TuViUtil.tim_cuc(birthdate)
@@ -287,7 +308,7 @@ class SaoThienCo(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tu_vi = SaoTuVi.an_sao(birthdate, cur_year)
         vi_tri_thien_co = (vi_tri_tu_vi - 2 + 12) % 12 + 1
@@ -317,7 +338,7 @@ class SaoThaiDuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_co = SaoThienCo.an_sao(birthdate, cur_year)
         vi_tri_thai_duong = (vi_tri_thien_co - 3 + 12) % 12 + 1
@@ -347,7 +368,7 @@ class SaoVuKhuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thai_duong = SaoThaiDuong.an_sao(birthdate, cur_year)
         vi_tri_vu_khuc = (vi_tri_thai_duong - 2 + 12) % 12 + 1
@@ -377,7 +398,7 @@ class SaoThienDong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_vu_khuc = SaoVuKhuc.an_sao(birthdate, cur_year)
         vi_tri_thien_dong = (vi_tri_vu_khuc - 2 + 12) % 12 + 1
@@ -407,7 +428,7 @@ class SaoLiemTrinh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_dong = SaoThienDong.an_sao(birthdate, cur_year)
         vi_tri_liem_trinh = (vi_tri_thien_dong - 4 + 12) % 12 + 1
@@ -437,7 +458,7 @@ class SaoThienPhu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tu_vi = SaoTuVi.an_sao(birthdate, cur_year)
         temp_dict = {
@@ -481,7 +502,7 @@ class SaoThaiAm(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_phu = SaoThienPhu.an_sao(birthdate, cur_year)
         vi_tri_thai_am = vi_tri_thien_phu % 12 + 1
@@ -511,7 +532,7 @@ class SaoThamLang(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thai_am = SaoThaiAm.an_sao(birthdate, cur_year)
         vi_tri_tham_lang = vi_tri_thai_am % 12 + 1
@@ -541,7 +562,7 @@ class SaoCuMon(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tham_lang = SaoThamLang.an_sao(birthdate, cur_year)
         vi_tri_cu_mon = vi_tri_tham_lang % 12 + 1
@@ -571,7 +592,7 @@ class SaoThienTuong(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_cu_mon = SaoCuMon.an_sao(birthdate, cur_year)
         vi_tri_thien_tuong = vi_tri_cu_mon % 12 + 1
@@ -601,7 +622,7 @@ class SaoThienLuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_tuong = SaoThienTuong.an_sao(birthdate, cur_year)
         vi_tri_thien_luong = vi_tri_thien_tuong % 12 + 1
@@ -631,7 +652,7 @@ class SaoThatSat(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_luong = SaoThienLuong.an_sao(birthdate, cur_year)
         vi_tri_that_sat = vi_tri_thien_luong % 12 + 1
@@ -661,7 +682,7 @@ class SaoPhaQuan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_that_sat = SaoThatSat.an_sao(birthdate, cur_year)
         vi_tri_pha_quan = (vi_tri_that_sat + 3) % 12 + 1
@@ -691,7 +712,7 @@ class SaoThienViet(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -723,7 +744,7 @@ class SaoHoaKhoa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -767,7 +788,7 @@ class SaoTaPhu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_ta_phu = (4 + lunar_date.month - 1) % 12 + 1
@@ -785,7 +806,7 @@ class SaoPhiLiem(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -808,7 +829,7 @@ class SaoTrucPhu(Sao):
 
  
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_dieu_khach = SaoDieuKhach.an_sao(birthdate, cur_year, gender)
         return vi_tri_dieu_khach % 12 + 1
@@ -825,7 +846,7 @@ class SaoPhaToai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -859,7 +880,7 @@ class SaoHiThan(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -882,7 +903,7 @@ class SaoThienPhuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -914,7 +935,7 @@ class SaoDiaKiep(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_dia_kiep = (11 + zodiac_hour_tuple[1] - 1) % 12 + 1
@@ -940,7 +961,7 @@ class SaoThaiTue(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -958,7 +979,7 @@ class SaoHoaLoc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -1002,7 +1023,7 @@ class SaoQuocAn(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_loc_ton = SaoLocTon.an_sao(birthdate, cur_year, gender)
         return (vi_tri_loc_ton - 1 + 8) % 12 + 1
@@ -1019,7 +1040,7 @@ class SaoThieuDuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thai_tue = SaoThaiTue.an_sao(birthdate, cur_year, gender)
         return vi_tri_thai_tue % 12 + 1
@@ -1036,7 +1057,7 @@ class SaoThienKhong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoThieuDuong.an_sao(birthdate, cur_year, gender)
 
@@ -1052,7 +1073,7 @@ class SaoBenhPhu(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -1075,7 +1096,7 @@ class SaoDiaGiai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_dia_giai = (7 + lunar_date.month - 1) % 12 + 1
@@ -1093,7 +1114,7 @@ class SaoThienMa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1133,7 +1154,7 @@ class SaoHoaTinh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
@@ -1178,7 +1199,7 @@ class SaoLinhTinh(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
@@ -1219,7 +1240,7 @@ class SaoCoThan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1253,7 +1274,7 @@ class SaoDaiHao(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -1285,7 +1306,7 @@ class SaoTangMon(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thieu_duong = SaoThieuDuong.an_sao(birthdate, cur_year, gender)
         vi_tri_tang_mon = vi_tri_thieu_duong % 12 + 1
@@ -1311,7 +1332,7 @@ class SaoThienQuy(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_van_khuc = SaoVanKhuc.an_sao(birthdate, cur_year, gender)
@@ -1330,7 +1351,7 @@ class SaoTauThu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -1353,7 +1374,7 @@ class SaoDuongPhu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_loc_ton = SaoLocTon.an_sao(birthdate, cur_year, gender)
         return (vi_tri_loc_ton - 1 + 5) % 12 + 1
@@ -1370,7 +1391,7 @@ class SaoThienTho(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1389,7 +1410,7 @@ class SaoGiaiThan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoPhuongCac.an_sao(birthdate, cur_year, gender)
     
@@ -1405,7 +1426,7 @@ class SaoPhuongCac(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1423,7 +1444,7 @@ class SaoDiaKhong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_dia_khong = (11 - (zodiac_hour_tuple[1] - 1) + 12) % 12 + 1
@@ -1449,7 +1470,7 @@ class SaoQuaTu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1483,7 +1504,7 @@ class SaoDieuKhach(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_phuc_duc = SaoPhucDuc.an_sao(birthdate, cur_year, gender)
         return vi_tri_phuc_duc % 12 + 1
@@ -1500,7 +1521,7 @@ class SaoThienLa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return 5
 
@@ -1516,7 +1537,7 @@ class SaoHuuBat(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_huu_bat = (10 - (lunar_date.month - 1) + 12) % 12 + 1
@@ -1534,7 +1555,7 @@ class SaoHongLoan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1552,7 +1573,7 @@ class SaoThienGiai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_thien_giai = (8 + lunar_date.month - 1) % 12 + 1
@@ -1570,7 +1591,7 @@ class SaoPhongCao(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_phong_cao = (2 + zodiac_hour_tuple[1] - 1) % 12 + 1
@@ -1588,7 +1609,7 @@ class SaoThienTru(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -1620,7 +1641,7 @@ class SaoThieuAm(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tang_mon = SaoTangMon.an_sao(birthdate, cur_year, gender)
         return vi_tri_tang_mon % 12 + 1
@@ -1637,7 +1658,7 @@ class SaoPhucBinh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -1660,7 +1681,7 @@ class SaoVanXuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_van_xuong = (10 - (zodiac_hour_tuple[1] - 1) + 12) % 12 + 1
@@ -1686,7 +1707,7 @@ class SaoThienKhoi(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -1718,7 +1739,7 @@ class SaoThienHy(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1736,7 +1757,7 @@ class SaoDaoHoa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1770,7 +1791,7 @@ class SaoPhucDuc(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_bach_ho = SaoBachHo.an_sao(birthdate, cur_year, gender)
         return vi_tri_bach_ho % 12 + 1
@@ -1787,7 +1808,7 @@ class SaoThienDuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoPhucDuc.an_sao(birthdate, cur_year, gender)
 
@@ -1803,7 +1824,7 @@ class SaoTuongQuan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -1826,7 +1847,7 @@ class SaoThienSu(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return TuViUtil.tim_cung_tat_ach(birthdate)
 
@@ -1842,7 +1863,7 @@ class SaoAnQuang(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_van_xuong = SaoVanXuong.an_sao(birthdate, cur_year, gender)
@@ -1861,7 +1882,7 @@ class SaoThienQuan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -1893,7 +1914,7 @@ class SaoHoaCai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -1927,7 +1948,7 @@ class SaoLongTri(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoQuanPhuf.an_sao(birthdate, cur_year, gender)
 
@@ -1943,7 +1964,7 @@ class SaoDaLa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_loc_ton = SaoLocTon.an_sao(birthdate, cur_year, gender)
         vi_tri_da_la = (vi_tri_loc_ton - 2 + 12) % 12 + 1
@@ -1969,7 +1990,7 @@ class SaoHoaKy(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -2009,7 +2030,7 @@ class SaoThienHinh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_thien_hinh = (9 + lunar_date.month - 1) % 12 + 1
@@ -2035,7 +2056,7 @@ class SaoQuanPhur(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2058,7 +2079,7 @@ class SaoQuanPhuf(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thieu_am = SaoThieuAm.an_sao(birthdate, cur_year, gender)
         return vi_tri_thieu_am % 12 + 1
@@ -2075,7 +2096,7 @@ class SaoDiaVong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return 11
 
@@ -2091,7 +2112,7 @@ class SaoHoaQuyen(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -2135,7 +2156,7 @@ class SaoThienY(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_thien_y = (1 + lunar_date.month - 1) % 12 + 1
@@ -2161,7 +2182,7 @@ class SaoLNVanTinh(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_loc_ton = SaoLocTon.an_sao(birthdate, cur_year, gender)
         return (vi_tri_loc_ton - 1 + 3) % 12 + 1
@@ -2178,7 +2199,7 @@ class SaoThienTai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -2197,7 +2218,7 @@ class SaoThienDieu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_dieu = SaoThienY.an_sao(birthdate, cur_year)
         SaoThienDieu.trang_thai = SaoThienY.trang_thai
@@ -2215,7 +2236,7 @@ class SaoTieuHao(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2247,7 +2268,7 @@ class SaoBachHo(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_long_duc = SaoLongDuc.an_sao(birthdate, cur_year, gender)
         vi_tri_bach_ho = vi_tri_long_duc % 12 + 1
@@ -2273,7 +2294,7 @@ class SaoThaiPhu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_thai_phu = (6 + zodiac_hour_tuple[1] - 1) % 12 + 1
@@ -2291,7 +2312,7 @@ class SaoTamThai(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_ta_phu = SaoTaPhu.an_sao(birthdate, cur_year, gender)
@@ -2310,7 +2331,7 @@ class SaoBatToa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         vi_tri_huu_bat = SaoHuuBat.an_sao(birthdate, cur_year, gender)
@@ -2329,7 +2350,7 @@ class SaoThanhLong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2352,7 +2373,7 @@ class SaoLongDuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tue_pha = SaoTuePha.an_sao(birthdate, cur_year, gender)
         return vi_tri_tue_pha % 12 + 1
@@ -2369,7 +2390,7 @@ class SaoThienThuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return TuViUtil.tim_cung_no_boc(birthdate)
 
@@ -2385,7 +2406,7 @@ class SaoLucSi(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2408,7 +2429,7 @@ class SaoKinhDuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_loc_ton = SaoLocTon.an_sao(birthdate, cur_year, gender)
         vi_tri_kinh_duong = vi_tri_loc_ton % 12 + 1
@@ -2434,7 +2455,7 @@ class SaoTuePha(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_tu_phu = SaoTuPhu.an_sao(birthdate, cur_year, gender)
         return vi_tri_tu_phu % 12 + 1
@@ -2451,7 +2472,7 @@ class SaoThienHu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_thien_hu = SaoTuePha.an_sao(birthdate, cur_year, gender)
         if vi_tri_thien_hu in [1, 3, 7, 9]:
@@ -2475,7 +2496,7 @@ class SaoThienKhoc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -2502,7 +2523,7 @@ class SauDauQuan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -2521,7 +2542,7 @@ class SaoVanKhuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         zodiac_hour_tuple = ZodiacUtil.zodiac_hour_tuple(birthdate)
         vi_tri_van_khuc = (4 + zodiac_hour_tuple[1] - 1) % 12 + 1
@@ -2547,7 +2568,7 @@ class SaoLocTon(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -2589,7 +2610,7 @@ class SaoBacSy(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoLocTon.an_sao(birthdate, cur_year, gender)
 
@@ -2605,7 +2626,7 @@ class SaoNguyetDuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         return SaoTuPhu.an_sao(birthdate, cur_year, gender)
 
@@ -2621,7 +2642,7 @@ class SaoLuuHa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -2653,7 +2674,7 @@ class SaoTuPhu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_quan_phuf = SaoQuanPhuf.an_sao(birthdate, cur_year, gender)
         return vi_tri_quan_phuf % 12 + 1
@@ -2670,7 +2691,7 @@ class SaoKiepSat(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[1]
@@ -2704,7 +2725,7 @@ class SaoTruongSinh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         cuc = TuViUtil.tim_cuc(birthdate)
         temp_dict = {
@@ -2729,7 +2750,7 @@ class SaoMocDuc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2751,7 +2772,7 @@ class SaoQuanDoi(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2773,7 +2794,7 @@ class SaoLamQuan(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2795,7 +2816,7 @@ class SaoDeVuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2817,7 +2838,7 @@ class SaoSuy(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2839,7 +2860,7 @@ class SaoBenh(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2861,7 +2882,7 @@ class SaoTu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2883,7 +2904,7 @@ class SaoMo(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2905,7 +2926,7 @@ class SaoTuyet(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2927,7 +2948,7 @@ class SaoThai(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2949,7 +2970,7 @@ class SaoDuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         am_duong = TuViUtil.tim_am_duong(birthdate, gender)
         if am_duong in ['Dương Nam', 'Âm Nữ']:
@@ -2971,7 +2992,7 @@ class SaoTuan(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam, chi_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)
@@ -2991,7 +3012,7 @@ class SaoTriet(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         lunar_date = DateUtil.solar_to_lunar(birthdate.empty_hms())
         can_nam = ZodiacUtil.zodiac_year_tuple(lunar_date)[0]
@@ -3023,7 +3044,7 @@ class SaoLuuThienMa(Sao):
 
     
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         temp_dict = {
@@ -3055,7 +3076,7 @@ class SaoLuuTangMon(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return (2 + (chi_nam_xem - 1)) % 12 + 1
@@ -3072,7 +3093,7 @@ class SaoLuuThienHu(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return (6 + (chi_nam_xem - 1)) % 12 + 1
@@ -3089,7 +3110,7 @@ class SaoLuuThaiTue(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return chi_nam_xem
@@ -3106,7 +3127,7 @@ class SaoLuuThienKhoc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return (6 - (chi_nam_xem - 1) + 12) % 12 + 1
@@ -3123,7 +3144,7 @@ class SaoLuuKinhDuong(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_luu_loc_ton = SaoLuuLocTon.an_sao(birthdate, cur_year, gender)
         return vi_tri_luu_loc_ton % 12 + 1
@@ -3140,7 +3161,7 @@ class SaoLuuLocTon(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
         temp_dict = {
@@ -3170,7 +3191,7 @@ class SaoLuuBachHo(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam_xem = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return (8 + (chi_nam_xem - 1)) % 12 + 1
@@ -3187,7 +3208,7 @@ class SaoLuuDaLa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         vi_tri_luu_loc_ton = SaoLuuLocTon.an_sao(birthdate, cur_year, gender)
         return (vi_tri_luu_loc_ton - 2 + 12) % 12 + 1
@@ -3204,7 +3225,7 @@ class SaoLuuDaoHoa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
 
@@ -3237,7 +3258,7 @@ class SaoLuuHongLoan(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         chi_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[1]
         return (3 - (chi_nam - 1) + 12) % 12 + 1
@@ -3254,7 +3275,7 @@ class SaoLuuThienKhoi(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
@@ -3285,7 +3306,7 @@ class SaoLuuThienViet(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
@@ -3316,7 +3337,7 @@ class SaoLuuHoaLoc(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
@@ -3348,7 +3369,7 @@ class SaoLuuHoaQuyen(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
@@ -3380,7 +3401,7 @@ class SaoLuuHoaKhoa(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
@@ -3412,7 +3433,7 @@ class SaoLuuHoaKy(Sao):
 
 
     @staticmethod
-    @lru_cache
+    @cached()
     def an_sao(birthdate: SolarDate, cur_year: int = datetime.now().year, gender: Union[int, None] = GioiTinh.NONE.value) -> int:
         can_nam = ZodiacUtil.zodiac_year_tuple(Date(cur_year, 6, 1))[0]
 
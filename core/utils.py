@@ -1,14 +1,17 @@
-from functools import lru_cache
 from math import floor, sin, cos, pi
-from typing import Tuple, Union, List
+from typing import Callable, Iterator, List, NamedTuple, Tuple, Union
 
+from .caches import cached
 from .date import Date, SolarDate, LunarDate
 from .mixins import DateMixin, AngleMixin
 from .exceptions import InvalidJulianDayException
+from .solarterms import SolarTermUtil
+from .tables import LunarTable, NewMoonEphemeris
 from .tuvi.elements.nguhanh import NguHanh
 from .tuvi.elements.can import Can
 from .tuvi.elements.chi import Chi
 from .localizer import VNLocalizer
+from .lunaryear import LunarYearUtil
 
 
 class DateUtil(DateMixin, AngleMixin):
@@ -22,8 +25,7 @@ class DateUtil(DateMixin, AngleMixin):
         Compute weekday given `date`.
         """
 
-        jd = DateUtil.jd_from_date(date)
-        rem = int(round(jd + 1.5)) % 7
+        rem = (DateUtil.jdn_from_ymd(date.year, date.month, date.day) + 1) % 7
         weekdays = {
             0: 'Sunday',
             1: 'Monday',
@@ -72,7 +74,7 @@ class DateUtil(DateMixin, AngleMixin):
 
 
     @staticmethod
-    @lru_cache(maxsize=1)
+    @cached(maxsize=1)
     def get_julian_date_threshold() -> Date:
         """
         Last Julian date is October 4th, 1582. Consider till 23:59, and this is for "<" comparison, 
@@ -122,24 +124,91 @@ class DateUtil(DateMixin, AngleMixin):
 
 
     @staticmethod
-    def jd_from_date(date: Date) -> float:
+    def jdn_from_ymd(year: int, month: int, day: int) -> int:
         """
-        Compute Julian day given calendar date `date`.
+        Compute Julian Day Number, the Julian day at noon, of the calendar date `year`/`month`/`day`.
+        Same as `jd_from_date` but with integers only.
         """
 
-        d, m, y = DateUtil.get_fractional_day(date), date.month, date.year
+        y, m = year, month
         if m <= 2:
             m += 12
             y -= 1
 
-        a = int(floor(y / 100))
-        b = 2 - a + int(floor(a / 4))
-
         # Check if date is Julian date
-        if date < DateUtil.get_julian_date_threshold():
+        if (year, month, day) < (1582, 10, 5):
             b = 0
+        else:
+            a = y // 100
+            b = 2 - a + a // 4
+
+        # int(365.25 * n) and int(30.6001 * n), truncated towards zero
+        n = 1461 * (y + 4716)
+        return (n // 4 if n >= 0 else -(-n // 4)) + 306001 * (m + 1) // 10000 + day + b - 1524
+
+
+    @staticmethod
+    def jdn_from_ymd_array(years, months, days):
+        """
+        Same as `jdn_from_ymd`, for NumPy integer arrays of years, months and days.
+        """
+
+        shift = months <= 2
+        y = years - shift
+        m = months + 12 * shift
+
+        a = y // 100
+        # No correction for the dates of the Julian calendar, before 1582-10-05
+        b = (2 - a + a // 4) * ((years * 100 + months) * 100 + days >= 15821005)
+
+        n = 1461 * (y + 4716)
+        return (n + 3 * (n < 0)) // 4 + 306001 * (m + 1) // 10000 + days + b - 1524
+
+
+    @staticmethod
+    def ymd_from_jdn(jdn: int) -> Tuple[int, int, int]:
+        """
+        Compute calendar date (year, month, day) from given Julian Day Number `jdn`.
+        Same as `date_from_jd` but with integers only.
+        """
+
+        if jdn < 0:
+            raise InvalidJulianDayException('Julian day cannot be negative.')
+
+        if jdn < 2299161:
+            a = jdn
+        else:
+            alpha = (4 * jdn - 7468865) // 146097
+            a = jdn + 1 + alpha - alpha // 4
+
+        b = a + 1524
+        c = (20 * b - 2442) // 7305
+        d = 1461 * c // 4
+        e = 10000 * (b - d) // 306001
+        day = b - d - 306001 * e // 10000
+
+        if e < 14:
+            month = e - 1
+        else:
+            month = e - 13
 
-        jd = int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + b - 1524.5
+        if month > 2:
+            year = c - 4716
+        else:
+            year = c - 4715
+
+        return year, month, day
+
+
+    @staticmethod
+    def jd_from_date(date: Date) -> float:
+        """
+        Compute Julian day given calendar date `date`.
+        """
+
+        jd = DateUtil.jdn_from_ymd(date.year, date.month, date.day) - 0.5
+        if date.hour or date.minute or date.second:
+            jd += (date.hour * 3600 + date.minute * 60 + date.second) / 86400
         return jd
     
 
@@ -218,6 +287,9 @@ class DateUtil(DateMixin, AngleMixin):
         """
         Compute date after adding `days` days to date `date`.
         """
+
+        if isinstance(days, int) and not (date.hour or date.minute or date.second):
+            return Date(*DateUtil.ymd_from_jdn(DateUtil.jdn_from_ymd(date.year, date.month, date.day) + days))
         return DateUtil.date_from_jd(DateUtil.jd_from_date(date) + days)
     
     
@@ -226,6 +298,9 @@ class DateUtil(DateMixin, AngleMixin):
         """
         Compute date after subtracting `days` days to date `date`.
         """
+
+        if isinstance(days, int) and not (date.hour or date.minute or date.second):
+            return Date(*DateUtil.ymd_from_jdn(DateUtil.jdn_from_ymd(date.year, date.month, date.day) - days))
         return DateUtil.date_from_jd(DateUtil.jd_from_date(date) - days)
 
 
@@ -309,11 +384,33 @@ class DateUtil(DateMixin, AngleMixin):
     
 
     @staticmethod
-    @lru_cache
     def jde_of_kth_new_moon(k: int) -> float:
         """
         Compute the `k`-th new moon in Julian Ephemeris Day.
         `k` = 0 corresponds to the New Moon of 2000 January 6.
+        The new moon is read from the installed `NewMoonEphemeris` if it covers `k`, else computed with the series.
+        """
+
+        ephemeris = NewMoonEphemeris.get()
+        if ephemeris is not None:
+            jde = ephemeris.jde(k)
+            if jde is not None:
+                return jde
+
+        return DateUtil._new_moon_series_cached(k)
+
+
+    @staticmethod
+    @cached(maxsize=1024)
+    def _new_moon_series_cached(k: int) -> float:
+        return DateUtil.new_moon_series(k)
+
+
+    @staticmethod
+    def new_moon_series(k, sin=sin):
+        """
+        Evaluate the Meeus series of the `k`-th new moon, in Julian Ephemeris Day.
+        `k` may also be a NumPy array of floats with `sin` = `numpy.sin`, to compute many new moons at once.
         """
 
         T = k / 1236.85 # time in Julian centuries since the epoch 2000
@@ -421,16 +518,22 @@ class DateUtil(DateMixin, AngleMixin):
 
     
     @staticmethod
-    def new_moon_tz_adjusted(k: int, timezone: int = 7) -> int:
+    def new_moon_tz_adjusted(k: int, timezone: float = 7) -> int:
         """
         Compute jde of `k`-th new moon with `timezone` adjusted.
         """
 
+        table = LunarTable.get(timezone)
+        if table is not None:
+            day = table.new_moon(k)
+            if day is not None:
+                return day
+
         return int(DateUtil.jde_of_kth_new_moon(k) + timezone / 24 + 0.5)
     
 
     @staticmethod
-    def sun_longitude_tz_adjusted(jd: float, timezone: int = 7) -> int:
+    def sun_longitude_tz_adjusted(jd: float, timezone: float = 7) -> int:
         """
         Compute sun longitude with `timezone` adjusted at given `jd`.
         Contract [0; 2*pi) to [0; 12) integer range.
@@ -439,7 +542,7 @@ class DateUtil(DateMixin, AngleMixin):
 
 
     @staticmethod
-    def get_lunar_month_11(param: Union[SolarDate, int], timezone: int = 7) -> int:
+    def get_lunar_month_11(param: Union[SolarDate, int], timezone: float = 7) -> int:
         """
         Find the first day of 11th month in lunar year.
         """
@@ -449,111 +552,142 @@ class DateUtil(DateMixin, AngleMixin):
         else:
             y = param
 
-        jd = DateUtil.jd_from_date(Date(y, 12, 31)) - DateUtil.jde_of_kth_new_moon(0) + 0.5
+        table = LunarTable.get(timezone)
+        if table is not None:
+            jd_month_11 = table.lunar_month_11(y)
+            if jd_month_11 is not None:
+                return jd_month_11
+
+        return DateUtil.series_lunar_month_11(y, timezone, DateUtil.new_moon_tz_adjusted)
+
+
+    @staticmethod
+    def series_lunar_month_11(year: int, timezone: float, new_moon: Callable[[int, float], int]) -> int:
+        """
+        Find the first day of 11th month in lunar `year` without the lunar tables, the day of the `k`-th new moon
+        given by `new_moon(k, timezone)`.
+        """
+
+        jd = DateUtil.jdn_from_ymd(year, 12, 31) - DateUtil.jde_of_kth_new_moon(0)
         k = int(floor(jd / 29.530588861))
-        jd_kth_new_moon = DateUtil.new_moon_tz_adjusted(k, timezone)
+        jd_kth_new_moon = new_moon(k, timezone)
         temp = DateUtil.sun_longitude_tz_adjusted(jd_kth_new_moon, timezone)
         
         if temp >= 9:
-            jd_kth_new_moon = DateUtil.new_moon_tz_adjusted(k - 1, timezone)
+            jd_kth_new_moon = new_moon(k - 1, timezone)
         return jd_kth_new_moon
 
 
     @staticmethod
-    def get_leap_month_offset(jd: float, timezone: int = 7) -> int:
+    def get_leap_month_offset(jd: float, timezone: float = 7) -> int:
         """
         Find the index of the next leap month after the month of the day `jd`.
         `jd` should be something like the result of `get_lunar_month_11` method.
         """
-       
+
+        table = LunarTable.get(timezone)
+        if table is not None:
+            offset = table.leap_month_offset(jd)
+            if offset is not None:
+                return offset
+
+        return DateUtil.series_leap_month_offset(jd, timezone, DateUtil.new_moon_tz_adjusted)
+
+
+    @staticmethod
+    def series_leap_month_offset(jd: float, timezone: float, new_moon: Callable[[int, float], int]) -> int:
+        """
+        Find the index of the next leap month after the month of the day `jd` without the lunar tables,
+        the day of the `k`-th new moon given by `new_moon(k, timezone)`.
+        """
+
+        # The leap month is the first month without a principal solar term, looked up in the solar term table.
+        # A month runs from local midnight of its first day, i.e. `day - timezone / 24 - 0.5` in UT.
         k = int(floor((jd - DateUtil.jde_of_kth_new_moon(0)) / 29.530588861 + 0.5))
-        last = 0
         i = 1  # start with month following 11th lunar month
-        arc = DateUtil.sun_longitude_tz_adjusted(DateUtil.new_moon_tz_adjusted(k + i, timezone), timezone)
+        month_start = new_moon(k + i, timezone) - timezone / 24 - 0.5
 
         while i < 14:
-            last = arc
             i += 1
-            arc = DateUtil.sun_longitude_tz_adjusted(DateUtil.new_moon_tz_adjusted(k + i, timezone), timezone)
-            
-            if arc == last:
+            next_month_start = new_moon(k + i, timezone) - timezone / 24 - 0.5
+            if not SolarTermUtil.has_principal_term(month_start, next_month_start):
                 break
-        
+            month_start = next_month_start
+
         return i - 1
 
 
     @staticmethod
-    def solar_to_lunar(date: SolarDate, timezone: int = 7) -> LunarDate:
+    def lunar_month_of_jdn(jdn: int, year: int, timezone: float = 7) -> Tuple[int, int, bool, int, int]:
+        """
+        Find the lunar month containing the day `jdn`, which falls in the solar year `year`. Return its lunar year, month number, whether it is a leap month,
+        and the Julian Day Numbers of its first day and of the first day of the next month.
+        """
+
+        info = LunarYearUtil.year_of_jdn(jdn, year, timezone)
+        return (info.year, *info.locate(jdn))
+
+
+    @staticmethod
+    def solar_to_lunar(date: SolarDate, timezone: float = 7) -> LunarDate:
         """
         Convert solar date to lunar date at given `timezone`.
         """
-        
-        jd = DateUtil.jd_from_date(date) + 0.5
-        k = int(floor((jd - DateUtil.jde_of_kth_new_moon(0)) / 29.530588861))
-        jd_month_start = DateUtil.new_moon_tz_adjusted(k + 1, timezone)
-        if jd_month_start > jd:
-            jd_month_start = DateUtil.new_moon_tz_adjusted(k, timezone)
-
-        a11 = DateUtil.get_lunar_month_11(date, timezone)
-        b11 = a11
-        if a11 >= jd_month_start:
-            lunar_year = date.year
-            a11 = DateUtil.get_lunar_month_11(date.year - 1, timezone)
-        else:
-            lunar_year = date.year + 1
-            b11 = DateUtil.get_lunar_month_11(date.year + 1, timezone)
-
-        lunar_day = int(jd - jd_month_start + 1)
-        diff = int((jd_month_start - a11) / 29)
-        lunar_month = diff + 11
-
-        if b11 - a11 > 365:
-            leap_month_diff = DateUtil.get_leap_month_offset(a11, timezone)
-            if diff >= leap_month_diff:
-                lunar_month = diff + 10
-            
-        if lunar_month > 12:
-            lunar_month = lunar_month - 12
-        if lunar_month >= 11 and diff < 4:
-            lunar_year -= 1
-        
-        return Date(lunar_year, lunar_month, lunar_day)
+
+        jdn = DateUtil.jdn_from_ymd(date.year, date.month, date.day)
+        lunar_year, lunar_month, _, jd_month_start, _ = DateUtil.lunar_month_of_jdn(jdn, date.year, timezone)
+        return Date(lunar_year, lunar_month, jdn - jd_month_start + 1)
 
 
     @staticmethod
-    def lunar_to_solar(date: LunarDate, timezone: int = 7) -> SolarDate:
+    def iter_days(start: SolarDate, end: SolarDate, timezone: float = 7) -> Iterator[Tuple[SolarDate, LunarDate, Tuple[int, int], int]]:
         """
-        Convert lunar date to solar date at given `timezone`.
+        Iterate over the days from `start` to `end`, both included. For each day, yield its solar date, lunar date,
+        can chi of the day as an index tuple (see `ZodiacUtil.zodiac_day_tuple`) and weekday, 0 being Sunday.
+
+        Days are stepped one at a time: the lunar month is only looked up again when a new moon is crossed,
+        so a long range costs about one `solar_to_lunar` per lunar month, in constant memory.
         """
 
-        if date.month < 11:
-            a11 = DateUtil.get_lunar_month_11(date.year - 1, timezone)
-            b11 = DateUtil.get_lunar_month_11(date.year, timezone)
-        else:
-            a11 = DateUtil.get_lunar_month_11(date.year, timezone)
-            b11 = DateUtil.get_lunar_month_11(date.year + 1, timezone)
+        jdn = DateUtil.jdn_from_ymd(start.year, start.month, start.day)
+        end_jdn = DateUtil.jdn_from_ymd(end.year, end.month, end.day)
+        if jdn > end_jdn:
+            return
 
-        k = int(floor((a11 - DateUtil.jde_of_kth_new_moon(0)) / 29.530588861 + 0.5))
-        off = date.month - 11
+        year, month, day = start.year, start.month, start.day
+        can_index = (jdn + 9) % 10 + 1
+        chi_index = (jdn + 1) % 12 + 1
+        weekday = (jdn + 1) % 7
+        jd_next_month_start = jdn
 
-        if off < 0:
-            off += 12
+        while True:
+            if jdn >= jd_next_month_start:
+                lunar_year, lunar_month, _, jd_month_start, jd_next_month_start = DateUtil.lunar_month_of_jdn(jdn, year, timezone)
 
-        if b11 - a11 > 365:
-            leap_off = DateUtil.get_leap_month_offset(a11, timezone)   
-            leap_month = leap_off - 2         
+            yield SolarDate(year, month, day), LunarDate(lunar_year, lunar_month, jdn - jd_month_start + 1), (can_index, chi_index), weekday
 
-            if leap_month < 0:
-                leap_month += 12
+            if jdn == end_jdn:
+                return
 
-            if DateUtil.is_leap_lunar_year(date) and date.month != leap_month:
-                if off >= leap_off:
-                    off += 1
-            elif DateUtil.is_leap_lunar_year(date) or off >= leap_off:
-                off += 1
+            jdn += 1
+            day += 1
+            if day > 28 or jdn == 2299161:
+                # Might be the next month, or the first day of the Gregorian calendar
+                year, month, day = DateUtil.ymd_from_jdn(jdn)
+            can_index = can_index % 10 + 1
+            chi_index = chi_index % 12 + 1
+            weekday = (weekday + 1) % 7
 
-        jde_month_start = DateUtil.new_moon_tz_adjusted(k + off, timezone)
-        return DateUtil.date_from_jd(jde_month_start + date.day - 1 - 0.5).empty_hms()
+
+    @staticmethod
+    def lunar_to_solar(date: LunarDate, timezone: float = 7, leap: bool = False) -> SolarDate:
+        """
+        Convert lunar date to solar date at given `timezone`.
+        With `leap`, `date` is in the leap month following its month.
+        """
+
+        month_start = LunarYearUtil.year_info(date.year, timezone).month_start(date.month, leap)
+        return Date(*DateUtil.ymd_from_jdn(month_start + date.day - 1))
 
 
     @staticmethod
@@ -569,210 +703,319 @@ class DateUtil(DateMixin, AngleMixin):
         return y % 19 in [0, 3, 6, 9, 11, 14, 17]
     
 
+# By ngu hanh code (see `NguHanhUtil.code`), the code of the ngu hanh each one generates (Kim sinh Thuy, ...)
+# and controls (Kim khac Moc, ...), 0 for none
+_SINH_CODES = (0, 3, 4, 2, 5, 1)
+_KHAC_CODES = (0, 2, 5, 4, 1, 3)
+_NGU_HANH_BY_CODE = (NguHanh.NONE, NguHanh.KIM, NguHanh.MOC, NguHanh.THUY, NguHanh.HOA, NguHanh.THO)
+
+
+def _relation_matrix(targets: Tuple[int, ...], mutual: bool = False) -> Tuple[Tuple[bool, ...], ...]:
+    # [a][b] is True if code a relates to code b, or b to a if `mutual`
+    return tuple(tuple(bool(a) and (b == targets[a] or mutual and a == targets[b]) for b in range(6)) for a in range(6))
+
+
+def _ngu_hanh_of_codes(codes: Tuple[int, ...]) -> Tuple[Union[NguHanh, None], ...]:
+    return tuple(_NGU_HANH_BY_CODE[code] if code else None for code in codes)
+
+
+def _inverse(targets: Tuple[int, ...]) -> Tuple[int, ...]:
+    return tuple(targets.index(code) if code else 0 for code in range(6))
+
+
+class NguHanhArrays(NamedTuple):
+    sinh: object  # 6 x 6 bool NumPy arrays by ngu hanh code, see `NguHanhUtil.SINH`
+    khac: object
+    tuong_sinh: object
+    tuong_khac: object
+    can: object  # ngu hanh code of every can and chi index, see `NguHanhUtil.CAN_CODES`
+    chi: object
+
+
 class NguHanhUtil:
+    """
+    Ngu hanh of can and chi, and the generation (sinh) and control (khac) relations between ngu hanh.
+
+    Relations are static tables indexed by the code of a ngu hanh, its value with 0 for `NguHanh.NONE` or None
+    (see `code`), so every check is one lookup; `arrays` gives them as NumPy arrays for vectorized code.
+    """
+
+    # Ngu hanh of every can and chi by index, index 0 is unused
+    CAN_NGU_HANH = (NguHanh.NONE, NguHanh.MOC, NguHanh.MOC, NguHanh.HOA, NguHanh.HOA, NguHanh.THO, NguHanh.THO, NguHanh.KIM, NguHanh.KIM, NguHanh.THUY, NguHanh.THUY)
+    CHI_NGU_HANH = (NguHanh.NONE, NguHanh.THUY, NguHanh.THO, NguHanh.MOC, NguHanh.MOC, NguHanh.THO, NguHanh.HOA, NguHanh.HOA, NguHanh.THO, NguHanh.KIM, NguHanh.KIM, NguHanh.THO, NguHanh.THUY)
+    CAN_CODES = tuple(ngu_hanh.value or 0 for ngu_hanh in CAN_NGU_HANH)
+    CHI_CODES = tuple(ngu_hanh.value or 0 for ngu_hanh in CHI_NGU_HANH)
+
+    # Ngu hanh by code, and codes by ngu hanh
+    BY_CODE = _NGU_HANH_BY_CODE
+    CODES = {None: 0, **{ngu_hanh: ngu_hanh.value or 0 for ngu_hanh in NguHanh}}
+
+    # SINH[a][b] (KHAC[a][b]) is True if the ngu hanh of code a generates (controls) the one of code b,
+    # TUONG_SINH and TUONG_KHAC in either direction
+    SINH = _relation_matrix(_SINH_CODES)
+    KHAC = _relation_matrix(_KHAC_CODES)
+    TUONG_SINH = _relation_matrix(_SINH_CODES, mutual=True)
+    TUONG_KHAC = _relation_matrix(_KHAC_CODES, mutual=True)
+
+    FROM_STRING = {
+        'Kim': NguHanh.KIM,
+        'Mộc': NguHanh.MOC,
+        'Thuỷ': NguHanh.THUY,
+        'Hoả': NguHanh.HOA,
+        'Thổ': NguHanh.THO,
+    }
+
+    # Results of the getters below by code, None for `NguHanh.NONE` like before
+    _SINH_CHO = _ngu_hanh_of_codes(_inverse(_SINH_CODES))
+    _DUOC_SINH = _ngu_hanh_of_codes(_SINH_CODES)
+    _KHAC_CHE = _ngu_hanh_of_codes(_inverse(_KHAC_CODES))
+    _BI_KHAC = _ngu_hanh_of_codes(_KHAC_CODES)
+    # In the order they were always listed in
+    _TUONG_SINH_LISTS = (
+        (),
+        (NguHanh.THUY, NguHanh.THO),
+        (NguHanh.THUY, NguHanh.HOA),
+        (NguHanh.MOC, NguHanh.KIM),
+        (NguHanh.MOC, NguHanh.THO),
+        (NguHanh.HOA, NguHanh.KIM),
+    )
+    _TUONG_KHAC_LISTS = (
+        (),
+        (NguHanh.HOA, NguHanh.MOC),
+        (NguHanh.KIM, NguHanh.THO),
+        (NguHanh.HOA, NguHanh.THO),
+        (NguHanh.THUY, NguHanh.KIM),
+        (NguHanh.THUY, NguHanh.MOC),
+    )
+
+    @staticmethod
+    def code(nguhanh: Union[NguHanh, None]) -> int:
+        """
+        Return the code of `nguhanh` in the relation tables, 0 for `NguHanh.NONE` or None.
+        """
+
+        return NguHanhUtil.CODES[nguhanh]
+
+
+    @staticmethod
+    @cached(maxsize=1)
+    def arrays() -> NguHanhArrays:
+        """
+        Return the relation tables and the ngu hanh codes of the can and chi as NumPy arrays.
+        The arrays are shared, do not modify them.
+        """
+
+        import numpy
+
+        arrays = NguHanhArrays(
+            numpy.array(NguHanhUtil.SINH), numpy.array(NguHanhUtil.KHAC), numpy.array(NguHanhUtil.TUONG_SINH), numpy.array(NguHanhUtil.TUONG_KHAC),
+            numpy.array(NguHanhUtil.CAN_CODES, dtype=numpy.int8), numpy.array(NguHanhUtil.CHI_CODES, dtype=numpy.int8),
+        )
+        for array in arrays:
+            array.setflags(write=False)
+        return arrays
+
+
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_tuong_sinh(nguhanh: int) -> List[int]:
+    def ngu_hanh_of_can(can_index: int) -> NguHanh:
+        """
+        Tim ngu hanh cua can `can_index`.
+        """
+
+        return NguHanhUtil.CAN_NGU_HANH[can_index]
+
+
+    @staticmethod
+    def ngu_hanh_of_chi(chi_index: int) -> NguHanh:
+        """
+        Tim ngu hanh cua chi `chi_index`.
+        """
+
+        return NguHanhUtil.CHI_NGU_HANH[chi_index]
+
+
+    @staticmethod
+    def get_ngu_hanh_tuong_sinh(nguhanh: NguHanh) -> List[NguHanh]:
         """
         Lay list cac hanh tuong sinh voi `nguhanh`.
         """
 
         if nguhanh is None:
             return None
-        
-        if nguhanh == NguHanh.KIM:
-            return [NguHanh.THUY, NguHanh.THO]
-        if nguhanh == NguHanh.MOC:
-            return [NguHanh.THUY, NguHanh.HOA]
-        if nguhanh == NguHanh.THUY:
-            return [NguHanh.MOC, NguHanh.KIM]
-        if nguhanh == NguHanh.HOA:
-            return [NguHanh.MOC, NguHanh.THO]
-        if nguhanh == NguHanh.THO:
-            return [NguHanh.HOA, NguHanh.KIM]
-        
-        return []
-    
-    
+        return list(NguHanhUtil._TUONG_SINH_LISTS[NguHanhUtil.CODES[nguhanh]])
+
+
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_sinh_cho(nguhanh: int) -> int:
+    def get_ngu_hanh_sinh_cho(nguhanh: NguHanh) -> NguHanh:
         """
         Tim hanh sinh cho ngu hanh `nguhanh`.
         """
-        if nguhanh is None:
-            return None
-        
-        if nguhanh == NguHanh.KIM:
-            return NguHanh.THO
-        if nguhanh == NguHanh.MOC:
-            return NguHanh.THUY
-        if nguhanh == NguHanh.THUY:
-            return NguHanh.KIM
-        if nguhanh == NguHanh.HOA:
-            return NguHanh.MOC
-        if nguhanh == NguHanh.THO:
-            return NguHanh.HOA
-        
-        return None
-        
+
+        return NguHanhUtil._SINH_CHO[NguHanhUtil.CODES[nguhanh]]
+
 
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_duoc_sinh(nguhanh: int) -> int:
+    def get_ngu_hanh_duoc_sinh(nguhanh: NguHanh) -> NguHanh:
         """
         Tim ngu hanh ma `nguhanh` sinh cho.
         """
 
-        if nguhanh is None:
-            return None
-        
-        if nguhanh == NguHanh.KIM:
-            return NguHanh.THUY
-        if nguhanh == NguHanh.MOC:
-            return NguHanh.HOA
-        if nguhanh == NguHanh.THUY:
-            return NguHanh.MOC
-        if nguhanh == NguHanh.HOA:
-            return NguHanh.THO
-        if nguhanh == NguHanh.THO:
-            return NguHanh.KIM
-        
-        return None
+        return NguHanhUtil._DUOC_SINH[NguHanhUtil.CODES[nguhanh]]
+
 
-    
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_tuong_khac(nguhanh: int) -> List[int]:
+    def get_ngu_hanh_tuong_khac(nguhanh: NguHanh) -> List[NguHanh]:
         """
         Lay list cac hanh ma tuong khac voi `nguhanh`.
         """
 
         if nguhanh is None:
             return None
-        
-        if nguhanh == NguHanh.KIM:
-            return [NguHanh.HOA, NguHanh.MOC]
-        if nguhanh == NguHanh.MOC:
-            return [NguHanh.KIM, NguHanh.THO]
-        if nguhanh == NguHanh.THUY:
-            return [NguHanh.HOA, NguHanh.THO]
-        if nguhanh == NguHanh.HOA:
-            return [NguHanh.THUY, NguHanh.KIM]
-        if nguhanh == NguHanh.THO:
-            return [NguHanh.THUY, NguHanh.MOC]
-        
-        return []
-    
-    
+        return list(NguHanhUtil._TUONG_KHAC_LISTS[NguHanhUtil.CODES[nguhanh]])
+
+
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_khac_che(nguhanh: int) -> int:
+    def get_ngu_hanh_khac_che(nguhanh: NguHanh) -> NguHanh:
         """
         Tim hanh khac che `nguhanh`.
         """
 
-        if nguhanh is None:
-            return None
-        
-        if nguhanh == NguHanh.KIM:
-            return NguHanh.HOA
-        if nguhanh == NguHanh.MOC:
-            return NguHanh.KIM
-        if nguhanh == NguHanh.THUY:
-            return NguHanh.THO
-        if nguhanh == NguHanh.HOA:
-            return NguHanh.THUY
-        if nguhanh == NguHanh.THO:
-            return NguHanh.MOC
-        
-        return None
-        
+        return NguHanhUtil._KHAC_CHE[NguHanhUtil.CODES[nguhanh]]
+
 
     @staticmethod
-    @lru_cache(maxsize=10)
-    def get_ngu_hanh_bi_khac(nguhanh: int) -> int:
+    def get_ngu_hanh_bi_khac(nguhanh: NguHanh) -> NguHanh:
         """
         Tim hanh bi `nguhanh` khac che.
         """
 
-        if nguhanh is None:
-            return None
-        
-        if nguhanh == NguHanh.KIM:
-            return NguHanh.MOC
-        if nguhanh == NguHanh.MOC:
-            return NguHanh.THO
-        if nguhanh == NguHanh.THUY:
-            return NguHanh.HOA
-        if nguhanh == NguHanh.HOA:
-            return NguHanh.KIM
-        if nguhanh == NguHanh.THO:
-            return NguHanh.THUY
-        
-        return None
-    
+        return NguHanhUtil._BI_KHAC[NguHanhUtil.CODES[nguhanh]]
+
 
     @staticmethod
-    @lru_cache(maxsize=40)
-    def check_tuong_sinh(nguhanh1: int, nguhanh2: int) -> bool:
+    def check_tuong_sinh(nguhanh1: NguHanh, nguhanh2: NguHanh) -> bool:
         """
         Tra ve True neu `nguhanh1` va `nguhanh2` tuong sinh.
         """
 
-        return nguhanh2 in NguHanhUtil.get_ngu_hanh_tuong_sinh(nguhanh1)
-    
+        if nguhanh1 is None:
+            raise TypeError('No ngu hanh to check')
+        return NguHanhUtil.TUONG_SINH[NguHanhUtil.CODES[nguhanh1]][NguHanhUtil.CODES[nguhanh2]]
+
 
     @staticmethod
-    @lru_cache(maxsize=40)
-    def check_tuong_khac(nguhanh1: int, nguhanh2: int) -> bool:
+    def check_tuong_khac(nguhanh1: NguHanh, nguhanh2: NguHanh) -> bool:
         """
         Tra ve True neu `nguhanh1` va `nguhanh2` tuong khac.
         """
 
-        return nguhanh2 in NguHanhUtil.get_ngu_hanh_tuong_khac(nguhanh1)
+        if nguhanh1 is None:
+            raise TypeError('No ngu hanh to check')
+        return NguHanhUtil.TUONG_KHAC[NguHanhUtil.CODES[nguhanh1]][NguHanhUtil.CODES[nguhanh2]]
 
 
     @staticmethod
-    @lru_cache(maxsize=10)
-    def ngu_hanh_from_string(nguhanh: str) -> int:
-        temp_dict = {
-            'Kim': NguHanh.KIM,
-            'Mộc': NguHanh.MOC,
-            'Thuỷ': NguHanh.THUY,
-            'Hoả': NguHanh.HOA,
-            'Thổ': NguHanh.THO,
-        }
-
-        return temp_dict.get(nguhanh)
+    def ngu_hanh_from_string(nguhanh: str) -> NguHanh:
+        return NguHanhUtil.FROM_STRING.get(nguhanh)
 
 
 class ZodiacUtil:
+    """
+    Can chi (sexagenary) indices and names of years, months, days and hours.
+
+    The `*_can_chi` methods only use integer arithmetic, so they take either ints or NumPy integer arrays
+    and return the can and chi indices in the same form, e.g. for a whole column of Julian Day Numbers at once.
+    """
+
+    # Localized names by index, index 0 is unused
+    CAN_NAMES = ('',) + tuple(VNLocalizer._localize(can.name.capitalize()) for can in Can if can.value is not None)
+    CHI_NAMES = ('',) + tuple(VNLocalizer._localize(chi.name.capitalize()) for chi in Chi if chi.value is not None)
+
+    @staticmethod
+    def can_chi_name(can_index: int, chi_index: int) -> str:
+        """
+        Return the name of the can chi index tuple (`can_index`, `chi_index`), e.g. (1, 1) to Giáp Tí.
+        """
+
+        return f'{ZodiacUtil.CAN_NAMES[can_index]} {ZodiacUtil.CHI_NAMES[chi_index]}'
+
+
+    @staticmethod
+    def can_chi_names(can, chi):
+        """
+        Return the names of the can and chi index arrays `can` and `chi`, as a NumPy array of strings.
+        """
+
+        return ZodiacUtil._can_chi_name_table()[can, chi]
+
+
+    @staticmethod
+    @cached(maxsize=1)
+    def _can_chi_name_table():
+        import numpy
+
+        # Indexed by (can, chi) directly, the row and column 0 are unused
+        return numpy.array([[ZodiacUtil.can_chi_name(can, chi) if can and chi else '' for chi in range(13)] for can in range(11)])
+
+
+    @staticmethod
+    def year_can_chi(year):
+        """
+        Return the can and chi indices of the lunar year `year`.
+        """
+
+        return (year + 6) % 10 + 1, (year + 8) % 12 + 1
+
+
+    @staticmethod
+    def month_can_chi(year, month):
+        """
+        Return the can and chi indices of the lunar month `month` of the lunar year `year`.
+        """
+
+        return (year * 12 + month + 3) % 10 + 1, (month + 1) % 12 + 1
+
+
+    @staticmethod
+    def day_can_chi(jdn):
+        """
+        Return the can and chi indices of the day with Julian Day Number `jdn`.
+        """
+
+        return (jdn + 9) % 10 + 1, (jdn + 1) % 12 + 1
+
+
+    @staticmethod
+    def hour_can_chi(jdn, hour):
+        """
+        Return the can and chi indices of the hour `hour` (0 to 23) of the day with Julian Day Number `jdn`.
+        Hours 23 and 0 are both the Ti hour of that day.
+        """
+
+        chi_index = (hour + 1) // 2 % 12 + 1
+        can_index_day = (jdn + 9) % 10 + 1
+        return (2 * ((can_index_day - 1) % 5) + chi_index - 1) % 10 + 1, chi_index
+
+
     @staticmethod
-    @VNLocalizer.localizer
     def zodiac_year(date: Date) -> str:
         """
         Return zodiac year for given `date`.
         """
 
-        can_index = (date.year + 6) % 10 + 1
-        chi_index = (date.year + 8) % 12 + 1
-        return '{} {}'.format(Can(can_index).name.capitalize(), Chi(chi_index).name.capitalize())
+        return ZodiacUtil.can_chi_name(*ZodiacUtil.year_can_chi(date.year))
 
 
     @staticmethod
-    @VNLocalizer.localizer
     def zodiac_month(date: Date) -> str:
         """
         Return zodiac month for given `date`.
         """
 
-        can_index = (date.year * 12 + date.month + 3) % 10 + 1
-        return '{} {}'.format(Can(can_index).name.capitalize(), Chi((date.month + 1) % 12 + 1).name.capitalize())
+        return ZodiacUtil.can_chi_name(*ZodiacUtil.month_can_chi(date.year, date.month))
     
 
     @staticmethod
-    @VNLocalizer.localizer
     def zodiac_day(date: Date) -> str:
         """
         Return zodiac day for given `date`. Must be an empty_hms() date.
@@ -780,32 +1023,18 @@ class ZodiacUtil:
         NOTE: `date` must be a solar date, not a lunar date.
         """
 
-        jd = int(round(DateUtil.jd_from_date(date.empty_hms()) + 0.5))
-        can_index = (jd + 9) % 10 + 1
-        chi_index = (jd + 1) % 12 + 1
-        return '{} {}'.format(Can(can_index).name.capitalize(), Chi(chi_index).name.capitalize())
+        return ZodiacUtil.can_chi_name(*ZodiacUtil.day_can_chi(DateUtil.jdn_from_ymd(date.year, date.month, date.day)))
 
 
     @staticmethod
-    @VNLocalizer.localizer
     def zodiac_hour(date: Date) -> str:
         """
         Return zodiac hour for given `date`. Must be an empty_hms() date.
 
         NOTE: `date` must be a solar date, not a lunar date.
         """
-        
-        if date.hour == 23 or date.hour == 0:
-            chi_index = 1
-        else:
-            chi_index = (date.hour - 1) // 2 + 2
-        
-        
-        jd = int(round(DateUtil.jd_from_date(date.empty_hms()) + 0.5))
-        can_index_day = (jd + 9) % 10 + 1
-        can_index = (2 * ((can_index_day - 1) % 5) + chi_index - 1) % 10 + 1
 
-        return '{} {}'.format(Can(can_index).name.capitalize(), Chi(chi_index).name.capitalize())
+        return ZodiacUtil.can_chi_name(*ZodiacUtil.hour_can_chi(DateUtil.jdn_from_ymd(date.year, date.month, date.day), date.hour))
     
 
     @staticmethod
@@ -814,9 +1043,7 @@ class ZodiacUtil:
         Return zodiac year for given `date` in form of an index tuple.
         """
 
-        can_index = (date.year + 6) % 10 + 1
-        chi_index = (date.year + 8) % 12 + 1
-        return can_index, chi_index
+        return ZodiacUtil.year_can_chi(date.year)
 
 
     @staticmethod
@@ -825,9 +1052,7 @@ class ZodiacUtil:
         Return zodiac month for given `date` in form of an index tuple.
         """
 
-        can_index = (date.year * 12 + date.month + 3) % 10 + 1
-        chi_index = (date.month + 1) % 12 + 1
-        return can_index, chi_index
+        return ZodiacUtil.month_can_chi(date.year, date.month)
     
 
     @staticmethod
@@ -838,10 +1063,7 @@ class ZodiacUtil:
         NOTE: `date` must be a solar date, not a lunar date.
         """
 
-        jd = int(round(DateUtil.jd_from_date(date.empty_hms()) + 0.5))
-        can_index = (jd + 9) % 10 + 1
-        chi_index = (jd + 1) % 12 + 1
-        return can_index, chi_index
+        return ZodiacUtil.day_can_chi(DateUtil.jdn_from_ymd(date.year, date.month, date.day))
 
 
     @staticmethod
@@ -851,14 +1073,5 @@ class ZodiacUtil:
 
         NOTE: `date` must be a solar date, not a lunar date.
         """
-        
-        if date.hour == 23 or date.hour == 0:
-            chi_index = 1
-        else:
-            chi_index = (date.hour - 1) // 2 + 2
-        
-        
-        jd = int(round(DateUtil.jd_from_date(date.empty_hms()) + 0.5))
-        can_index_day = (jd + 9) % 10 + 1
-        can_index = (2 * ((can_index_day - 1) % 5) + chi_index - 1) % 10 + 1
-        return can_index, chi_index
+
+        return ZodiacUtil.hour_can_chi(DateUtil.jdn_from_ymd(date.year, date.month, date.day), date.hour)
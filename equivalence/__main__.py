@@ -0,0 +1,56 @@
+"""
+Compare a candidate engine to the reference one over every day of a range of years: solar to lunar conversion,
+lunar to solar conversion, and the placement of every star for births of every hour chi and both genders.
+
+    python -m equivalence [--candidate tables] [--first-year 1800] [--last-year 2200] [--star-rate 0.05] [--output report.json]
+
+Run from the repository root. The reference converts with the code of before the new moon series and the tables,
+frozen in `equivalence/reference.py`. The candidate is `tables` (new moon ephemeris and lunar tables installed), `arrays`
+(the tables and the NumPy conversion of whole shards) or the `module:Class` path of an `Engine` subclass.
+The calendar checks are exhaustive, the stars are compared for a `--star-rate` fraction of the births, 1 for all.
+The first mismatches are printed with the call reproducing each of them, and the exit status is 1 if there is any.
+"""
+
+import argparse
+import json
+import sys
+
+from .harness import Options, run
+
+
+def main() -> None:
+    defaults = Options()
+    parser = argparse.ArgumentParser(prog='python -m equivalence', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reference', default=defaults.reference)
+    parser.add_argument('--candidate', default=defaults.candidate)
+    parser.add_argument('--first-year', type=int, default=defaults.first_year)
+    parser.add_argument('--last-year', type=int, default=defaults.last_year)
+    parser.add_argument('--timezone', type=float, default=float(defaults.timezone))
+    parser.add_argument('--cur-year', type=int, default=defaults.cur_year)
+    parser.add_argument('--star-rate', type=float, default=defaults.star_rate)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--max-mismatches', type=int, default=defaults.max_mismatches)
+    parser.add_argument('--processes', type=int, help='defaults to the number of CPUs')
+    parser.add_argument('--shard-days', type=int, default=366)
+    parser.add_argument('--output', help='write the report to this JSON file')
+    args = parser.parse_args()
+
+    timezone = int(args.timezone) if args.timezone.is_integer() else args.timezone
+    options = Options(args.reference, args.candidate, args.first_year, args.last_year, timezone, args.cur_year, args.star_rate, args.seed, args.max_mismatches)
+    report = run(options, args.processes, args.shard_days, log=lambda line: print(line, file=sys.stderr))
+
+    checks = ', '.join(f'{count:,} {check}' for check, count in report['checks'].items())
+    print(f'{options.candidate} vs {options.reference}: compared {checks} values in {report["seconds"]}s, {report["mismatch_count"]} mismatches')
+    for mismatch in report['mismatches']:
+        note = '' if mismatch['isolated'] else '  (only after the rest of its shard)'
+        print(f'  {mismatch["check"]} {mismatch["field"]}: {mismatch["reference"]!r} != {mismatch["candidate"]!r}  {mismatch["repro"]}{note}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    sys.exit(1 if report['mismatch_count'] else 0)
+
+
+if __name__ == '__main__':
+    main()
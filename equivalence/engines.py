@@ -0,0 +1,143 @@
+"""
+Engines compared by the harness. An engine converts days between the solar and lunar calendars and places the stars,
+all of them through the same four methods, so a candidate only overrides what it speeds up.
+"""
+
+import importlib
+from typing import Dict, List, Tuple, Type, Union
+
+from core.caches import CacheRegistry
+from core.date import Date, SolarDate
+from core.lunaryear import LunarYearUtil
+from core.tables import LunarTable, NewMoonEphemeris
+from core.tuvi.stars.sao import SaoRegistry
+from core.utils import DateUtil
+
+from . import reference
+
+LunarDay = Tuple[int, int, int, bool]  # lunar year, month, day and leap month flag
+
+
+class Engine:
+    """
+    The scalar conversions and the star placement of `core`, with whatever tables are installed.
+    """
+
+    name = 'engine'
+
+    def setup(self, first_year: int, last_year: int, timezone: float) -> None:
+        """
+        Prepare the engine to run over the solar years `first_year` to `last_year` at `timezone`. Every memoization
+        cache is cleared, so no result computed by another engine in this process is reused.
+        """
+
+        CacheRegistry.clear()
+
+
+    def lunar_days(self, jdns: List[int], timezone: float) -> List[LunarDay]:
+        lunar_days = []
+        for jdn in jdns:
+            year, month, leap, month_start, _ = DateUtil.lunar_month_of_jdn(jdn, DateUtil.ymd_from_jdn(jdn)[0], timezone)
+            lunar_days.append((year, month, jdn - month_start + 1, leap))
+        return lunar_days
+
+
+    def solar_jdns(self, lunar_days: List[LunarDay], timezone: float) -> List[int]:
+        jdns = []
+        for year, month, day, leap in lunar_days:
+            date = DateUtil.lunar_to_solar(Date(year, month, day), timezone, leap)
+            jdns.append(DateUtil.jdn_from_ymd(date.year, date.month, date.day))
+        return jdns
+
+
+    def stars(self, birthdate: SolarDate, cur_year: int, gender: int) -> Tuple[Tuple[int, Union[str, None]], ...]:
+        """
+        Return the position and the trang thai of every registered star, in the order of `SaoRegistry`.
+        """
+
+        positions = SaoRegistry.place(birthdate, cur_year, gender)
+        return tuple((position, sao.trang_thai.value) for sao, position in zip(SaoRegistry.get_subclasses(), positions))
+
+
+class ReferenceEngine(Engine):
+    """
+    The calendar conversions of `equivalence.reference`, the code as it was before the series and the tables.
+    The stars are placed by the current `core` code with no table installed, every new moon computed from the series:
+    comparing them only checks the tables, a change to the star code itself shows in both engines alike.
+    """
+
+    name = 'reference'
+
+    def setup(self, first_year: int, last_year: int, timezone: float) -> None:
+        NewMoonEphemeris.uninstall()
+        LunarTable.disable_lazy()
+        # The stars are placed at UTC+7
+        for tz in {timezone, 7}:
+            LunarTable.uninstall(tz)
+        super().setup(first_year, last_year, timezone)
+
+
+    def lunar_days(self, jdns: List[int], timezone: float) -> List[LunarDay]:
+        return [reference.solar_to_lunar(jdn, timezone) for jdn in jdns]
+
+
+    def solar_jdns(self, lunar_days: List[LunarDay], timezone: float) -> List[int]:
+        return [reference.lunar_to_solar(year, month, day, leap, timezone) for year, month, day, leap in lunar_days]
+
+
+class TableEngine(Engine):
+    """
+    The new moon ephemeris and the lunar tables installed, as in a deployed worker.
+    """
+
+    name = 'tables'
+
+    # Built once per process and range, every shard reinstalls them
+    _built: Dict[Tuple[int, int, float], Tuple[NewMoonEphemeris, List[LunarTable]]] = {}
+
+    def setup(self, first_year: int, last_year: int, timezone: float) -> None:
+        key = (first_year, last_year, timezone)
+        if key not in TableEngine._built:
+            # One year of margin, the lunar year of the first days of January starts the solar year before
+            ReferenceEngine().setup(first_year, last_year, timezone)
+            ephemeris = NewMoonEphemeris.build(*NewMoonEphemeris.k_range(first_year - 1, last_year + 1))
+            NewMoonEphemeris.install(ephemeris)
+            tables = [LunarTable.build(first_year - 1, last_year + 1, tz) for tz in sorted({timezone, 7})]
+            TableEngine._built[key] = ephemeris, tables
+
+        ephemeris, tables = TableEngine._built[key]
+        NewMoonEphemeris.install(ephemeris)
+        for table in tables:
+            LunarTable.install(table)
+        super().setup(first_year, last_year, timezone)
+
+
+class ArrayEngine(TableEngine):
+    """
+    The tables, and the solar to lunar conversion of whole arrays of days at once.
+    """
+
+    name = 'arrays'
+
+    def lunar_days(self, jdns: List[int], timezone: float) -> List[LunarDay]:
+        import numpy
+
+        years, months, days, leaps = LunarYearUtil.lunar_dates_of_jdn_array(numpy.array(jdns, dtype=numpy.int64), timezone)
+        return list(zip(years.tolist(), months.tolist(), days.tolist(), leaps.tolist()))
+
+
+ENGINES: Dict[str, Type[Engine]] = {engine.name: engine for engine in [ReferenceEngine, TableEngine, ArrayEngine]}
+
+
+def get_engine(spec: str) -> Engine:
+    """
+    Create the engine `spec`, the name of a built-in engine or the `module:Class` path of an `Engine` subclass.
+    """
+
+    if spec in ENGINES:
+        return ENGINES[spec]()
+
+    module, _, name = spec.partition(':')
+    if not name:
+        raise ValueError(f'Unknown engine {spec}, expected one of {", ".join(ENGINES)} or module:Class')
+    return getattr(importlib.import_module(module), name)()
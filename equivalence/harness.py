@@ -0,0 +1,185 @@
+"""
+Differential testing of a candidate engine against the reference one.
+
+The days of the range are split in shards of consecutive days, run in a process pool. In every shard, the reference
+engine converts every day to the lunar calendar and back, and places the stars of the sampled births with their trang
+thai, then the candidate does the same from empty caches, and both outputs are compared field by field. The lunar
+days given back to `solar_jdns` are those of the reference, so both engines convert the same inputs.
+
+Both engines place the stars with the current `core` code, the reference one without the tables: the star check
+covers the tables and the calendar under the stars, not a change to the star code itself.
+"""
+
+import multiprocessing
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+
+from core.date import SolarDate
+from core.tuvi.stars.sao import SaoRegistry
+from core.utils import DateUtil
+
+from .engines import Engine, get_engine
+
+# One hour in every chi, from Ti (23:00 to 00:59) to Hoi
+HOURS = [0] + list(range(1, 23, 2))
+GENDERS = [1, -1]
+
+
+class Options(NamedTuple):
+    reference: str = 'reference'
+    candidate: str = 'tables'
+    first_year: int = 1800
+    last_year: int = 2200
+    timezone: float = 7
+    cur_year: int = 2024
+    star_rate: float = 0.05  # fraction of the births (day, hour chi, gender) whose stars are compared, 1 for all of them
+    seed: int = 0
+    max_mismatches: int = 20
+
+
+class Mismatch(NamedTuple):
+    check: str  # solar_to_lunar, lunar_to_solar or stars
+    jdn: int  # the solar day, to order the mismatches
+    field: str
+    reference: object
+    candidate: object
+    repro: str  # the single call giving different results with the two engines
+    isolated: bool  # whether the engines still differ given this input alone, from empty caches
+
+
+_engines: Union[Tuple[Engine, Engine], None] = None
+
+
+def _init_worker(reference: str, candidate: str) -> None:
+    global _engines
+    _engines = get_engine(reference), get_engine(candidate)
+
+
+def births(jdns: List[int], options: Options) -> List[Tuple[SolarDate, int]]:
+    """
+    Return the births whose stars are compared in the days `jdns`, as (birthdate, gender) tuples.
+    The sample of a day only depends on the seed and the day, not on the shards.
+    """
+
+    births = []
+    for jdn in jdns:
+        year, month, day = DateUtil.ymd_from_jdn(jdn)
+        rng = random.Random(options.seed * 10_000_000 + jdn) if options.star_rate < 1 else None
+        for hour in HOURS:
+            for gender in GENDERS:
+                if rng is None or rng.random() < options.star_rate:
+                    births.append((SolarDate(year, month, day, hour, 0), gender))
+    return births
+
+
+def _isolated(options: Options, call: Callable[[Engine], object]) -> bool:
+    """
+    Run `call` with each engine, from empty caches, and return whether the results differ.
+    """
+
+    results = []
+    for engine in _engines:
+        engine.setup(options.first_year, options.last_year, options.timezone)
+        results.append(call(engine))
+    return results[0] != results[1]
+
+
+def run_shard(options: Options, first_jdn: int, last_jdn: int) -> Tuple[Dict[str, int], int, List[Mismatch]]:
+    """
+    Compare the engines over the days `first_jdn` to `last_jdn`. Return the number of values compared per check,
+    the number of mismatches and the first `max_mismatches` of them.
+    """
+
+    reference, candidate = _engines
+    timezone = options.timezone
+    jdns = list(range(first_jdn, last_jdn + 1))
+    shard_births = births(jdns, options)
+
+    outputs = []
+    lunar_days = None
+    for engine in (reference, candidate):
+        engine.setup(options.first_year, options.last_year, timezone)
+        engine_lunar_days = engine.lunar_days(jdns, timezone)
+        if lunar_days is None:
+            lunar_days = engine_lunar_days
+        outputs.append((engine_lunar_days, engine.solar_jdns(lunar_days, timezone), [engine.stars(birthdate, options.cur_year, gender) for birthdate, gender in shard_births]))
+
+    (ref_lunar, ref_solar, ref_stars), (cand_lunar, cand_solar, cand_stars) = outputs
+    checks = {'solar_to_lunar': 4 * len(jdns), 'lunar_to_solar': len(jdns), 'stars': sum(len(stars) for stars in ref_stars)}
+    found = []
+
+    for jdn, ref, cand in zip(jdns, ref_lunar, cand_lunar):
+        if ref != cand:
+            year, month, day = DateUtil.ymd_from_jdn(jdn)
+            call = lambda engine, jdn=jdn: engine.lunar_days([jdn], timezone)
+            for field, ref_value, cand_value in zip(('year', 'month', 'day', 'leap'), ref, cand):
+                if ref_value != cand_value:
+                    found.append(('solar_to_lunar', jdn, field, ref_value, cand_value, f'DateUtil.lunar_month_of_jdn({jdn}, {year}, {timezone})  # SolarDate({year}, {month}, {day})', call))
+
+    for jdn, (year, month, day, leap), ref, cand in zip(jdns, lunar_days, ref_solar, cand_solar):
+        if ref != cand:
+            call = lambda engine, lunar_day=(year, month, day, leap): engine.solar_jdns([lunar_day], timezone)
+            found.append(('lunar_to_solar', jdn, 'jdn', ref, cand, f'DateUtil.lunar_to_solar(Date({year}, {month}, {day}), {timezone}, leap={leap})', call))
+
+    stars = SaoRegistry.get_subclasses()
+    for (birthdate, gender), ref, cand in zip(shard_births, ref_stars, cand_stars):
+        if ref != cand:
+            jdn = DateUtil.jdn_from_ymd(birthdate.year, birthdate.month, birthdate.day)
+            call = lambda engine, birthdate=birthdate, gender=gender: engine.stars(birthdate, options.cur_year, gender)
+            for sao, ref_value, cand_value in zip(stars, ref, cand):
+                if ref_value != cand_value:
+                    found.append(('stars', jdn, sao.__name__, ref_value, cand_value, f'{sao.__name__}.an_sao(SolarDate{tuple(birthdate)}, {options.cur_year}, {gender})', call))
+
+    mismatches = []
+    for check, jdn, field, ref_value, cand_value, repro, call in found[:options.max_mismatches]:
+        # A result could differ only after the rest of the shard filled the caches
+        isolated = _isolated(options, call)
+        mismatches.append(Mismatch(check, jdn, field, ref_value, cand_value, repro, isolated))
+    return checks, len(found), mismatches
+
+
+def _run_shard(args: Tuple[Options, int, int]) -> Tuple[Dict[str, int], int, List[Mismatch]]:
+    return run_shard(*args)
+
+
+def run(options: Options, processes: Union[int, None] = None, shard_days: int = 366, log: Callable[[str], None] = print) -> Dict[str, object]:
+    """
+    Compare the candidate engine to the reference one over every day of `options.first_year` to `options.last_year`,
+    with `processes` worker processes (all the CPUs if None, none but this one if 1). Return the report.
+    """
+
+    first_jdn = DateUtil.jdn_from_ymd(options.first_year, 1, 1)
+    last_jdn = DateUtil.jdn_from_ymd(options.last_year, 12, 31)
+    shards = [(options, start, min(start + shard_days - 1, last_jdn)) for start in range(first_jdn, last_jdn + 1, shard_days)]
+
+    start = time.perf_counter()
+    checks = {'solar_to_lunar': 0, 'lunar_to_solar': 0, 'stars': 0}
+    mismatch_count = 0
+    mismatches = []
+
+    def collect(results) -> None:
+        nonlocal mismatch_count
+        for done, (shard_checks, shard_mismatch_count, shard_mismatches) in enumerate(results, 1):
+            for check, count in shard_checks.items():
+                checks[check] += count
+            mismatch_count += shard_mismatch_count
+            mismatches.extend(shard_mismatches)
+            elapsed = time.perf_counter() - start
+            log(f'{done}/{len(shards)} shards  {sum(checks.values()) / elapsed:,.0f} values/s  {mismatch_count} mismatches')
+
+    if processes == 1:
+        _init_worker(options.reference, options.candidate)
+        collect(map(_run_shard, shards))
+    else:
+        with multiprocessing.Pool(processes, _init_worker, (options.reference, options.candidate)) as pool:
+            collect(pool.imap_unordered(_run_shard, shards))
+
+    mismatches.sort(key=lambda mismatch: (mismatch.jdn, mismatch.check, mismatch.field))
+    return {
+        'options': options._asdict(),
+        'seconds': round(time.perf_counter() - start, 1),
+        'checks': checks,
+        'mismatch_count': mismatch_count,
+        'mismatches': [mismatch._asdict() for mismatch in mismatches[:options.max_mismatches]],
+    }
@@ -0,0 +1,307 @@
+"""
+The solar and lunar calendar conversions of `core.utils.DateUtil` as they were before the new moon series, ephemeris
+and tables, frozen here so the reference engine does not share any code with the engines it checks. Do not optimize.
+
+Three changes only: days are Julian Day Numbers instead of `Date`; the leap month flag, which the old code did not
+return and guessed from the year in `lunar_to_solar`, comes from the leap month offset as in the algorithm of
+Ho Ngoc Duc the code follows; and `solar_to_lunar` looks one new moon further back when the day is before both
+candidates, where the old code gave day 0.
+"""
+
+from functools import lru_cache
+from math import cos, floor, pi, sin
+from typing import Tuple
+
+
+def to_radians(degrees: float) -> float:
+    result = degrees * pi / 180.0
+    while result >= 2 * pi:
+        result -= 2 * pi
+    while result < 0:
+        result += 2 * pi
+
+    return result
+
+
+def jd_from_ymd(year: int, month: int, day: int) -> float:
+    """
+    Compute Julian day given calendar date at 00:00.
+    """
+
+    d, m, y = day, month, year
+    if m <= 2:
+        m += 12
+        y -= 1
+
+    a = int(floor(y / 100))
+    b = 2 - a + int(floor(a / 4))
+
+    # Check if date is Julian date
+    if (year, month, day) < (1582, 10, 5):
+        b = 0
+
+    return int(365.25 * (y + 4716)) + int(30.6001 * (m + 1)) + d + b - 1524.5
+
+
+def ymd_from_jd(jd: float) -> Tuple[int, int, int]:
+    """
+    Compute calendar date from given Julian day `jd`, the time of day dropped.
+    """
+
+    z = int(jd + 0.5)
+    if z < 2299161:
+        a = z
+    else:
+        alpha = int((z - 1867216.25) / 36524.25)
+        a = z + 1 + alpha - int(floor(alpha / 4))
+
+    b = a + 1524
+    c = int(floor((b - 122.1) / 365.25))
+    d = int(365.25 * c)
+    e = int(floor((b - d) / 30.6001))
+
+    day = b - d - int(30.6001 * e)
+    month = e - 1 if e < 14 else e - 13
+    year = c - 4716 if month > 2 else c - 4715
+    return year, month, day
+
+
+@lru_cache(maxsize=None)
+def jde_of_kth_new_moon(k: int) -> float:
+    """
+    Compute the `k`-th new moon in Julian Ephemeris Day.
+    `k` = 0 corresponds to the New Moon of 2000 January 6.
+    """
+
+    T = k / 1236.85 # time in Julian centuries since the epoch 2000
+    jde = 2451550.09766 + 29.530588861 * k + 0.00015437 * (T ** 2) - 0.000000150 * (T ** 3) + 0.00000000073 * (T ** 4) # need to correct
+    E = 1 - 0.002516 * T - 0.0000074 * (T ** 2)
+
+    # The following is computed at jde
+    sun_mean_anomaly = 2.5534 + 29.10535670 * k - 0.0000014 * (T ** 2) - 0.00000011 * (T ** 3)
+    moon_mean_anomaly = 201.5643 + 385.81693528 * k + 0.0107582 * (T ** 2) + 0.00001238 * (T ** 3) - 0.000000058 * (T ** 4)
+    moon_arg_lat = 160.7108 + 390.67050284 * k - 0.0016118 * (T ** 2) - 0.00000227 * (T ** 3) + 0.000000011 * (T ** 4)
+    long_asc_node = 124.7746 - 1.56375588 * k + 0.0020672 * (T ** 2) + 0.00000215 * (T ** 3)
+
+    # Planetary arguments
+    A1 = 299.77 + 0.107408 * k - 0.009173 * (T ** 2)
+    A2 = 251.88 + 0.016321 * k
+    A3 = 251.83 + 26.651886 * k
+    A4 = 349.42 + 36.412478 * k
+    A5 = 84.66 + 18.206239 * k
+    A6 = 141.74 + 53.303771 * k
+    A7 = 207.14 + 2.453732 * k
+    A8 = 154.84 + 7.306860 * k
+    A9 = 34.52 + 27.261239 * k
+    A10 = 207.19 + 0.121824 * k
+    A11 = 291.34 + 1.844379 * k
+    A12 = 161.72 + 24.198154 * k
+    A13 = 239.56 + 25.513099 * k
+    A14 = 331.55 + 3.592518 * k
+
+    first_correction = -0.40720 * sin(to_radians(moon_mean_anomaly)) + \
+                        0.17241 * E * sin(to_radians(sun_mean_anomaly)) + \
+                        0.01608 * sin(to_radians(2 * moon_mean_anomaly)) + \
+                        0.01039 * sin(to_radians(2 * moon_arg_lat)) + \
+                        0.00739 * E * sin(to_radians(moon_mean_anomaly - sun_mean_anomaly)) - \
+                        0.00514 * E * sin(to_radians(moon_mean_anomaly + sun_mean_anomaly)) + \
+                        0.00208 * (E ** 2) * sin(to_radians(2 * sun_mean_anomaly)) - \
+                        0.00111 * sin(to_radians(moon_mean_anomaly - 2 * moon_arg_lat)) - \
+                        0.00057 * sin(to_radians(moon_mean_anomaly + 2 * moon_arg_lat)) + \
+                        0.00056 * E * sin(to_radians(moon_mean_anomaly * 2 + sun_mean_anomaly)) - \
+                        0.00042 * sin(to_radians(moon_mean_anomaly * 3)) + \
+                        0.00042 * E * sin(to_radians(sun_mean_anomaly + moon_arg_lat * 2)) + \
+                        0.00038 * E * sin(to_radians(sun_mean_anomaly - moon_arg_lat * 2)) - \
+                        0.00024 * E * sin(to_radians(moon_mean_anomaly * 2 - sun_mean_anomaly)) - \
+                        0.00017 * sin(to_radians(long_asc_node)) - \
+                        0.00007 * sin(to_radians(moon_mean_anomaly + sun_mean_anomaly * 2)) + \
+                        0.00004 * sin(to_radians(moon_mean_anomaly * 2 - moon_arg_lat * 2)) + \
+                        0.00004 * sin(to_radians(3 * sun_mean_anomaly)) + \
+                        0.00003 * sin(to_radians(moon_mean_anomaly + sun_mean_anomaly - moon_arg_lat * 2)) + \
+                        0.00003 * sin(to_radians(moon_mean_anomaly * 2 + moon_arg_lat * 2)) - \
+                        0.00003 * sin(to_radians(moon_mean_anomaly + sun_mean_anomaly + moon_arg_lat * 2)) + \
+                        0.00003 * sin(to_radians(moon_mean_anomaly - sun_mean_anomaly + moon_arg_lat * 2)) - \
+                        0.00002 * sin(to_radians(moon_mean_anomaly - sun_mean_anomaly - moon_arg_lat * 2)) - \
+                        0.00002 * sin(to_radians(moon_mean_anomaly * 3 + sun_mean_anomaly)) + \
+                        0.00002 * sin(to_radians(moon_mean_anomaly * 4))
+
+    second_correction = 0.000325 * sin(to_radians(A1)) + 0.000165 * sin(to_radians(A2)) + \
+                        0.000164 * sin(to_radians(A3)) + 0.000126 * sin(to_radians(A4)) + \
+                        0.000110 * sin(to_radians(A5)) + 0.000062 * sin(to_radians(A6)) + \
+                        0.000060 * sin(to_radians(A7)) + 0.000056 * sin(to_radians(A8)) + \
+                        0.000047 * sin(to_radians(A9)) + 0.000042 * sin(to_radians(A10)) + \
+                        0.000040 * sin(to_radians(A11)) + 0.000037 * sin(to_radians(A12)) + \
+                        0.000035 * sin(to_radians(A13)) + 0.000023 * sin(to_radians(A14))
+
+    return jde + first_correction + second_correction
+
+
+def sun_longitude(jd: float) -> float:
+    """
+    Compute the longitude of sun given Julian day.
+    """
+
+    # Julian centuries
+    T = (jd - 2451545) / 36525
+
+    # Geometric mean longitude of the Sun, referred to the mean equinox of the date, in degree
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * (T ** 2)
+
+    # Mean anomaly of the Sun, degree
+    M = 357.52911 + 35999.05029 * T - 0.0001537 * (T ** 2)
+
+    # Eccentricity of the Earth's orbit
+    e = 0.016708634 - 0.000042037 * T - 0.0000001267 * (T ** 2)
+
+    # Sun's equation of the center
+    C = (1.914602 - 0.004817 * T - 0.000014 * (T ** 2)) * sin(to_radians(M)) + \
+        (0.019993 - 0.000101 * T) * sin(to_radians(2 * M)) + \
+        0.000289 * sin(to_radians(3 * M))
+
+    # Sun's true longitude
+    o = L0 + C
+
+    # Sun's true anomaly
+    v = M + C
+
+    # Sun's radius vector, or the distance between the centers of the Sun and the Earth, expressed in astronomical units
+    R = 1.000001018 * (1 - e ** 2) / (1 + e * cos(to_radians(v)))
+
+    # Nutation and aberration correction
+    ohm = 125.04 - 1934.136 * T
+
+    # Apparent longitude
+    lamb = o - 0.00569 - 0.00478 * sin(to_radians(ohm))
+
+    return to_radians(lamb)
+
+
+def new_moon_tz_adjusted(k: int, timezone: float = 7) -> int:
+    """
+    Compute jde of `k`-th new moon with `timezone` adjusted.
+    """
+
+    return int(jde_of_kth_new_moon(k) + timezone / 24 + 0.5)
+
+
+def sun_longitude_tz_adjusted(jd: float, timezone: float = 7) -> int:
+    """
+    Compute sun longitude with `timezone` adjusted at given `jd`.
+    Contract [0; 2*pi) to [0; 12) integer range.
+    """
+    return int(sun_longitude(jd - timezone / 24 - 0.5) / pi * 6)
+
+
+def get_lunar_month_11(year: int, timezone: float = 7) -> int:
+    """
+    Find the first day of 11th month in lunar year.
+    """
+
+    jd = jd_from_ymd(year, 12, 31) - jde_of_kth_new_moon(0) + 0.5
+    k = int(floor(jd / 29.530588861))
+    jd_kth_new_moon = new_moon_tz_adjusted(k, timezone)
+    temp = sun_longitude_tz_adjusted(jd_kth_new_moon, timezone)
+
+    if temp >= 9:
+        jd_kth_new_moon = new_moon_tz_adjusted(k - 1, timezone)
+    return jd_kth_new_moon
+
+
+def get_leap_month_offset(jd: float, timezone: float = 7) -> int:
+    """
+    Find the index of the next leap month after the month of the day `jd`.
+    `jd` should be something like the result of `get_lunar_month_11` method.
+    """
+
+    k = int(floor((jd - jde_of_kth_new_moon(0)) / 29.530588861 + 0.5))
+    last = 0
+    i = 1  # start with month following 11th lunar month
+    arc = sun_longitude_tz_adjusted(new_moon_tz_adjusted(k + i, timezone), timezone)
+
+    while i < 14:
+        last = arc
+        i += 1
+        arc = sun_longitude_tz_adjusted(new_moon_tz_adjusted(k + i, timezone), timezone)
+
+        if arc == last:
+            break
+
+    return i - 1
+
+
+def solar_to_lunar(jdn: int, timezone: float = 7) -> Tuple[int, int, int, bool]:
+    """
+    Convert the solar day `jdn` to the lunar year, month, day and leap month flag at given `timezone`.
+    """
+
+    year = ymd_from_jd(jdn)[0]
+    jd = jdn
+    k = int(floor((jd - jde_of_kth_new_moon(0)) / 29.530588861))
+    jd_month_start = new_moon_tz_adjusted(k + 1, timezone)
+    if jd_month_start > jd:
+        jd_month_start = new_moon_tz_adjusted(k, timezone)
+        if jd_month_start > jd:
+            # The old code stopped here, and gave day 0 to the last day of a month
+            jd_month_start = new_moon_tz_adjusted(k - 1, timezone)
+
+    a11 = get_lunar_month_11(year, timezone)
+    b11 = a11
+    if a11 >= jd_month_start:
+        lunar_year = year
+        a11 = get_lunar_month_11(year - 1, timezone)
+    else:
+        lunar_year = year + 1
+        b11 = get_lunar_month_11(year + 1, timezone)
+
+    lunar_day = int(jd - jd_month_start + 1)
+    diff = int((jd_month_start - a11) / 29)
+    lunar_month = diff + 11
+    leap = False
+
+    if b11 - a11 > 365:
+        leap_month_diff = get_leap_month_offset(a11, timezone)
+        if diff >= leap_month_diff:
+            lunar_month = diff + 10
+            leap = diff == leap_month_diff
+
+    if lunar_month > 12:
+        lunar_month = lunar_month - 12
+    if lunar_month >= 11 and diff < 4:
+        lunar_year -= 1
+
+    return lunar_year, lunar_month, lunar_day, leap
+
+
+def lunar_to_solar(year: int, month: int, day: int, leap: bool, timezone: float = 7) -> int:
+    """
+    Convert the lunar date to the Julian Day Number of the solar day at given `timezone`.
+    """
+
+    if month < 11:
+        a11 = get_lunar_month_11(year - 1, timezone)
+        b11 = get_lunar_month_11(year, timezone)
+    else:
+        a11 = get_lunar_month_11(year, timezone)
+        b11 = get_lunar_month_11(year + 1, timezone)
+
+    k = int(floor((a11 - jde_of_kth_new_moon(0)) / 29.530588861 + 0.5))
+    off = month - 11
+
+    if off < 0:
+        off += 12
+
+    if b11 - a11 > 365:
+        leap_off = get_leap_month_offset(a11, timezone)
+        leap_month = leap_off - 2
+
+        if leap_month < 0:
+            leap_month += 12
+
+        if leap and month != leap_month:
+            raise ValueError(f'{month} is not the leap month of {year}')
+        elif leap or off >= leap_off:
+            off += 1
+    elif leap:
+        raise ValueError(f'{year} has no leap month')
+
+    return new_moon_tz_adjusted(k + off, timezone) + day - 1
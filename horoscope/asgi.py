@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'horoscope.settings')
 
 application = get_asgi_application()
+
+# Only the server process imports this module, management commands and tests are not warmed up
+from tuvi.warmup import warm_server  # noqa: E402
+
+warm_server()
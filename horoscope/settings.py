@@ -57,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tuvi.middleware.AdmissionControlMiddleware',
 ]
 
 # Production environment
@@ -150,4 +151,104 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Ready for production
 if not DEBUG:
     SESSION_COOKIE_SECURE = True
-    CSRF_COOKIE_SECURE = True
\ No newline at end of file
+    CSRF_COOKIE_SECURE = True
+
+# Warmup
+# Fill fonts, lunar calendar and star caches in the server process (horoscope/wsgi.py and asgi.py), before
+# the first request. Management commands and tests are never warmed up. Set TUVI_WARMUP=0 to skip it.
+
+TUVI_WARMUP = os.environ.get('TUVI_WARMUP', '1') == '1'
+
+# Number of years around the current year whose lunar calendar is warmed up.
+TUVI_WARMUP_YEARS = int(os.environ.get('TUVI_WARMUP_YEARS', '1'))
+
+# Lunar calendar index for UTC+7, memory mapped so every worker shares one copy.
+# Built by `python manage.py build_lunar_table`, built in memory by every process when the file is missing.
+TUVI_LUNAR_TABLE_PATH = os.environ.get('TUVI_LUNAR_TABLE_PATH', BASE_DIR / 'lunar_table.bin')
+TUVI_LUNAR_TABLE_YEARS = (1899, 2100)
+# Timezones whose tables are installed at warmup, shared by the forked workers: Vietnam, China and Korea.
+# Build them with `build_lunar_table --timezone 8` and so on. The table of any other timezone is loaded from
+# next to TUVI_LUNAR_TABLE_PATH, or built in memory, on first use.
+TUVI_LUNAR_TIMEZONES = (7, 8, 9)
+
+# New moon ephemeris of these years, memory mapped like the lunar table.
+# Also built by `python manage.py build_lunar_table`. Other years fall back to the series.
+TUVI_NEW_MOON_PATH = os.environ.get('TUVI_NEW_MOON_PATH', BASE_DIR / 'new_moons.bin')
+TUVI_NEW_MOON_YEARS = (1800, 2200)
+
+# Inverted index of the natal charts, memory mapped like the lunar table. Built by `python manage.py natal_index --build`.
+TUVI_NATAL_INDEX_PATH = os.environ.get('TUVI_NATAL_INDEX_PATH', BASE_DIR / 'natal_index.bin')
+
+# New sizes of the memoization caches of `core`, applied when the app is loaded, as {pattern: maxsize}, e.g.
+# {'*.an_sao': 512, 'core.utils.DateUtil._new_moon_series_cached': 4096}. See `python manage.py caches` to size them,
+# and /caches/ (staff only) for the caches of the running workers.
+TUVI_CACHE_SIZES = {}
+
+# Freeze the garbage collector after warmup, so a `gunicorn --preload` master forks workers with shared pages.
+TUVI_GC_FREEZE = os.environ.get('TUVI_GC_FREEZE', '1') == '1'
+
+
+# Logging
+# https://docs.djangoproject.com/en/4.1/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'tuvi': {
+            'handlers': ['console'],
+            'level': os.environ.get('TUVI_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
+
+
+# Chart store
+# Keep the rendered PNG next to each stored chart, so repeated requests skip rendering as well.
+
+TUVI_STORE_IMAGES = os.environ.get('TUVI_STORE_IMAGES', '1') == '1'
+
+
+# Permalinks
+# Rendered images are cached by permalink digest. Permalink responses never change, so clients may keep them for a year.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('TUVI_IMAGE_CACHE_ENTRIES', '512')),
+        },
+    }
+}
+
+TUVI_IMAGE_CACHE_TIMEOUT = 3600
+# Permalinks are served as immutable for this long. Every visit to a permalink records its chart as used,
+# and `prune_charts` only deletes the charts not used for --days days, so the links in use keep working.
+TUVI_PERMALINK_MAX_AGE = 31536000
+
+
+# Admission control
+# Every worker renders at most TUVI_MAX_CONCURRENT_RENDERS charts at once and every client may start
+# TUVI_RENDER_RATE renders per second, in bursts of up to TUVI_RENDER_BURST. Cache hits are not limited.
+# Keep one render per process: charts write the brightness of the stars in class attributes, concurrent
+# renders in one process would corrupt each other. Scale with processes (gunicorn --workers) instead.
+
+TUVI_MAX_CONCURRENT_RENDERS = int(os.environ.get('TUVI_MAX_CONCURRENT_RENDERS', '1'))
+TUVI_RENDER_QUEUE_TIMEOUT = float(os.environ.get('TUVI_RENDER_QUEUE_TIMEOUT', '2'))
+TUVI_RENDER_RATE = float(os.environ.get('TUVI_RENDER_RATE', '0.5'))
+TUVI_RENDER_BURST = int(os.environ.get('TUVI_RENDER_BURST', '10'))
+TUVI_RATE_LIMIT_CLIENTS = 10000
+# Number of proxies in front of gunicorn appending to X-Forwarded-For, e.g. 1 behind the hosting load balancer.
+# Required behind a proxy, with 0 the client is REMOTE_ADDR and every user shares the proxy's bucket.
+TUVI_TRUSTED_PROXIES = int(os.environ.get('TUVI_TRUSTED_PROXIES', '0'))
+
+
+# Lunar calendar
+# Pages of a given month never change, let clients and proxies keep them for a day.
+
+TUVI_CALENDAR_MAX_AGE = 86400
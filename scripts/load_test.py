@@ -0,0 +1,141 @@
+"""
+Load test the chart form with legitimate clients, alone and next to a flood from a single client.
+
+Every legitimate client has its own address and submits a chart every `--interval` seconds, mostly charts
+somebody asked for before (served from the cache or the chart store) and sometimes a new one. The flood
+submits new charts as fast as `--flood-threads` threads can, all from one address.
+The script reports the latency of the legitimate requests and the status codes of both.
+
+Start the server with the addresses taken from X-Forwarded-For, then run from the repository root:
+
+    TUVI_TRUSTED_PROXIES=1 gunicorn horoscope.wsgi -k gthread --threads 8 --preload
+    python scripts/load_test.py --url http://127.0.0.1:8000/ --duration 20
+"""
+
+import argparse
+import http.cookiejar
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from typing import Dict, List, Tuple
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Client:
+    def __init__(self, url: str, address: str) -> None:
+        self.url = url
+        self.address = address
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+        self.csrf_token = None
+
+
+    def request(self, data: Dict[str, str] = None) -> Tuple[int, bytes]:
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.url, body, headers={'X-Forwarded-For': self.address, 'Referer': self.url})
+        try:
+            with self.opener.open(request, timeout=60) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+    def submit(self, chart: Dict[str, str]) -> int:
+        if self.csrf_token is None:
+            _, body = self.request()
+            self.csrf_token = CSRF_TOKEN.search(body.decode()).group(1)
+        status, _ = self.request(dict(chart, csrfmiddlewaretoken=self.csrf_token))
+        return status
+
+
+def random_chart(rng: random.Random) -> Dict[str, str]:
+    return {
+        'name': f'Load test {rng.randrange(10 ** 9)}',
+        'gender': rng.choice('MF'),
+        'year': str(rng.randint(1950, 2010)),
+        'month': str(rng.randint(1, 12)),
+        'day': str(rng.randint(1, 28)),
+        'hour': str(rng.randint(0, 23)),
+        'minute': str(rng.randint(0, 59)),
+        'cur_year': '2024',
+    }
+
+
+def legitimate_client(client: Client, popular: List[Dict[str, str]], interval: float, new_ratio: float, seed: int, stop: threading.Event, latencies: List[float], statuses: Counter) -> None:
+    rng = random.Random(seed)
+    while not stop.is_set():
+        chart = random_chart(rng) if rng.random() < new_ratio else rng.choice(popular)
+        start = time.perf_counter()
+        status = client.submit(chart)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] += 1
+        stop.wait(interval)
+
+
+def flood_client(client: Client, seed: int, stop: threading.Event, statuses: Counter) -> None:
+    rng = random.Random(seed)
+    while not stop.is_set():
+        statuses[client.submit(random_chart(rng))] += 1
+
+
+def percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_phase(args: argparse.Namespace, popular: List[Dict[str, str]], flood: bool) -> None:
+    stop = threading.Event()
+    latencies, statuses, flood_statuses = [], Counter(), Counter()
+
+    threads = [
+        threading.Thread(target=legitimate_client, args=(Client(args.url, f'10.0.0.{i + 1}'), popular, args.interval, args.new_ratio, args.seed + i, stop, latencies, statuses))
+        for i in range(args.clients)
+    ]
+    if flood:
+        threads += [
+            threading.Thread(target=flood_client, args=(Client(args.url, '10.0.1.1'), args.seed + 1000 + i, stop, flood_statuses))
+            for i in range(args.flood_threads)
+        ]
+
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f'{"flood" if flood else "baseline"}:')
+    print(f'  legitimate: {len(latencies)} requests, p50={percentile(latencies, 0.5) * 1000:.0f}ms p95={percentile(latencies, 0.95) * 1000:.0f}ms p99={percentile(latencies, 0.99) * 1000:.0f}ms, status {dict(statuses)}')
+    if flood:
+        print(f'  flood: {sum(flood_statuses.values())} requests, status {dict(flood_statuses)}')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000/')
+    parser.add_argument('--duration', type=float, default=20, help='seconds per phase')
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds between the requests of a legitimate client')
+    parser.add_argument('--new-ratio', type=float, default=0.2, help='share of legitimate requests for a new chart')
+    parser.add_argument('--flood-threads', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    popular = [random_chart(rng) for _ in range(20)]
+
+    # Store the popular charts first, so both phases see the same hit rate
+    for i, chart in enumerate(popular):
+        Client(args.url, f'10.0.2.{i + 1}').submit(chart)
+
+    run_phase(args, popular, flood=False)
+    run_phase(args, popular, flood=True)
+
+
+if __name__ == '__main__':
+    main()
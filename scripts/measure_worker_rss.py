@@ -0,0 +1,105 @@
+"""
+Measure the unique memory of preforked workers, the way `gunicorn --preload` runs them.
+
+The master loads the lunar table and warms the chart code, then forks the workers. Every worker converts dates
+over the whole table range and renders a chart, then reports its unique set size (private clean + private dirty
+pages, i.e. what the worker does not share with the master).
+
+Run from the repository root:
+
+    python scripts/measure_worker_rss.py                # before (lists, no gc.freeze) and after (flat, gc.freeze)
+    python scripts/measure_worker_rss.py --layout flat --workers 8 --freeze
+
+Linux only, it reads /proc/<pid>/smaps_rollup.
+"""
+
+import argparse
+import gc
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.date import Date
+from core.main import LaSoTuVi
+from core.tables import LunarTable
+from core.utils import DateUtil
+
+
+def unique_set_size_kb(pid: int) -> int:
+    total = 0
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith(('Private_Clean:', 'Private_Dirty:')):
+                total += int(line.split()[1])
+    return total
+
+
+def prepare_master(table_path: str, layout: str, freeze: bool) -> None:
+    table = LunarTable.load_or_build(table_path, 1899, 2100)
+    if layout == 'list':
+        # What the table costs when it is kept in ordinary Python containers
+        table = LunarTable(table.timezone, table.first_year, table.last_year, table.k_start, list(table.month_starts), list(table.month_11), list(table.leap_offsets))
+    LunarTable.install(table)
+
+    LaSoTuVi(2000, 1, 1, 12, 0, gender=1).get_image()
+    if freeze:
+        gc.freeze()
+
+
+def worker(write_fd: int) -> None:
+    for year in range(1900, 2100):
+        for month in range(1, 13):
+            DateUtil.solar_to_lunar(Date(year, month, 15))
+    LaSoTuVi(1995, 11, 22, 10, 30, gender=-1).get_image()
+    gc.collect()
+
+    os.write(write_fd, f'{unique_set_size_kb(os.getpid())}\n'.encode())
+    os._exit(0)
+
+
+def measure(table_path: str, layout: str, freeze: bool, workers: int) -> None:
+    prepare_master(table_path, layout, freeze)
+
+    sizes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            worker(write_fd)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            sizes.append(int(f.read()))
+        os.waitpid(pid, 0)
+
+    print(f'layout={layout} freeze={freeze} master_uss={unique_set_size_kb(os.getpid())} kB')
+    for i, size in enumerate(sizes):
+        print(f'  worker {i}: {size} kB unique')
+    print(f'  mean: {sum(sizes) / len(sizes):.0f} kB unique per worker, {sum(sizes)} kB for {workers} workers')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--layout', choices=['list', 'flat'])
+    parser.add_argument('--freeze', action='store_true')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--table', default='lunar_table.bin')
+    args = parser.parse_args()
+
+    if args.layout is not None:
+        measure(args.table, args.layout, args.freeze, args.workers)
+        return
+
+    # Each configuration runs in a fresh interpreter, so they do not share warm pages
+    for layout, freeze in [('list', False), ('flat', True)]:
+        command = [sys.executable, __file__, '--layout', layout, '--workers', str(args.workers), '--table', args.table]
+        if freeze:
+            command.append('--freeze')
+        subprocess.run(command, check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Profile the stars of one chart: time, cache hit and nested `an_sao` calls of every star class.
+
+    python scripts/profile_chart.py 1990 5 17 8 30 [--gender 1] [--cur-year 2024] [--warm] [--json report.json] [--folded chart.folded]
+
+By default the star caches are cleared first, so every star is computed. With `--warm`, the chart is built once before,
+to see a chart served from the caches. `--folded` writes the calls as folded stacks for flame graph tools, e.g.
+`flamegraph.pl chart.folded > chart.svg`.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.main import LaSoTuVi
+from core.profiling import StarProfiler
+from core.tuvi.stars.sao import SaoRegistry
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for field in ('year', 'month', 'day', 'hour', 'minute'):
+        parser.add_argument(field, type=int)
+    parser.add_argument('--gender', type=int, default=1)
+    parser.add_argument('--cur-year', type=int, default=2024)
+    parser.add_argument('--warm', action='store_true')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--json')
+    parser.add_argument('--folded')
+    args = parser.parse_args()
+
+    def chart():
+        return LaSoTuVi(args.year, args.month, args.day, args.hour, args.minute, gender=args.gender, cur_year=args.cur_year)
+
+    if args.warm:
+        chart()
+    else:
+        for sao in SaoRegistry.get_subclasses():
+            sao.an_sao.cache_clear()
+
+    with StarProfiler() as profiler:
+        chart()
+
+    report = profiler.report()
+    print(f'{"star":<24} {"calls":>5} {"hits":>5} {"total us":>10} {"self us":>10}  nested')
+    for star in report[:args.top]:
+        nested = ', '.join(f'{name} x{count}' if count > 1 else name for name, count in star['nested'].items())
+        print(f'{star["star"]:<24} {star["calls"]:>5} {star["hits"]:>5} {star["total_us"]:>10.1f} {star["self_us"]:>10.1f}  {nested}')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'stars': report, 'calls': [call.to_dict() for call in profiler.calls]}, f, indent=2, ensure_ascii=False)
+    if args.folded:
+        profiler.save_folded(args.folded)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import random
+import unittest
+
+from benchmarks.runner import Case, percentile, random_birthdates, run_case
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    def test_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.assertEqual(percentile(values, 0.5), 3.0)
+        self.assertEqual(percentile(values, 0.95), 4.8)
+        self.assertEqual(percentile([7.0], 0.95), 7.0)
+
+
+    def test_fixed_seed(self):
+        self.assertEqual(random_birthdates(random.Random(1), 50), random_birthdates(random.Random(1), 50))
+        self.assertTrue(all(1920 <= date.year <= 2020 for date in random_birthdates(random.Random(1), 200)))
+
+
+    def test_run_case(self):
+        calls = []
+        prepared = []
+        case = Case([lambda i=i: calls.append(i) for i in range(10)], prepare=lambda: prepared.append(1), warmup=False)
+        stats = run_case(case)
+
+        self.assertEqual(calls, list(range(10)))
+        self.assertEqual(len(prepared), 10)
+        self.assertEqual(stats['n'], 10)
+        self.assertLessEqual(stats['p50_us'], stats['p95_us'])
+        self.assertGreater(stats['ops_per_sec'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from core import draw, main
+from core.caches import CacheRegistry, cached
+from core.mixins import DateMixin
+from core.tuvi.stars.sao import SaoHoaQuyen
+
+
+@cached(maxsize=4)
+def square(x: int) -> int:
+    return x * x
+
+
+class Holder:
+    @staticmethod
+    @cached(maxsize=4)
+    def cube(x: int) -> int:
+        return x ** 3
+
+
+    @staticmethod
+    @cached(maxsize=4)
+    def double(x: int) -> int:
+        return 2 * x
+
+
+class TestCacheRegistry(unittest.TestCase):
+    def test_registered(self):
+        names = CacheRegistry.names()
+        for name in ['core.utils.DateUtil._new_moon_series_cached', 'core.mixins.DateMixin.days_of_month', 'core.localizer.VNLocalizer._localize',
+                     'core.utils.NguHanhUtil.arrays', 'core.tuvi.stars.sao.SaoHoaQuyen.an_sao', 'core.draw.get_font']:
+            self.assertIn(name, names)
+        self.assertIs(CacheRegistry.get('core.tuvi.stars.sao.SaoHoaQuyen.an_sao'), SaoHoaQuyen.an_sao)
+        self.assertEqual(len(CacheRegistry.names('*.an_sao')), 129)
+
+
+    def test_stats_and_clear(self):
+        name = f'{__name__}.Holder.cube'
+        CacheRegistry.clear(name)
+        for x in [1, 2, 2, 3]:
+            Holder.cube(x)
+
+        stats, = CacheRegistry.stats(name)
+        self.assertEqual((stats.hits, stats.misses, stats.size, stats.maxsize), (1, 3, 3, 4))
+        self.assertEqual(stats.hit_rate, 0.25)
+        self.assertGreater(stats.bytes, CacheRegistry.stats(name, memory=False)[0].bytes)
+
+        self.assertEqual(CacheRegistry.clear(name), 1)
+        self.assertEqual(Holder.cube.cache_info().currsize, 0)
+
+
+    def test_resize(self):
+        self.assertEqual(CacheRegistry.resize(f'{__name__}.Holder.double', 100), 1)
+        self.assertEqual(Holder.double.cache_info().maxsize, 100)
+        self.assertEqual(Holder.double(2), 4)
+        self.assertIs(CacheRegistry.get(f'{__name__}.Holder.double'), Holder.double)
+
+        # Module level functions are replaced in the modules which imported them too
+        old = square
+        CacheRegistry.resize(f'{__name__}.square', None)
+        self.assertIsNot(globals()['square'], old)
+        self.assertIsNone(globals()['square'].cache_info().maxsize)
+
+        get_font = draw.get_font
+        CacheRegistry.resize('core.draw.get_font', None)
+        self.assertIs(main.get_font, draw.get_font)
+        self.assertIsNot(draw.get_font, get_font)
+
+
+    def test_memory(self):
+        DateMixin.days_of_month.cache_clear()
+        empty = CacheRegistry.stats('core.mixins.DateMixin.days_of_month')[0].bytes
+        for month in range(1, 13):
+            DateMixin.days_of_month(month)
+        self.assertGreater(CacheRegistry.stats('core.mixins.DateMixin.days_of_month')[0].bytes, empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from core.calendar import CalendarUtil
+from core.date import Date
+from core.utils import DateUtil, ZodiacUtil
+
+
+class TestCalendar(unittest.TestCase):
+    def test_month_grid(self):
+        grid = CalendarUtil.month_grid(2023, 3)
+        self.assertEqual(len(grid), 42)
+        self.assertEqual(grid[0].solar, Date(2023, 2, 27))
+        self.assertEqual([cell.weekday for cell in grid[:7]], [1, 2, 3, 4, 5, 6, 0])
+        self.assertEqual(sum(cell.in_month for cell in grid), 31)
+
+        for cell in grid:
+            self.assertEqual(Date(cell.lunar_year, cell.lunar_month, cell.lunar_day), DateUtil.solar_to_lunar(cell.solar))
+            self.assertEqual(cell.can_chi, ZodiacUtil.zodiac_day_tuple(cell.solar))
+
+        # 2023 has a leap 2nd lunar month, starting on March 22nd
+        first_days = [cell for cell in grid if cell.first_of_lunar_month]
+        self.assertEqual([(cell.solar, cell.lunar_month, cell.leap) for cell in first_days], [(Date(2023, 3, 22), 2, True)])
+
+
+    def test_month_grid_first_weekday(self):
+        grid = CalendarUtil.month_grid(2023, 10, first_weekday=0)
+        self.assertEqual(grid[0].solar, Date(2023, 10, 1))
+        self.assertIs(grid, CalendarUtil.month_grid(2023, 10, first_weekday=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
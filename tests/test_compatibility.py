@@ -0,0 +1,66 @@
+import unittest
+
+from core.compatibility import Compatibility, CompatibilityUtil, CompatibilityWeights
+from core.date import SolarDate
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestCompatibility(unittest.TestCase):
+    def test_year_code(self):
+        self.assertEqual(CompatibilityUtil.year_code(1984), 0)
+        self.assertEqual(CompatibilityUtil.year_code(1990), 6)
+        # Before the Tet of 1990, still a Ky Ti year
+        self.assertEqual(CompatibilityUtil.year_code_of_birth(SolarDate(1990, 1, 20)), 5)
+
+
+    def test_compare(self):
+        canh_ngo, tan_mui, giap_ti = CompatibilityUtil.year_code(1990), CompatibilityUtil.year_code(1991), CompatibilityUtil.year_code(1984)
+        # Lo Bang Tho both, Canh and Tan both Kim
+        self.assertEqual(CompatibilityUtil.compare(canh_ngo, tan_mui), Compatibility(3.0, 'binh hoa', '', 'luc hop'))
+        # Hai Trung Kim and Lo Bang Tho, Giap Moc and Canh Kim
+        self.assertEqual(CompatibilityUtil.compare(giap_ti, canh_ngo), Compatibility(-1.0, 'tuong sinh', 'tuong khac', 'luc xung'))
+        self.assertEqual(CompatibilityUtil.compare(giap_ti, canh_ngo, CompatibilityWeights(chi_luc_xung=-5)).score, -4.0)
+        self.assertEqual(CompatibilityUtil.compare(giap_ti, CompatibilityUtil.year_code(1989)).can, 'hop')
+        self.assertEqual(CompatibilityUtil.compare(giap_ti, CompatibilityUtil.year_code(1992)).chi, 'tam hop')
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_matrices(self):
+        for matrix in CompatibilityUtil.relations() + (CompatibilityUtil.scores(),):
+            self.assertEqual(matrix.shape, (60, 60))
+            self.assertTrue((matrix == matrix.T).all())
+
+        codes = numpy.array([0, 6, 7, 59, 6])
+        scores = CompatibilityUtil.score_many(6, codes)
+        self.assertEqual(scores.tolist(), [CompatibilityUtil.compare(6, code).score for code in codes.tolist()])
+        matrix = CompatibilityUtil.score_matrix(codes[:2], codes)
+        self.assertEqual(matrix.shape, (2, 5))
+        self.assertEqual(matrix[1].tolist(), scores.tolist())
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_top_k(self):
+        codes = numpy.random.default_rng(0).integers(0, 60, 1000)
+        scores = CompatibilityUtil.score_many(17, codes)
+        expected = sorted(range(len(codes)), key=lambda i: (-scores[i], i))[:25]
+
+        indices, top_scores = CompatibilityUtil.top_k(17, codes, 25)
+        self.assertEqual(indices.tolist(), expected)
+        self.assertEqual(top_scores.tolist(), scores[expected].tolist())
+        self.assertEqual(len(CompatibilityUtil.top_k(17, codes[:3], 25)[0]), 3)
+        self.assertEqual(len(CompatibilityUtil.top_k(17, codes, 0)[0]), 0)
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_year_codes_of_births(self):
+        births = [(1990, 1, 20), (1990, 1, 30), (2024, 2, 10), (1984, 12, 31)]
+        years, months, days = (numpy.array(column) for column in zip(*births))
+        self.assertEqual(CompatibilityUtil.year_codes_of_births(years, months, days).tolist(), [CompatibilityUtil.year_code_of_birth(SolarDate(*birth)) for birth in births])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,9 @@
+import pickle
 import unittest
 
-from core.date import Date
-from core.utils import DateUtil
+from core.date import Date, SolarDate
+from core.exceptions import InvalidDateException
+from core.utils import DateUtil, ZodiacUtil
 
 
 class TestDate(unittest.TestCase):
@@ -17,6 +19,19 @@ class TestDate(unittest.TestCase):
         self.assertAlmostEqual(DateUtil.jd_from_date(Date(-1000, 2, 29)), 1355866.5)
 
 
+    def test_julian_day_number(self):
+        self.assertEqual(DateUtil.jdn_from_ymd(2000, 1, 1), 2451545)
+        self.assertEqual(DateUtil.jdn_from_ymd(1582, 10, 4), 2299160)
+        self.assertEqual(DateUtil.jdn_from_ymd(1582, 10, 15), 2299161)
+        self.assertEqual(DateUtil.jdn_from_ymd(-1000, 2, 29), 1355867)
+        self.assertEqual(DateUtil.ymd_from_jdn(2299160), (1582, 10, 4))
+        self.assertEqual(DateUtil.ymd_from_jdn(2299161), (1582, 10, 15))
+
+        for jdn in range(0, 2600000, 997):
+            self.assertEqual(DateUtil.jdn_from_ymd(*DateUtil.ymd_from_jdn(jdn)), jdn)
+            self.assertEqual(DateUtil.jd_from_date(Date(*DateUtil.ymd_from_jdn(jdn))), jdn - 0.5)
+
+
     def test_leap_year(self):
         self.assertEqual(DateUtil.is_leap_year(Date(2000, 3, 5)), True)
         self.assertEqual(DateUtil.is_leap_year(Date(2002, 3, 5)), False)
@@ -116,6 +131,14 @@ class TestDate(unittest.TestCase):
         self.assertEqual(DateUtil.solar_to_lunar(Date(1990, 7, 10)), Date(1990, 5, 18))
 
 
+    def test_fractional_timezone(self):
+        # The new moon of January 2023 is at 20:53 UT, i.e. 23:53 on the 21st at UTC+3 but 00:23 on the 22nd at UTC+3:30
+        self.assertEqual(DateUtil.solar_to_lunar(Date(2023, 1, 21), 3), Date(2023, 1, 1))
+        self.assertEqual(DateUtil.solar_to_lunar(Date(2023, 1, 21), 3.5), Date(2022, 12, 30))
+        self.assertEqual(DateUtil.solar_to_lunar(Date(2023, 1, 22), 5.5), Date(2023, 1, 1))
+        self.assertEqual(DateUtil.lunar_to_solar(Date(2022, 12, 30), 3.5), Date(2023, 1, 21))
+
+
     def test_lunar_to_solar(self):
         # 1st batch
         self.assertEqual(DateUtil.lunar_to_solar(Date(2023, 4, 26)), Date(2023, 6, 13))
@@ -145,5 +168,88 @@ class TestDate(unittest.TestCase):
         self.assertEqual(DateUtil.lunar_to_solar(Date(2014, 3, 5)), Date(2014, 4, 4))
 
 
+    def test_date_is_immutable(self):
+        date = Date(2023, 6, 13)
+        with self.assertRaises(AttributeError):
+            date.year = 2024
+        with self.assertRaises(AttributeError):
+            date.extra = 1
+
+
+    def test_date_ordering(self):
+        self.assertLess(Date(-1000, 2, 29), Date(-999, 1, 1))
+        self.assertLess(Date(2023, 6, 13, 23, 59, 59), Date(2023, 6, 14))
+        self.assertGreater(Date(2023, 7, 1), Date(2023, 6, 30, 12))
+        self.assertEqual(Date(2023, 6, 13), SolarDate(2023, 6, 13))
+        self.assertEqual(hash(Date(2023, 6, 13)), hash(SolarDate(2023, 6, 13)))
+        self.assertEqual(sorted([Date(2001, 1, 1), Date(1999, 12, 31), Date(2000, 6, 1)]), [Date(1999, 12, 31), Date(2000, 6, 1), Date(2001, 1, 1)])
+
+
+    def test_empty_hms(self):
+        date = Date(2023, 6, 13, 10, 30)
+        self.assertEqual(date.empty_hms(), Date(2023, 6, 13))
+        self.assertEqual(hash(date.empty_hms()), hash(Date(2023, 6, 13)))
+        midnight = Date(2023, 6, 13)
+        self.assertIs(midnight.empty_hms(), midnight)
+
+
+    def test_tuple_protocol(self):
+        date = SolarDate(2024, 2, 10, 8, 30)
+        self.assertEqual(tuple(date), (2024, 2, 10, 8, 30, 0))
+        year, month, day, hour, minute, second = date
+        self.assertEqual((year, minute), (2024, 30))
+        self.assertEqual(date._asdict()['day'], 10)
+        self.assertNotIn(date.ordinal, date)
+        self.assertEqual('%s' % (date,), str(date))
+        self.assertEqual('%s %s %s %s %s %s' % tuple(date), '2024 2 10 8 30 0')
+        # Not a tuple: nothing but the six fields shows through
+        self.assertNotIsInstance(date, tuple)
+        with self.assertRaises(TypeError):
+            date + (1,)
+        with self.assertRaises(TypeError):
+            len(date)
+        self.assertEqual(pickle.loads(pickle.dumps(date)), date)
+        self.assertIsInstance(pickle.loads(pickle.dumps(date)), SolarDate)
+
+        # The ordinal follows the new fields
+        replaced = date._replace(day=11)
+        self.assertIsInstance(replaced, SolarDate)
+        self.assertEqual(replaced, SolarDate(2024, 2, 11, 8, 30))
+        self.assertEqual(hash(replaced), hash(SolarDate(2024, 2, 11, 8, 30)))
+        self.assertLess(date, replaced)
+        self.assertEqual(Date._make((2024, 2, 11, 8, 30, 0)), replaced)
+        with self.assertRaises(ValueError):
+            date._replace(ordinal=0)
+        with self.assertRaises(InvalidDateException):
+            date._replace(month=16)
+
+
+    def test_invalid_date(self):
+        for fields in [(2000, 13, 1), (2000, 0, 1), (2000, 1, 0), (2000, 1, 32), (2000, 1, 1, 24), (2000, 1, 1, 31),
+                       (2000, 1, 1, -1), (2000, 1, 1, 0, 60), (2000, 1, 1, 0, 0, 60), (2000, 1, 1, 0, 0, -1)]:
+            with self.assertRaises(InvalidDateException, msg=fields):
+                Date(*fields)
+        self.assertEqual(str(Date(-1, 12, 31, 23, 59, 59)), 'December 31st, -1 23:59:59')
+
+
+    def test_solar_to_lunar_late_new_moon(self):
+        # The new moon is later than the mean lunation, the day still belongs to the previous month
+        self.assertEqual(DateUtil.solar_to_lunar(Date(1913, 4, 6)), Date(1913, 2, 30))
+        self.assertEqual(DateUtil.solar_to_lunar(Date(1913, 4, 7)), Date(1913, 3, 1))
+
+
+    def test_iter_days(self):
+        days = list(DateUtil.iter_days(Date(2022, 12, 1), Date(2023, 3, 31)))
+        self.assertEqual(len(days), 121)
+
+        for solar, lunar, can_chi, weekday in days:
+            self.assertEqual(lunar, DateUtil.solar_to_lunar(solar))
+            self.assertEqual(can_chi, ZodiacUtil.zodiac_day_tuple(solar))
+            self.assertEqual(['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'][weekday], DateUtil.get_day_of_the_week(solar))
+
+        self.assertEqual([solar for solar, _, _, _ in DateUtil.iter_days(Date(1582, 10, 3), Date(1582, 10, 16))], [Date(1582, 10, 3), Date(1582, 10, 4), Date(1582, 10, 15), Date(1582, 10, 16)])
+        self.assertEqual(list(DateUtil.iter_days(Date(2023, 1, 2), Date(2023, 1, 1))), [])
+
+
 if __name__ == '__main__':
     unittest.main()
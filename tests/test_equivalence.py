@@ -0,0 +1,94 @@
+import unittest
+
+from core.date import SolarDate
+from core.tables import LunarTable, NewMoonEphemeris
+from core.utils import DateUtil
+from equivalence import reference
+from equivalence.engines import Engine, ReferenceEngine, get_engine
+from equivalence.harness import Options, births, run
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ShiftedEngine(ReferenceEngine):
+    """
+    Wrong on the 1st of every lunar month, which it says is the 2nd.
+    """
+
+    def lunar_days(self, jdns, timezone):
+        return [(year, month, 2 if day == 1 else day, leap) for year, month, day, leap in super().lunar_days(jdns, timezone)]
+
+
+class TestEquivalence(unittest.TestCase):
+    def tearDown(self):
+        # Leave no table installed by the engines behind
+        NewMoonEphemeris.uninstall()
+        for timezone in (7, 5.5):
+            LunarTable.uninstall(timezone)
+
+
+    def test_tables(self):
+        report = run(Options(candidate='tables', first_year=1901, last_year=1901, star_rate=0.01), processes=1, log=lambda line: None)
+        self.assertEqual(report['mismatch_count'], 0)
+        self.assertEqual(report['checks']['lunar_to_solar'], 365)
+        self.assertGreater(report['checks']['stars'], 0)
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_arrays(self):
+        report = run(Options(candidate='arrays', first_year=2033, last_year=2033, timezone=5.5, star_rate=0), processes=1, log=lambda line: None)
+        self.assertEqual(report['mismatch_count'], 0)
+
+
+    def test_mismatches(self):
+        report = run(Options(candidate=f'{__name__}:ShiftedEngine', first_year=2000, last_year=2000, star_rate=0, max_mismatches=3), processes=1, shard_days=100, log=lambda line: None)
+        # 13 lunar months start in 2000, from January 7th to December 27th
+        self.assertEqual(report['mismatch_count'], 13)
+        first = report['mismatches'][0]
+        self.assertEqual((first['check'], first['field'], first['reference'], first['candidate']), ('solar_to_lunar', 'day', 1, 2))
+        self.assertEqual(first['repro'], 'DateUtil.lunar_month_of_jdn(2451551, 2000, 7)  # SolarDate(2000, 1, 7)')
+        self.assertTrue(first['isolated'])
+        self.assertEqual(len(report['mismatches']), 3)
+
+
+    def test_reference(self):
+        # Tet 2023 on January 22nd, and the leap 2nd month of 2023 from March 22nd
+        self.assertEqual(reference.solar_to_lunar(DateUtil.jdn_from_ymd(2023, 1, 22)), (2023, 1, 1, False))
+        self.assertEqual(reference.solar_to_lunar(DateUtil.jdn_from_ymd(2023, 3, 22)), (2023, 2, 1, True))
+        self.assertEqual(reference.lunar_to_solar(2023, 2, 1, True), DateUtil.jdn_from_ymd(2023, 3, 22))
+        # A day the old code gave as day 0
+        self.assertEqual(reference.solar_to_lunar(DateUtil.jdn_from_ymd(1806, 4, 18)), (1806, 2, 30, False))
+        with self.assertRaises(ValueError):
+            reference.lunar_to_solar(2024, 2, 1, True)
+
+
+    def test_stars(self):
+        engine = ReferenceEngine()
+        engine.setup(2000, 2000, 7)
+        birthdate = SolarDate(1990, 5, 17, 8, 0)
+        stars = engine.stars(birthdate, 2024, 1)
+        self.assertTrue(any(trang_thai is not None for _, trang_thai in stars))
+        # The trang thai does not depend on the births placed before, whose stars are still cached
+        engine.stars(SolarDate(1975, 9, 9, 14, 0), 2024, -1)
+        self.assertEqual(engine.stars(birthdate, 2024, 1), stars)
+
+
+    def test_births(self):
+        jdns = list(range(2451545, 2451555))
+        self.assertEqual(len(births(jdns, Options(star_rate=1))), 10 * 12 * 2)
+        # The sample of a day does not depend on the other days of its shard
+        self.assertEqual(births(jdns, Options(star_rate=0.1))[-3:], births(jdns[5:], Options(star_rate=0.1))[-3:])
+
+
+    def test_get_engine(self):
+        self.assertIsInstance(get_engine('reference'), ReferenceEngine)
+        self.assertIsInstance(get_engine(f'{__name__}:ShiftedEngine'), Engine)
+        with self.assertRaises(ValueError):
+            get_engine('nope')
+
+
+if __name__ == '__main__':
+    unittest.main()
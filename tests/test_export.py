@@ -0,0 +1,95 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from core import export
+from core.export import ColumnarWriter, chart_row, read_columns
+from core.main import LaSoTuVi
+
+
+BIRTHS = [
+    (1995, 11, 22, 10, 30, 1),
+    (1988, 6, 1, 23, 15, -1),
+    (1975, 9, 9, 14, 45, 1),
+    (2002, 8, 16, 10, 30, -1),
+    (1991, 7, 3, 5, 50, -1),
+]
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestColumnarWriter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'charts')
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def write(self, **kwargs):
+        charts = []
+        with ColumnarWriter(self.path, **kwargs) as writer:
+            for year, month, day, hour, minute, gender in BIRTHS:
+                chart = LaSoTuVi(year, month, day, hour, minute, gender=gender, cur_year=2024)
+                writer.add(chart_row(chart))
+                charts.append(chart.to_dict())
+        return writer, charts
+
+
+    def test_npz(self):
+        writer, charts = self.write(batch_size=2, format='npz')
+        self.assertEqual(writer.rows, 5)
+        self.assertEqual(sorted(os.listdir(self.path)), ['part-00000.npz', 'part-00001.npz', 'part-00002.npz', 'schema.json'])
+
+        arrays, schema = read_columns(self.path)
+        self.assertEqual(list(arrays), export.columns())
+        self.assertEqual(arrays['key'].dtype, numpy.dtype('S17'))
+        self.assertTrue(all(array.dtype == numpy.uint8 for name, array in arrays.items() if name != 'key'))
+
+        names = dict(schema['stars'])
+        for i, chart in enumerate(charts):
+            self.assertEqual(arrays['key'][i].decode(), chart['key'])
+            self.assertEqual(schema['menh'][arrays['menh'][i]], chart['menh'])
+            self.assertEqual(schema['cuc'][arrays['cuc'][i]], chart['cuc'])
+            self.assertEqual(arrays['cell_SaoTuan'][i], chart['tuan'])
+            self.assertTrue(chart['cells'][arrays['cung_menh'][i] - 1]['name'].startswith('MỆNH'))
+            self.assertTrue(chart['cells'][arrays['cung_than'][i] - 1]['name'].endswith('<THÂN>'))
+
+            placed = {
+                (names[star], cell_id, schema['trang_thai'][arrays[f'trang_thai_{star}'][i]])
+                for star in names for cell_id in [int(arrays[f'cell_{star}'][i])]
+            }
+            for cell in chart['cells']:
+                for name, trang_thai in cell['chinh_tinh'] + cell['phu_tinh_trai'] + cell['phu_tinh_phai']:
+                    self.assertIn((name, cell['id'], trang_thai), placed)
+
+
+    def test_menh_names(self):
+        names = export.menh_names()
+        self.assertEqual(len(set(names)), 30)
+        self.assertEqual((names[0], names[29]), ('Hải Trung Kim', 'Đại Hải Thuỷ'))
+
+
+    def test_existing_path(self):
+        os.makedirs(self.path)
+        with self.assertRaises(FileExistsError):
+            ColumnarWriter(self.path, format='npz')
+
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        self.path += '.parquet'
+        writer, charts = self.write(batch_size=2, format='parquet')
+        arrays, schema = read_columns(self.path)
+        self.assertEqual([key.decode() for key in arrays['key']], [chart['key'] for chart in charts])
+        self.assertEqual([schema['menh'][code] for code in arrays['menh']], [chart['menh'] for chart in charts])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from core.compatibility import CompatibilityUtil
+from core.date import Date, SolarDate
+from core.exceptions import InvalidDateException
+from core.gooddays import NGUYET_KY, TAM_NUONG, DayRules, GoodDayUtil
+from core.solarterms import SolarTermUtil
+from core.utils import DateUtil
+
+
+class TestGoodDays(unittest.TestCase):
+    def test_matches_day_by_day(self):
+        rules = DayRules(birth_year_code=CompatibilityUtil.year_code(1990), min_score=1, avoid_chi=(1, 7))
+        eves = set()
+        for year in (2024, 2025):
+            for term, date in SolarTermUtil.terms_of_year(year):
+                if term.value in (2, 5, 8, 11, 14, 17, 20, 23):
+                    eves.add(DateUtil.jdn_from_ymd(date.year, date.month, date.day) - 1)
+
+        expected = []
+        for solar, lunar, (can, chi), weekday in DateUtil.iter_days(SolarDate(2024, 11, 1), SolarDate(2025, 2, 28)):
+            code = (6 * (can - 1) - 5 * (chi - 1)) % 60
+            score = CompatibilityUtil.compare(rules.birth_year_code, code).score
+            if chi not in (1, 7) and score >= 1 and lunar.day not in TAM_NUONG + NGUYET_KY and DateUtil.jdn_from_ymd(solar.year, solar.month, solar.day) not in eves:
+                expected.append((solar, lunar.year, lunar.month, lunar.day, (can, chi), weekday, score))
+
+        days = GoodDayUtil.find(2024, 11, 2025, 2, rules)
+        self.assertTrue(days)
+        self.assertEqual([(day.solar, day.lunar_year, day.lunar_month, day.lunar_day, day.can_chi, day.weekday, day.score) for day in days], expected)
+
+
+    def test_rules(self):
+        days = GoodDayUtil.find(2025, 1, 2025, 12, DayRules(avoid_lunar_days=(), avoid_tu_ly_tu_tuyet=False))
+        self.assertEqual(len(days), 365)
+        self.assertIsNone(days[0].score)
+        # 2025 has a leap 6th lunar month, from July 25th
+        self.assertEqual(next(day for day in days if day.leap).solar, Date(2025, 7, 25))
+
+        # The eve of Lap xuan 2025, on February 3rd
+        days = GoodDayUtil.find(2025, 2, 2025, 2, DayRules(avoid_lunar_days=()))
+        self.assertNotIn(Date(2025, 2, 2), [day.solar for day in days])
+        self.assertEqual(len(days), 27)
+
+        with self.assertRaises(InvalidDateException):
+            GoodDayUtil.find(2025, 1, 2025, 13)
+        with self.assertRaises(ValueError):
+            GoodDayUtil.find(2025, 1, 2025, 1, DayRules(avoid_chi=(13,)))
+
+
+if __name__ == '__main__':
+    unittest.main()
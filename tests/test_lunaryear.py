@@ -0,0 +1,77 @@
+import unittest
+
+from core.date import Date
+from core.exceptions import InvalidDateException
+from core.lunaryear import LunarYearUtil
+from core.utils import DateUtil
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestLunarYear(unittest.TestCase):
+    def test_year_info(self):
+        info = LunarYearUtil.year_info(2023)
+        self.assertEqual(DateUtil.ymd_from_jdn(info.month_starts[0]), (2023, 1, 22))
+        self.assertEqual(DateUtil.ymd_from_jdn(info.month_starts[-1]), (2024, 2, 10))
+        self.assertEqual((info.leap_month, len(info.month_starts), info.length), (2, 14, 384))
+
+        info = LunarYearUtil.year_info(2024)
+        self.assertEqual((info.leap_month, len(info.month_starts), info.length), (0, 13, 354))
+
+        # The leap month of 2033 is the 11th, in the period after the 11th month of the year
+        self.assertEqual(LunarYearUtil.year_info(2033).leap_month, 11)
+
+
+    def test_month_start(self):
+        info = LunarYearUtil.year_info(2023)
+        self.assertEqual(DateUtil.ymd_from_jdn(info.month_start(2)), (2023, 2, 20))
+        self.assertEqual(DateUtil.ymd_from_jdn(info.month_start(2, leap=True)), (2023, 3, 22))
+        self.assertEqual(DateUtil.ymd_from_jdn(info.month_start(3)), (2023, 4, 20))
+        with self.assertRaises(InvalidDateException):
+            info.month_start(3, leap=True)
+        with self.assertRaises(InvalidDateException):
+            info.month_start(13)
+
+
+    def test_locate(self):
+        info = LunarYearUtil.year_info(2023)
+        jdn = DateUtil.jdn_from_ymd(2023, 4, 1)
+        month, leap, month_start, next_month_start = info.locate(jdn)
+        self.assertEqual((month, leap), (2, True))
+        self.assertEqual((month_start, next_month_start), (info.month_start(2, leap=True), info.month_start(3)))
+
+        with self.assertRaises(InvalidDateException):
+            info.locate(info.month_starts[-1])
+
+
+    def test_leap_month_conversions(self):
+        self.assertEqual(DateUtil.lunar_to_solar(Date(2023, 2, 10)), Date(2023, 3, 1))
+        self.assertEqual(DateUtil.lunar_to_solar(Date(2023, 2, 10), leap=True), Date(2023, 3, 31))
+        self.assertEqual(DateUtil.lunar_to_solar(Date(2033, 11, 1), leap=True), Date(2033, 12, 22))
+        self.assertEqual(DateUtil.solar_to_lunar(Date(2023, 3, 31)), Date(2023, 2, 10))
+
+
+    def test_precompute(self):
+        infos = LunarYearUtil.precompute(1990, 1999, timezone=8)
+        self.assertEqual([info.year for info in infos], list(range(1990, 2000)))
+        self.assertIs(LunarYearUtil.year_info(1995, 8), infos[5])
+
+        # Consecutive years share their boundary month
+        for info, next_info in zip(infos, infos[1:]):
+            self.assertEqual(info.month_starts[-1], next_info.month_starts[0])
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_lunar_dates_of_jdn_array(self):
+        jdns = numpy.arange(DateUtil.jdn_from_ymd(2022, 12, 1), DateUtil.jdn_from_ymd(2024, 3, 1))
+        years, months, days, leaps = LunarYearUtil.lunar_dates_of_jdn_array(jdns, timezone=8)
+        for jdn, year, month, day, leap in zip(jdns.tolist(), years.tolist(), months.tolist(), days.tolist(), leaps.tolist()):
+            lunar_year, lunar_month, lunar_leap, month_start, _ = DateUtil.lunar_month_of_jdn(jdn, DateUtil.ymd_from_jdn(jdn)[0], 8)
+            self.assertEqual((year, month, day, leap), (lunar_year, lunar_month, jdn - month_start + 1, lunar_leap))
+
+
+if __name__ == '__main__':
+    unittest.main()
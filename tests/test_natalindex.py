@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+
+try:
+    from core.natalindex import NatalIndex, NatalKey
+except ImportError:  # NumPy is not installed
+    NatalIndex = None
+
+from core.date import SolarDate
+from core.exceptions import InvalidNatalIndex
+from core.main import LaSoTuVi
+
+
+@unittest.skipIf(NatalIndex is None, 'NumPy is not installed')
+class TestNatalIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The first month of the Giap Ti years, 1984 in this range
+        cls.index = NatalIndex.build(1980, 2000, can_chis=[0], months=[1], processes=1, log=lambda line: None)
+
+
+    def test_natal_key(self):
+        key = NatalKey.of_birth(SolarDate(1984, 2, 2, 23, 30), -1)
+        # The Ti hour of the next day, the 2nd of the first lunar month
+        self.assertEqual(key, NatalKey(0, 1, 2, 1, -1))
+        self.assertEqual(NatalKey.from_code(key.code), key)
+        self.assertEqual(NatalKey.from_code(518399), NatalKey(59, 12, 30, 12, -1))
+
+
+    def test_domain(self):
+        domain = self.index.domain()
+        # The first month of 1984 has 30 days, every hour and gender
+        self.assertEqual(len(domain), 30 * 12 * 2)
+        self.assertEqual(domain.keys(1), [NatalKey(0, 1, 1, 1, 1)])
+        self.assertEqual(self.index.birth(domain.codes(1)[0]), (SolarDate(1984, 2, 2), 1))
+        self.assertEqual(len(~self.index.empty()), len(domain))
+
+
+    def test_matches_charts(self):
+        for code in self.index.domain().codes()[::37].tolist():
+            birthdate, gender = self.index.birth(code)
+            key = NatalKey.from_code(code)
+            self.assertEqual(NatalKey.of_birth(birthdate, gender), key)
+
+            chart = LaSoTuVi(birthdate.year, birthdate.month, birthdate.day, birthdate.hour, birthdate.minute, gender=gender, cur_year=2024).to_dict()
+            for cell in chart['cells']:
+                palace = 'menh' if cell['name'].startswith('MỆNH') else None
+                for name, trang_thai in cell['chinh_tinh'] + cell['phu_tinh_trai'] + cell['phu_tinh_phai']:
+                    if name.startswith('L. '):
+                        continue
+                    self.assertIn(key, self.index.star(name, cell=cell['id'], trang_thai=trang_thai))
+                    self.assertEqual(key in self.index.star(name, palace='menh'), palace == 'menh')
+
+
+    def test_query(self):
+        tu_vi = self.index.star('Tử Vi', palace='menh')
+        loc = self.index.star('Hóa Lộc', palace='menh')
+        self.assertEqual(len(tu_vi | loc), len(tu_vi) + len(loc) - len(tu_vi & loc))
+        self.assertEqual(len(tu_vi - loc), len(tu_vi) - len(tu_vi & loc))
+        self.assertEqual(len(~tu_vi), len(self.index.domain()) - len(tu_vi))
+        # Tu Vi is somewhere in every chart
+        self.assertEqual(len(self.index.star('SaoTuVi')), len(self.index.domain()))
+        self.assertEqual(sum(len(self.index.palace('menh', cell)) for cell in range(1, 13)), len(self.index.domain()))
+
+        # Hoa Loc goes with Liem Trinh in the Giap years
+        self.assertTrue(loc)
+        self.assertEqual(len(self.index.star('Liêm Trinh', palace='menh') & loc), len(loc))
+
+        found = tu_vi & self.index.star('Thiên Phủ', palace='menh')
+        self.assertTrue(found)
+        for birthdate, gender in found.births(3):
+            chart = LaSoTuVi(birthdate.year, birthdate.month, birthdate.day, birthdate.hour, birthdate.minute, gender=gender, cur_year=2024).to_dict()
+            menh = next(cell for cell in chart['cells'] if cell['name'].startswith('MỆNH'))
+            self.assertTrue({'Tử Vi', 'Thiên Phủ'} <= {name for name, _ in menh['chinh_tinh']})
+
+        with self.assertRaises(ValueError):
+            self.index.star('L. Thiên Mã')
+        with self.assertRaises(ValueError):
+            self.index.star('Tử Vi', palace='nowhere')
+
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'natal_index.bin')
+            self.index.save(path)
+            loaded = NatalIndex.load(path)
+
+            truncated = os.path.join(directory, 'truncated.bin')
+            with open(path, 'rb') as f, open(truncated, 'wb') as out:
+                out.write(f.read(100))
+            with self.assertRaises(InvalidNatalIndex):
+                NatalIndex.load(truncated)
+
+        self.assertEqual(loaded.entries, self.index.entries)
+        self.assertEqual(len(loaded.star('Thiên Phủ', palace='menh')), len(self.index.star('Thiên Phủ', palace='menh')))
+        self.assertEqual(loaded.birth(0), self.index.birth(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
 import unittest
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from core.tuvi.elements.nguhanh import NguHanh
 from core.utils import NguHanhUtil
 
@@ -15,5 +20,57 @@ class TestNguHanh(unittest.TestCase):
         self.assertTrue(NguHanhUtil.check_tuong_khac(NguHanh.MOC, NguHanh.THO))
 
 
+    def test_relations(self):
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_duoc_sinh(NguHanh.KIM), NguHanh.THUY)
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_sinh_cho(NguHanh.KIM), NguHanh.THO)
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_bi_khac(NguHanh.KIM), NguHanh.MOC)
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_khac_che(NguHanh.KIM), NguHanh.HOA)
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_sinh(NguHanh.KIM), [NguHanh.THUY, NguHanh.THO])
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_sinh(NguHanh.THUY), [NguHanh.MOC, NguHanh.KIM])
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_sinh(NguHanh.THO), [NguHanh.HOA, NguHanh.KIM])
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_khac(NguHanh.KIM), [NguHanh.HOA, NguHanh.MOC])
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_khac(NguHanh.HOA), [NguHanh.THUY, NguHanh.KIM])
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_khac(NguHanh.THO), [NguHanh.THUY, NguHanh.MOC])
+
+        # The lists agree with the matrices
+        for ngu_hanh in NguHanhUtil.BY_CODE:
+            code = NguHanhUtil.code(ngu_hanh)
+            self.assertCountEqual(NguHanhUtil.get_ngu_hanh_tuong_sinh(ngu_hanh), [other for other in NguHanhUtil.BY_CODE if NguHanhUtil.TUONG_SINH[code][NguHanhUtil.code(other)]])
+            self.assertCountEqual(NguHanhUtil.get_ngu_hanh_tuong_khac(ngu_hanh), [other for other in NguHanhUtil.BY_CODE if NguHanhUtil.TUONG_KHAC[code][NguHanhUtil.code(other)]])
+
+        for ngu_hanh in (NguHanh.NONE, None):
+            self.assertIsNone(NguHanhUtil.get_ngu_hanh_sinh_cho(ngu_hanh))
+            self.assertFalse(NguHanhUtil.check_tuong_sinh(NguHanh.KIM, ngu_hanh))
+        self.assertFalse(NguHanhUtil.check_tuong_khac(NguHanh.NONE, NguHanh.KIM))
+        with self.assertRaises(TypeError):
+            NguHanhUtil.check_tuong_khac(None, NguHanh.KIM)
+        self.assertEqual(NguHanhUtil.get_ngu_hanh_tuong_sinh(NguHanh.NONE), [])
+        self.assertIsNone(NguHanhUtil.get_ngu_hanh_tuong_sinh(None))
+
+        # Every ngu hanh generates one and controls one other
+        for ngu_hanh in NguHanhUtil.BY_CODE[1:]:
+            code = NguHanhUtil.code(ngu_hanh)
+            self.assertEqual(sum(NguHanhUtil.SINH[code]), 1)
+            self.assertEqual(NguHanhUtil.BY_CODE[NguHanhUtil.SINH[code].index(True)], NguHanhUtil.get_ngu_hanh_duoc_sinh(ngu_hanh))
+            self.assertEqual(NguHanhUtil.BY_CODE[NguHanhUtil.KHAC[code].index(True)], NguHanhUtil.get_ngu_hanh_bi_khac(ngu_hanh))
+
+
+    def test_from_string(self):
+        self.assertEqual(NguHanhUtil.ngu_hanh_from_string('Thuỷ'), NguHanh.THUY)
+        self.assertIsNone(NguHanhUtil.ngu_hanh_from_string('Gió'))
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_arrays(self):
+        arrays = NguHanhUtil.arrays()
+        self.assertEqual(arrays.tuong_sinh.shape, (6, 6))
+        self.assertTrue((arrays.tuong_sinh == arrays.tuong_sinh.T).all())
+        self.assertTrue((arrays.tuong_khac == (arrays.khac | arrays.khac.T)).all())
+        self.assertEqual(arrays.can.tolist(), [NguHanhUtil.code(ngu_hanh) for ngu_hanh in NguHanhUtil.CAN_NGU_HANH])
+
+        codes = numpy.array([1, 2, 3, 4, 5])
+        self.assertEqual(arrays.tuong_sinh[codes, numpy.roll(codes, 1)].tolist(), [NguHanhUtil.check_tuong_sinh(NguHanhUtil.BY_CODE[a], NguHanhUtil.BY_CODE[b]) for a, b in zip([1, 2, 3, 4, 5], [5, 1, 2, 3, 4])])
+
+
 if __name__ == '__main__':
     unittest.main()
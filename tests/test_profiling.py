@@ -0,0 +1,50 @@
+import unittest
+
+from core.main import LaSoTuVi
+from core.profiling import StarProfiler
+from core.tuvi.stars.sao import SaoHoaQuyen, SaoRegistry, SaoTuVi
+
+
+MAJOR_STARS = {'SaoPhaQuan', 'SaoThienLuong', 'SaoThienCo', 'SaoThienDong', 'SaoThaiAm', 'SaoThamLang', 'SaoVuKhuc', 'SaoThaiDuong', 'SaoTuVi', 'SaoCuMon'}
+
+
+class TestStarProfiler(unittest.TestCase):
+    def test_profile(self):
+        originals = {sao: sao.__dict__['an_sao'] for sao in SaoRegistry.get_subclasses()}
+        # A current year no other test uses, so the caches miss
+        with StarProfiler() as profiler:
+            LaSoTuVi(1991, 3, 8, 14, 0, gender=-1, cur_year=1901)
+            LaSoTuVi(1991, 3, 8, 14, 0, gender=-1, cur_year=1901)
+
+        for sao, original in originals.items():
+            self.assertIs(sao.__dict__['an_sao'], original)
+
+        # Then the stars placed from the cache are placed again for their trang thai, uncached
+        names = [sao.__name__ for sao in SaoRegistry.get_subclasses()]
+        top_level = [call.star for call in profiler.calls]
+        self.assertEqual(top_level[:2 * len(names)], names * 2)
+
+        report = {star['star']: star for star in profiler.report()}
+        self.assertEqual(set(report['SaoHoaQuyen']['nested']), MAJOR_STARS)
+        self.assertEqual(report['SaoHoaQuyen']['calls'], 2)
+        self.assertEqual(report['SaoHoaQuyen']['hits'], 1)
+        self.assertGreaterEqual(report['SaoTuVi']['total_us'], report['SaoTuVi']['self_us'])
+
+        lines = profiler.folded().splitlines()
+        self.assertIn('LaSoTuVi._prepare;SaoHoaQuyen;SaoTuVi', [line.rsplit(' ', 1)[0] for line in lines])
+        self.assertTrue(all(int(line.rsplit(' ', 1)[1]) >= 0 for line in lines))
+
+
+    def test_single_profiler(self):
+        with StarProfiler():
+            with self.assertRaises(RuntimeError):
+                StarProfiler().__enter__()
+            # The cache functions stay reachable while profiling
+            self.assertIsNotNone(SaoTuVi.an_sao.cache_info())
+        self.assertEqual(SaoHoaQuyen.an_sao.__name__, 'an_sao')
+        with StarProfiler():
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from core.date import Date
+from core.solarterms import SolarTermUtil
+from core.tuvi.elements.tietkhi import TietKhi
+from core.utils import DateUtil
+
+
+class TestSolarTerms(unittest.TestCase):
+    def test_terms_of_year(self):
+        terms = SolarTermUtil.terms_of_year(2023)
+        self.assertEqual([term for term, _ in terms], list(TietKhi))
+        self.assertEqual(terms[TietKhi.LAP_XUAN.value][1].empty_hms(), Date(2023, 2, 4))
+        self.assertEqual(terms[TietKhi.XUAN_PHAN.value][1].empty_hms(), Date(2023, 3, 21))
+        self.assertEqual(terms[TietKhi.HA_CHI.value][1].empty_hms(), Date(2023, 6, 21))
+        self.assertEqual(terms[TietKhi.DONG_CHI.value][1].empty_hms(), Date(2023, 12, 22))
+
+        for _, start in terms:
+            self.assertEqual(start.year, 2023)
+
+
+    def test_term_longitude(self):
+        for year in [1900, 2023, 2100]:
+            for term in range(24):
+                longitude = DateUtil.to_degrees(DateUtil.sun_longitude(SolarTermUtil.find_term_instant(year, term)))
+                self.assertAlmostEqual((longitude - SolarTermUtil.term_longitude(term) + 180) % 360 - 180, 0, places=4)
+
+
+    def test_term_of_date(self):
+        self.assertEqual(SolarTermUtil.term_of_date(Date(2023, 6, 13))[0], TietKhi.MANG_CHUNG)
+        self.assertEqual(SolarTermUtil.term_of_date(Date(2023, 1, 1)), (TietKhi.DONG_CHI, SolarTermUtil.terms_of_year(2022)[TietKhi.DONG_CHI.value][1]))
+
+        # Timezones move the local start of a term
+        start = SolarTermUtil.terms_of_year(2023, timezone=7)[TietKhi.LAP_XUAN.value][1]
+        self.assertEqual(SolarTermUtil.term_of_date(start, timezone=7)[0], TietKhi.LAP_XUAN)
+        self.assertEqual(SolarTermUtil.term_of_date(start, timezone=8)[0], TietKhi.DAI_HAN)
+
+
+    def test_far_years(self):
+        SolarTermUtil.precompute(2020, 2026)
+        table = SolarTermUtil._table
+        far = SolarTermUtil.terms_of_year(100)
+        self.assertEqual(far[TietKhi.LAP_XUAN.value][1].year, 100)
+        self.assertEqual(SolarTermUtil.term_of_date(far[TietKhi.LAP_XUAN.value][1])[0], TietKhi.LAP_XUAN)
+        self.assertEqual(SolarTermUtil.terms_of_year(9999)[0][1].year, 9999)
+        # Too far from the table to extend it
+        self.assertIs(SolarTermUtil._table, table)
+        self.assertEqual(SolarTermUtil._instants(100, 100)[1].tolist(), SolarTermUtil._compute_years(100, 100).tolist())
+
+
+    def test_leap_month_offset(self):
+        # Leap months: 4th of 2020, 2nd of 2023, 6th of 2025
+        for year, offset in [(2019, 6), (2022, 4), (2024, 8)]:
+            self.assertEqual(DateUtil.get_leap_month_offset(DateUtil.get_lunar_month_11(year)), offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core.date import Date
+from core import tables
+from core.tables import LunarTable, NewMoonEphemeris
+from core.utils import DateUtil
+
+
+class TestLunarTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.table = LunarTable.build(2020, 2022)
+
+
+    def test_matches_series(self):
+        for k in range(self.table.k_start, self.table.k_end):
+            self.assertEqual(self.table.new_moon(k), DateUtil.new_moon_tz_adjusted(k))
+        for year in range(2020, 2023):
+            self.assertEqual(self.table.lunar_month_11(year), DateUtil.get_lunar_month_11(year))
+        self.assertIsNone(self.table.new_moon(self.table.k_end))
+        self.assertIsNone(self.table.lunar_month_11(2023))
+
+
+    def test_build_installs_nothing(self):
+        # Other threads look the installed tables up meanwhile, they must never see a table being built
+        with mock.patch.object(LunarTable, 'install') as install, mock.patch.object(LunarTable, 'uninstall') as uninstall:
+            table = LunarTable.build(2020, 2022)
+        install.assert_not_called()
+        uninstall.assert_not_called()
+        self.assertNotIn(7, LunarTable._installed)
+
+        self.assertEqual(list(table.month_11), list(self.table.month_11))
+        for year, jd in zip(range(2020, 2023), table.month_11):
+            self.assertEqual(jd, DateUtil.get_lunar_month_11(year))
+            self.assertEqual(table.leap_month_offset(jd), DateUtil.get_leap_month_offset(jd))
+
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lunar_table.bin')
+            self.table.save(path)
+            loaded = LunarTable.load(path)
+
+        self.assertEqual(list(loaded.month_starts), list(self.table.month_starts))
+        self.assertEqual(list(loaded.month_11), list(self.table.month_11))
+        self.assertEqual(list(loaded.leap_offsets), list(self.table.leap_offsets))
+        self.assertEqual((loaded.timezone, loaded.first_year, loaded.last_year), (7, 2020, 2022))
+
+
+    def test_installed_conversions(self):
+        dates = [Date(2020, 5, 23), Date(2020, 6, 21), Date(2021, 2, 12), Date(2022, 12, 31)]
+        expected = [DateUtil.solar_to_lunar(date) for date in dates]
+        expected_solar = [DateUtil.lunar_to_solar(date) for date in expected]
+
+        LunarTable.install(self.table)
+        try:
+            self.assertEqual([DateUtil.solar_to_lunar(date) for date in dates], expected)
+            self.assertEqual([DateUtil.lunar_to_solar(date) for date in expected], expected_solar)
+        finally:
+            LunarTable.uninstall(7)
+
+
+    def test_lazy_tables(self):
+        dates = [Date(2020, 5, 23), Date(2021, 2, 12), Date(2022, 12, 31)]
+        expected = {timezone: [DateUtil.solar_to_lunar(date, timezone) for date in dates] for timezone in (8, 5.5)}
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lunar_table.bin')
+            # As written by build_lunar_table --timezone 8, for a wider range
+            LunarTable.build(2019, 2023, 8).save(LunarTable.path_for_timezone(path, 8))
+            LunarTable.enable_lazy(2020, 2022, path)
+            try:
+                for timezone in (8, 5.5):
+                    self.assertEqual([DateUtil.solar_to_lunar(date, timezone) for date in dates], expected[timezone])
+
+                table = LunarTable.get(8)
+                self.assertEqual((table.timezone, table.first_year, table.last_year), (8, 2019, 2023))
+                # Built in memory, never saved
+                table = LunarTable.get(5.5)
+                self.assertEqual((table.timezone, table.first_year, table.last_year), (5.5, 2020, 2022))
+                self.assertFalse(os.path.exists(LunarTable.path_for_timezone(path, 5.5)))
+            finally:
+                LunarTable.disable_lazy()
+                LunarTable.uninstall(8)
+                LunarTable.uninstall(5.5)
+
+        self.assertIsNone(LunarTable.get(8))
+
+
+    def test_path_for_timezone(self):
+        self.assertEqual(LunarTable.path_for_timezone('/srv/lunar_table.bin', 7), '/srv/lunar_table.bin')
+        self.assertEqual(LunarTable.path_for_timezone('/srv/lunar_table.bin', 9), '/srv/lunar_table.utc+9.bin')
+        self.assertEqual(LunarTable.path_for_timezone('/srv/lunar_table.bin', 5.5), '/srv/lunar_table.utc+5.5.bin')
+        self.assertEqual(LunarTable.path_for_timezone('/srv/lunar_table.bin', -3.5), '/srv/lunar_table.utc-3.5.bin')
+
+
+class TestNewMoonEphemeris(unittest.TestCase):
+    def test_matches_series(self):
+        ephemeris = NewMoonEphemeris.build(*NewMoonEphemeris.k_range(1990, 2010))
+        # Without NumPy, the new moons are computed one by one
+        with mock.patch.object(tables, 'numpy', None):
+            fallback = NewMoonEphemeris.build(ephemeris.k_start, ephemeris.k_end)
+
+        for k in range(ephemeris.k_start, ephemeris.k_end):
+            self.assertAlmostEqual(ephemeris.jde(k), DateUtil.new_moon_series(k), places=9)
+            self.assertEqual(fallback.jde(k), DateUtil.new_moon_series(k))
+        self.assertIsNone(ephemeris.jde(ephemeris.k_end))
+
+
+    def test_save_load(self):
+        ephemeris = NewMoonEphemeris.build(0, 100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'new_moons.bin')
+            ephemeris.save(path)
+            loaded = NewMoonEphemeris.load(path)
+            self.assertIs(NewMoonEphemeris.load_or_build(path, 10, 50).k_start, 0)
+
+        self.assertEqual((loaded.k_start, loaded.k_end), (0, 100))
+        self.assertEqual(list(loaded.jdes), list(ephemeris.jdes))
+
+
+    def test_installed_lookups(self):
+        dates = [Date(1999, 12, 31), Date(2000, 2, 5), Date(2001, 7, 20), Date(2150, 1, 1)]
+        expected = [DateUtil.solar_to_lunar(date) for date in dates]
+
+        NewMoonEphemeris.install(NewMoonEphemeris.build(*NewMoonEphemeris.k_range(1999, 2001)))
+        try:
+            self.assertEqual(DateUtil.jde_of_kth_new_moon(0), NewMoonEphemeris.get().jde(0))
+            # 2150 is out of the ephemeris and falls back to the series
+            self.assertEqual([DateUtil.solar_to_lunar(date) for date in dates], expected)
+        finally:
+            NewMoonEphemeris.uninstall()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from core.date import SolarDate
+from core.tuvi.elements.nguhanh import NguHanh
+from core.tutru import Pillar, TuTru, TuTruUtil
+from core.utils import DateUtil, ZodiacUtil
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestTuTru(unittest.TestCase):
+    def test_from_date(self):
+        tu_tru = TuTru.from_date(SolarDate(1995, 11, 22, 10, 30))
+        lunar_date = DateUtil.solar_to_lunar(SolarDate(1995, 11, 22))
+        self.assertEqual(tu_tru.year.name, ZodiacUtil.zodiac_year(lunar_date))
+        self.assertEqual(tu_tru.month.name, ZodiacUtil.zodiac_month(lunar_date))
+        self.assertEqual(tu_tru.day.name, ZodiacUtil.zodiac_day(SolarDate(1995, 11, 22)))
+        self.assertEqual(tu_tru.hour.name, ZodiacUtil.zodiac_hour(SolarDate(1995, 11, 22, 10, 30)))
+
+
+    def test_late_hour(self):
+        # From 23:00 on, the day and the Ti hour are those of the next day
+        self.assertEqual(TuTru.from_date(SolarDate(2004, 2, 19, 23, 30)), TuTru.from_date(SolarDate(2004, 2, 20, 0, 30)))
+
+
+    def test_characters(self):
+        tu_tru = TuTru(Pillar(1, 1), Pillar(3, 3), Pillar(5, 7), Pillar(8, 10))
+        self.assertEqual(tu_tru.characters, ('Giáp', 'Tí', 'Bính', 'Dần', 'Mậu', 'Ngọ', 'Tân', 'Dậu'))
+        self.assertEqual(tu_tru.ngu_hanh, (NguHanh.MOC, NguHanh.THUY, NguHanh.HOA, NguHanh.MOC, NguHanh.THO, NguHanh.HOA, NguHanh.KIM, NguHanh.KIM))
+        self.assertEqual(tu_tru.balance, {NguHanh.KIM: 2, NguHanh.MOC: 2, NguHanh.THUY: 1, NguHanh.HOA: 2, NguHanh.THO: 1})
+
+
+    def test_encoding(self):
+        self.assertEqual([Pillar.from_code(code).code for code in range(60)], list(range(60)))
+        self.assertEqual(Pillar(1, 1).code, 0)
+        self.assertEqual(Pillar(10, 12).code, 59)
+
+        tu_tru = TuTru.from_date(SolarDate(1995, 11, 22, 10, 30))
+        self.assertLess(tu_tru.encode(), 1 << 24)
+        self.assertEqual(TuTru.decode(tu_tru.encode()), tu_tru)
+
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_batch(self):
+        dates = [SolarDate(1995, 11, 22, 10, 30), SolarDate(2023, 3, 22, 23, 0), SolarDate(1900, 1, 31, 0, 0), SolarDate(2033, 12, 22, 12, 0)]
+        years, months, days, hours = (numpy.array(column) for column in zip(*((date.year, date.month, date.day, date.hour) for date in dates)))
+
+        can, chi = TuTruUtil.batch(years, months, days, hours)
+        expected = [TuTru.from_date(date) for date in dates]
+        self.assertEqual(TuTruUtil.encode(can, chi).tolist(), [tu_tru.encode() for tu_tru in expected])
+        self.assertEqual(TuTruUtil.ngu_hanh(can, chi).tolist(), [[ngu_hanh.value for ngu_hanh in tu_tru.ngu_hanh] for tu_tru in expected])
+        self.assertEqual(TuTruUtil.balance(can, chi).tolist(), [list(tu_tru.balance.values()) for tu_tru in expected])
+
+
+if __name__ == '__main__':
+    unittest.main()
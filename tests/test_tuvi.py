@@ -1,6 +1,10 @@
 import unittest
 
+from core.caches import CacheRegistry
+from core.main import LaSoTuVi
 from core.tuvi.elements.gioitinh import GioiTinh
+from core.tuvi.elements.trangthai import TrangThai
+from core.tuvi.stars.sao import SaoRegistry
 from core.tuvi.utils import TuViUtil
 from core.date import Date
 
@@ -71,6 +75,30 @@ class TestTuVi(unittest.TestCase):
         self.assertEqual(TuViUtil.tim_noi_cu_than(Date(2002, 8, 16, 11, 30), GioiTinh.NU.value), 'Thân Mệnh đồng cung')
 
 
+    def test_tuvi_trang_thai_in_sequence(self):
+        births = [(1995, 11, 22, 10, 30, 0, GioiTinh.NAM.value), (1990, 2, 14, 8, 0, 0, GioiTinh.NU.value)]
+
+        def trang_thai(birth):
+            # Read at once, the trang thai of the stars is only the one of the last chart built
+            cells = LaSoTuVi(*birth, cur_year=2024).to_dict()['cells']
+            return {name: value for cell in cells for stars in ('chinh_tinh', 'phu_tinh_trai', 'phu_tinh_phai') for name, value in cell[stars]}
+
+        def fresh(birth):
+            # As in a new process: empty caches, no trang thai set
+            CacheRegistry.clear()
+            for sao in SaoRegistry.get_subclasses():
+                sao.trang_thai = TrangThai.NONE
+            return trang_thai(birth)
+
+        expected = [fresh(birth) for birth in births]
+        self.assertNotEqual(expected[0], expected[1])
+
+        # Both charts rendered twice in sequence, the second time from the caches filled by the first one
+        CacheRegistry.clear()
+        for _ in range(2):
+            for birth, brightness in zip(births, expected):
+                self.assertEqual(trang_thai(birth), brightness)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,12 @@
 import unittest
 
 from core.date import Date
-from core.utils import ZodiacUtil
+from core.utils import DateUtil, ZodiacUtil
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestZodiac(unittest.TestCase):
@@ -37,5 +42,27 @@ class TestZodiac(unittest.TestCase):
         self.assertEqual(ZodiacUtil.zodiac_hour(Date(1991, 7, 3, 5, 50)), 'Đinh Mão')
 
 
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_batch(self):
+        dates = [Date(2004, 2, 20, 6, 55), Date(1992, 5, 17, 23, 0), Date(1582, 10, 4, 0, 30), Date(1582, 10, 15, 12, 0), Date(1, 1, 1, 1, 0)]
+        years, months, days, hours = (numpy.array(column) for column in zip(*((date.year, date.month, date.day, date.hour) for date in dates)))
+
+        jdns = DateUtil.jdn_from_ymd_array(years, months, days)
+        self.assertEqual(jdns.tolist(), [DateUtil.jdn_from_ymd(date.year, date.month, date.day) for date in dates])
+
+        can, chi = ZodiacUtil.day_can_chi(jdns)
+        self.assertEqual(list(zip(can.tolist(), chi.tolist())), [ZodiacUtil.zodiac_day_tuple(date) for date in dates])
+        self.assertEqual(ZodiacUtil.can_chi_names(can, chi).tolist(), [ZodiacUtil.zodiac_day(date) for date in dates])
+
+        can, chi = ZodiacUtil.hour_can_chi(jdns, hours)
+        self.assertEqual(list(zip(can.tolist(), chi.tolist())), [ZodiacUtil.zodiac_hour_tuple(date) for date in dates])
+
+        can, chi = ZodiacUtil.year_can_chi(years)
+        self.assertEqual(list(zip(can.tolist(), chi.tolist())), [ZodiacUtil.zodiac_year_tuple(date) for date in dates])
+
+        can, chi = ZodiacUtil.month_can_chi(years, months)
+        self.assertEqual(ZodiacUtil.can_chi_names(can, chi).tolist(), [ZodiacUtil.zodiac_month(date) for date in dates])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
+from .models import Chart
+
 # Register your models here.
+
+@admin.register(Chart)
+class ChartAdmin(admin.ModelAdmin):
+    list_display = ('key', 'name', 'created_at')
+    search_fields = ('key', 'name')
+    exclude = ('image',)
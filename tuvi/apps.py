@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class TuviConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tuvi'
+
+    def ready(self) -> None:
+        # Resize before the server warmup (see `warmup.warm_server`) fills the caches, resizing empties them
+        for pattern, maxsize in getattr(settings, 'TUVI_CACHE_SIZES', {}).items():
+            from core.caches import CacheRegistry
+
+            CacheRegistry.resize(pattern, maxsize)
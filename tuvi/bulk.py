@@ -0,0 +1,174 @@
+"""
+Chart generation for whole lists of births, outside of the request cycle. See the `bulk_charts` command.
+
+Rows are read one at a time from a CSV or JSONL file and sent in chunks to a process pool, with a bounded number
+of chunks in flight. Results are written in the order of the input as soon as the chunks before them are done,
+one JSON line per row, and images are written by the workers themselves, so the memory used does not depend
+on the size of the input. The charts can also be written as columns, see `core.export`.
+"""
+
+import collections
+import csv
+import datetime
+import json
+import multiprocessing
+import os
+import time
+from itertools import islice
+from typing import Callable, Deque, Dict, Iterator, List, TextIO, Tuple, Union
+
+from core import export
+from core.main import LaSoTuVi
+from core.tuvi.elements.gioitinh import GioiTinh
+
+Row = Dict[str, str]
+
+GENDERS = {'1': GioiTinh.NAM.value, 'm': GioiTinh.NAM.value, 'nam': GioiTinh.NAM.value, '-1': GioiTinh.NU.value, 'f': GioiTinh.NU.value, 'nu': GioiTinh.NU.value}
+
+
+def read_rows(path: str) -> Iterator[Row]:
+    """
+    Yield the rows of the CSV file, with a header line, or JSONL file (`.jsonl` or `.ndjson`) `path`.
+    Rows have the fields `year`, `month`, `day`, `hour`, `minute`, `gender` (1 or M, -1 or F), and optionally
+    `cur_year`, `name` and an `id` copied to the output.
+    """
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith(('.jsonl', '.ndjson')):
+            yield from read_jsonl(f)
+        else:
+            yield from csv.DictReader(f)
+
+
+def read_jsonl(f: TextIO) -> Iterator[Row]:
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def parse_row(row: Row, cur_year: int) -> Tuple[Tuple[int, int, int, int, int], int, int, str]:
+    """
+    Return the birth date and time, gender, current year and name of `row`. Raise ValueError if a field is invalid.
+    """
+
+    birth = tuple(int(row[field]) for field in ('year', 'month', 'day', 'hour', 'minute'))
+    # Raises ValueError for a day, hour or minute which does not exist
+    datetime.datetime(*birth)
+    gender = GENDERS.get(str(row['gender']).strip().lower())
+    if gender is None:
+        raise ValueError(f'Invalid gender {row["gender"]!r}')
+    return birth, gender, int(row.get('cur_year') or cur_year), row.get('name') or 'Tử vi Tiến Minh'
+
+
+def chart_row(number: int, row: Row, cur_year: int, image_dir: Union[str, None], columns: bool = False) -> Dict[str, object]:
+    """
+    Compute the chart of the row `number` of the input, and write its image to `image_dir` if it is given.
+    Return the output line of the row, with the columnar row of the chart as `columns` if `columns` is True.
+    A row which cannot be computed gets an `error` instead of failing the run.
+    """
+
+    result = {'row': number}
+    if 'id' in row:
+        result['id'] = row['id']
+
+    try:
+        (year, month, day, hour, minute), gender, row_cur_year, name = parse_row(row, cur_year)
+        horoscope = LaSoTuVi(year, month, day, hour, minute, gender=gender, cur_year=row_cur_year, hoten=name)
+        if columns:
+            result['columns'] = export.chart_row(horoscope)
+        result['key'] = LaSoTuVi.make_key(year, month, day, hour, minute, gender, row_cur_year)
+        result['chart'] = horoscope.to_dict()
+        if image_dir is not None:
+            path = os.path.join(image_dir, f'{number:08d}.png')
+            with open(path, 'wb') as f:
+                f.write(horoscope.get_image_bytes())
+            result['image'] = path
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    return result
+
+
+def chart_chunk(chunk: List[Tuple[int, Row]], cur_year: int, image_dir: Union[str, None], columns: bool = False) -> Tuple[List[str], int, List[export.ChartRow]]:
+    """
+    Compute the rows of `chunk` and return their output lines, serialized in the worker, the number of errors,
+    and the columnar rows of the charts computed if `columns` is True.
+    """
+
+    results = [chart_row(number, row, cur_year, image_dir, columns) for number, row in chunk]
+    column_rows = [result.pop('columns') for result in results if 'columns' in result]
+    lines = [json.dumps(result, ensure_ascii=False, separators=(',', ':')) + '\n' for result in results]
+    return lines, sum('error' in result for result in results), column_rows
+
+
+def count_done(output: str) -> int:
+    """
+    Return the number of rows already written to `output`, after dropping a last line cut by an interrupted run.
+    """
+
+    if not os.path.exists(output):
+        return 0
+
+    count = 0
+    complete = 0
+    with open(output, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            count += 1
+            complete += len(line)
+    with open(output, 'r+b') as f:
+        f.truncate(complete)
+    return count
+
+
+def run(rows: Iterator[Row], output: str, cur_year: int, image_dir: Union[str, None] = None, offset: int = 0, processes: Union[int, None] = None,
+        chunk_size: int = 50, log: Callable[[str], None] = print, log_every: float = 5, columnar: Union[export.ColumnarWriter, None] = None) -> Dict[str, float]:
+    """
+    Compute the charts of `rows`, skipping the first `offset` of them, and append their output lines to `output`.
+    The charts computed are also added to `columnar` if it is given, which is left open.
+    Return the number of rows and errors, and the rows per second.
+    """
+
+    if image_dir is not None:
+        os.makedirs(image_dir, exist_ok=True)
+
+    columns = columnar is not None
+    numbered = enumerate(islice(rows, offset, None), offset)
+    chunks = iter(lambda: list(islice(numbered, chunk_size)), [])
+
+    start = last_log = time.perf_counter()
+    stats = {'rows': 0, 'errors': 0}
+
+    with open(output, 'a', encoding='utf-8') as out:
+        def write(done: Tuple[List[str], int, List[export.ChartRow]]) -> None:
+            nonlocal last_log
+            lines, errors, column_rows = done
+            out.writelines(lines)
+            out.flush()
+            for column_row in column_rows:
+                columnar.add(column_row)
+            stats['rows'] += len(lines)
+            stats['errors'] += errors
+            now = time.perf_counter()
+            if now - last_log >= log_every:
+                last_log = now
+                log(f'{offset + stats["rows"]} rows done, {stats["rows"] / (now - start):.1f} rows/s, {stats["errors"]} errors')
+
+        if processes == 1:
+            for chunk in chunks:
+                write(chart_chunk(chunk, cur_year, image_dir, columns))
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                # Pool.imap would read the whole input ahead, keep a few chunks per worker in flight instead
+                pending: Deque = collections.deque()
+                window = 4 * (processes or os.cpu_count() or 1)
+                for chunk in chunks:
+                    pending.append(pool.apply_async(chart_chunk, (chunk, cur_year, image_dir, columns)))
+                    if len(pending) >= window:
+                        write(pending.popleft().get())
+                while pending:
+                    write(pending.popleft().get())
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.tables import LunarTable, NewMoonEphemeris
+
+
+class Command(BaseCommand):
+    help = 'Build the memory mapped lunar calendar table, and the new moon ephemeris, used by the workers.'
+
+    def add_arguments(self, parser):
+        first_year, last_year = getattr(settings, 'TUVI_LUNAR_TABLE_YEARS', (1899, 2100))
+        parser.add_argument('--first-year', type=int, default=first_year)
+        parser.add_argument('--last-year', type=int, default=last_year)
+        parser.add_argument('--timezone', type=float, default=7, help='offset from UTC in hours, e.g. 5.5')
+        parser.add_argument('--output', help='defaults to the file the workers load for --timezone')
+
+    def handle(self, *args, **options):
+        timezone = options['timezone']
+        if timezone.is_integer():
+            timezone = int(timezone)
+        output = options['output'] or LunarTable.path_for_timezone(str(settings.TUVI_LUNAR_TABLE_PATH), timezone)
+
+        start = time.perf_counter()
+        # The table is computed from the new moons, build (or load) their ephemeris first
+        first_year, last_year = getattr(settings, 'TUVI_NEW_MOON_YEARS', (1800, 2200))
+        NewMoonEphemeris.install(NewMoonEphemeris.load_or_build(str(settings.TUVI_NEW_MOON_PATH), *NewMoonEphemeris.k_range(first_year, last_year)))
+        table = LunarTable.build(options['first_year'], options['last_year'], timezone)
+        table.save(output)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(table.month_starts)} months of {table.first_year}-{table.last_year} (UTC{timezone:+g}) to {output} in {time.perf_counter() - start:.1f}s.'
+        ))
@@ -0,0 +1,66 @@
+import datetime
+import os
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.export import ColumnarWriter
+from core.tables import LunarTable, NewMoonEphemeris
+from tuvi import bulk
+
+
+class Command(BaseCommand):
+    help = 'Compute the charts of every row of a CSV or JSONL file, in a process pool, into a JSONL file and optionally PNG images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='CSV file with a header line, or JSONL file (.jsonl, .ndjson), "-" for JSONL on stdin')
+        parser.add_argument('output', help='JSONL file the charts are appended to, one line per input row, in order')
+        parser.add_argument('--images', metavar='DIR', help='also write the PNG image of every chart to DIR, named after its row number')
+        parser.add_argument('--cur-year', type=int, default=datetime.date.today().year, help='for the rows without cur_year')
+        parser.add_argument('--offset', type=int, help='skip the first OFFSET rows, which are not written either')
+        parser.add_argument('--resume', action='store_true', help='skip the rows already in the output, after an interrupted run')
+        parser.add_argument('--processes', type=int, help='defaults to the number of CPUs')
+        parser.add_argument('--chunk-size', type=int, default=50)
+        parser.add_argument('--columnar', metavar='PATH', help='also write the charts as columns to PATH, which must not exist: '
+                            'a Parquet file with pyarrow, else a directory of NumPy .npz batches. With --resume, a new PATH gets the remaining rows')
+        parser.add_argument('--columnar-format', choices=['parquet', 'npz'], help='defaults to parquet if pyarrow is installed')
+        parser.add_argument('--batch-size', type=int, default=10_000, help='rows per columnar batch')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        # A columnar output cannot be appended to: fail before the output is touched
+        if options['columnar'] and os.path.exists(options['columnar']):
+            if options['resume']:
+                raise CommandError(f'{options["columnar"]} already exists and cannot be resumed, give --columnar a new path for the remaining rows.')
+            raise CommandError(f'{options["columnar"]} already exists.')
+
+        if options['resume']:
+            if options['offset'] is not None:
+                raise CommandError('Use either --offset or --resume.')
+            offset = bulk.count_done(output)
+        else:
+            offset = options['offset'] or 0
+
+        # Mapped once here and shared by the forked workers, as in the web workers
+        first_year, last_year = getattr(settings, 'TUVI_NEW_MOON_YEARS', (1800, 2200))
+        NewMoonEphemeris.install(NewMoonEphemeris.load_or_build(str(settings.TUVI_NEW_MOON_PATH), *NewMoonEphemeris.k_range(first_year, last_year), save=False))
+        first_year, last_year = getattr(settings, 'TUVI_LUNAR_TABLE_YEARS', (1899, 2100))
+        LunarTable.install(LunarTable.load_or_build(str(settings.TUVI_LUNAR_TABLE_PATH), first_year, last_year, save=False))
+
+        columnar = None
+        if options['columnar']:
+            try:
+                columnar = ColumnarWriter(options['columnar'], options['batch_size'], options['columnar_format'])
+            except (ImportError, OSError) as e:
+                raise CommandError(str(e))
+
+        rows = bulk.read_rows(options['input']) if options['input'] != '-' else bulk.read_jsonl(sys.stdin)
+        try:
+            stats = bulk.run(rows, output, options['cur_year'], options['images'], offset, options['processes'], options['chunk_size'], log=self.stderr.write, columnar=columnar)
+        finally:
+            if columnar is not None:
+                columnar.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {stats["rows"]} charts from row {offset} in {stats["seconds"]:.1f}s ({stats["rows_per_sec"]:.1f} rows/s), {stats["errors"]} errors.'
+        ))
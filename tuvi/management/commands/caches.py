@@ -0,0 +1,42 @@
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.caches import CacheRegistry
+from core.main import LaSoTuVi
+
+
+class Command(BaseCommand):
+    help = ('Show the hits, misses, size and estimated memory of the memoization caches of core in this process, to size '
+            'them for TUVI_CACHE_SIZES. Caches live in each worker: see and change theirs at /caches/, as staff.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('pattern', nargs='?', help='select the caches whose name matches, e.g. "*.an_sao"')
+        parser.add_argument('--charts', type=int, default=0, help='build CHARTS random charts first, to see the caches filled as in a worker')
+        parser.add_argument('--resize', type=int, metavar='MAXSIZE', help='try a new size for the selected caches before building the charts, 0 for unbounded')
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        pattern = options['pattern']
+        if not CacheRegistry.names(pattern):
+            raise CommandError(f'No cache matches {pattern}.')
+
+        # Only the caches of this process are changed: resize before filling them, as TUVI_CACHE_SIZES does in the workers
+        if options['resize'] is not None:
+            count = CacheRegistry.resize(pattern, options['resize'] or None)
+            self.stderr.write(f'Resized {count} caches.')
+
+        rng = random.Random(0)
+        for _ in range(options['charts']):
+            LaSoTuVi(rng.randint(1940, 2010), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), 0, gender=rng.choice([1, -1]), cur_year=2024)
+
+        stats = CacheRegistry.stats(pattern)
+        if options['json']:
+            self.stdout.write(json.dumps([dict(s._asdict(), hit_rate=s.hit_rate) for s in stats], indent=2))
+            return
+
+        for s in sorted(stats, key=lambda s: s.bytes, reverse=True):
+            maxsize = 'inf' if s.maxsize is None else s.maxsize
+            self.stdout.write(f'{s.name:<56} {s.hits:>8} hits {s.misses:>8} misses {s.hit_rate:>6.1%}  {s.size:>5}/{maxsize:<5} {s.bytes / 1024:>9.1f} KiB')
+        self.stdout.write(f'{len(stats)} caches, {sum(s.bytes for s in stats) / 1024:.1f} KiB')
@@ -0,0 +1,88 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.tables import LunarTable, NewMoonEphemeris
+
+
+class Command(BaseCommand):
+    help = ('Build the inverted index of the natal charts, or find the natal charts placing stars, e.g. '
+            '"Tử Vi@menh" "Thiên Phủ@menh" "Hoá Lộc@menh", and example births of them.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('where', nargs='*', help='STAR[@PALACE or @CELL][:TRANG_THAI], e.g. "Tử Vi@menh", "Thất Sát@7:M", all of them by default')
+        parser.add_argument('--any', action='store_true', help='charts matching any of the conditions')
+        parser.add_argument('--examples', type=int, default=10, help='number of example births shown')
+        parser.add_argument('--path', help='defaults to TUVI_NATAL_INDEX_PATH')
+        parser.add_argument('--build', action='store_true', help='build the index and save it to the path, takes minutes per CPU')
+        parser.add_argument('--processes', type=int, help='for --build, defaults to the number of CPUs')
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            from core.natalindex import NatalIndex
+        except ImportError as e:
+            raise CommandError(str(e))
+
+        path = options['path'] or str(settings.TUVI_NATAL_INDEX_PATH)
+        if options['build']:
+            self.build(NatalIndex, path, options['processes'])
+            if not options['where']:
+                return
+
+        try:
+            index = NatalIndex.load(path)
+        except OSError as e:
+            raise CommandError(f'{e}, build it with --build.')
+
+        start = time.perf_counter()
+        try:
+            sets = [self.parse(index, where) for where in options['where']]
+        except ValueError as e:
+            raise CommandError(str(e))
+        found = index.domain()
+        for i, natal_set in enumerate(sets):
+            if options['any']:
+                found = natal_set if i == 0 else found | natal_set
+            else:
+                found = found & natal_set
+        count = len(found)
+        ms = (time.perf_counter() - start) * 1000
+
+        examples = [(key, *index.birth(key.code)) for key in found.keys(options['examples'])]
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'count': count,
+                'ms': round(ms, 2),
+                'examples': [{'key': key._asdict(), 'birth': self.format_birth(birthdate), 'gender': gender} for key, birthdate, gender in examples],
+            }, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f'{count} natal charts of {len(index.domain())} ({ms:.1f} ms)')
+        for key, birthdate, gender in examples:
+            self.stdout.write(f'{self.format_birth(birthdate)} {"M" if gender == 1 else "F"}  {key}')
+
+    def format_birth(self, birthdate):
+        return f'{birthdate.year:04d}-{birthdate.month:02d}-{birthdate.day:02d} {birthdate.hour:02d}:{birthdate.minute:02d}'
+
+    def parse(self, index, where):
+        star, _, trang_thai = where.partition(':')
+        star, _, place = star.partition('@')
+        if place.isdigit():
+            return index.star(star.strip(), cell=int(place), trang_thai=trang_thai or None)
+        return index.star(star.strip(), palace=place or None, trang_thai=trang_thai or None)
+
+    def build(self, NatalIndex, path, processes):
+        first_year, last_year = getattr(settings, 'TUVI_NEW_MOON_YEARS', (1800, 2200))
+        NewMoonEphemeris.install(NewMoonEphemeris.load_or_build(str(settings.TUVI_NEW_MOON_PATH), *NewMoonEphemeris.k_range(first_year, last_year), save=False))
+        # The example births are taken in every year of the ephemeris
+        LunarTable.install(LunarTable.build(first_year - 1, last_year + 1, 7))
+
+        start = time.perf_counter()
+        index = NatalIndex.build(first_year, last_year, processes=processes, log=self.stderr.write)
+        index.save(path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(index.bits)} bitsets of {len(index.domain())} natal charts to {path} in {time.perf_counter() - start:.1f}s.'
+        ))
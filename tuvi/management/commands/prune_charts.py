@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tuvi.models import Chart
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete the stored charts not used during the given number of days, neither computed again nor visited '
+        'through their permalink. Permalinks in use are kept, those of deleted charts stop working.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=90, help='Keep the charts used during the last DAYS days.')
+        parser.add_argument('--images-only', action='store_true', help='Drop the stored images of the charts not used, but keep the charts.')
+
+    def handle(self, *args, **options):
+        unused = Chart.objects.filter(last_seen_at__lt=timezone.now() - timedelta(days=options['days']))
+        if options['images_only']:
+            # Rendered again from the key when asked for
+            count = unused.exclude(image=None).update(image=None)
+            self.stdout.write(self.style.SUCCESS(f'Dropped the images of {count} charts.'))
+        else:
+            count, _ = unused.delete()
+            self.stdout.write(self.style.SUCCESS(f'Deleted {count} charts.'))
@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from math import ceil
+from typing import Callable, Iterator, Tuple
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+
+logger = logging.getLogger(__name__)
+
+
+class RenderRejected(Exception):
+    """
+    Raised when a request may not render a chart right now. Turned into a response by `AdmissionControlMiddleware`.
+    """
+
+    def __init__(self, status: int, retry_after: float) -> None:
+        super().__init__(f'Chart rendering rejected with status {status}.')
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """
+    Token buckets keyed by client. Each bucket refills at `rate` tokens per second up to `burst` tokens.
+    At most `max_clients` buckets are kept, the least recently used ones are dropped first
+    (a dropped client simply starts again with a full bucket).
+    """
+
+    def __init__(self, rate: float, burst: float, max_clients: int = 10000, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets: 'OrderedDict[str, Tuple[float, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def take(self, client: str) -> float:
+        """
+        Take one token from the bucket of `client`. Return 0 on success,
+        otherwise the number of seconds until a token is available.
+        """
+
+        now = self.clock()
+        with self._lock:
+            tokens, last = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+    def refund(self, client: str) -> None:
+        """
+        Give back the token taken by `client` for a request which was not served after all.
+        """
+
+        with self._lock:
+            if client in self._buckets:
+                tokens, last = self._buckets[client]
+                self._buckets[client] = (min(self.burst, tokens + 1), last)
+
+
+class AdmissionControlMiddleware:
+    """
+    Protect the workers from floods of chart renders.
+
+    Views wrap every render in `request.render_slot()`. Entering the slot takes a token from the client's
+    bucket (429 when empty) and one of the worker's render slots (503 when all stay busy for
+    TUVI_RENDER_QUEUE_TIMEOUT seconds, the token is then given back). Requests served from the cache or the chart
+    store never enter a slot, so they are neither limited nor counted.
+
+    The concurrency limit only matters with threaded workers, a sync worker renders one request at a time anyway.
+    It defaults to 1: building a chart writes the brightness of the stars in class attributes (`Sao.trang_thai`),
+    so two renders at once in one process would mix up each other's stars.
+
+    Clients are told apart by the address the last TUVI_TRUSTED_PROXIES proxies saw in X-Forwarded-For, or
+    by REMOTE_ADDR without proxies. Behind a proxy left out of the count, every client shares the proxy's bucket.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.semaphore = threading.BoundedSemaphore(getattr(settings, 'TUVI_MAX_CONCURRENT_RENDERS', 1))
+        self.queue_timeout = getattr(settings, 'TUVI_RENDER_QUEUE_TIMEOUT', 2.0)
+        self.buckets = TokenBuckets(
+            getattr(settings, 'TUVI_RENDER_RATE', 0.5),
+            getattr(settings, 'TUVI_RENDER_BURST', 10),
+            getattr(settings, 'TUVI_RATE_LIMIT_CLIENTS', 10000),
+        )
+        self.trusted_proxies = getattr(settings, 'TUVI_TRUSTED_PROXIES', 0)
+        self._warned_proxy = False
+
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        client = self.get_client(request)
+        request.render_slot = lambda: self.render_slot(client)
+        return self.get_response(request)
+
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> HttpResponse:
+        if not isinstance(exception, RenderRejected):
+            return None
+
+        response = HttpResponse('Too many requests, please try again later.', status=exception.status, content_type='text/plain')
+        response['Retry-After'] = str(max(1, ceil(exception.retry_after)))
+        return response
+
+
+    def get_client(self, request: HttpRequest) -> str:
+        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded_for and self.trusted_proxies:
+            # Each proxy appends the address it received the request from, entries before the ones
+            # appended by our proxies come from the client and may be forged
+            addresses = [address.strip() for address in forwarded_for.split(',')]
+            return addresses[max(0, len(addresses) - self.trusted_proxies)]
+
+        if forwarded_for and not self._warned_proxy:
+            self._warned_proxy = True
+            logger.warning('Requests come through a proxy but TUVI_TRUSTED_PROXIES is 0, every client shares the rate limit of %s.', request.META.get('REMOTE_ADDR'))
+        return request.META.get('REMOTE_ADDR', '')
+
+
+    @contextmanager
+    def render_slot(self, client: str) -> Iterator[None]:
+        wait = self.buckets.take(client)
+        if wait > 0:
+            raise RenderRejected(429, wait)
+
+        if not self.semaphore.acquire(timeout=self.queue_timeout):
+            # Not the client's fault, the render did not happen
+            self.buckets.refund(client)
+            raise RenderRejected(503, self.queue_timeout)
+        try:
+            yield
+        finally:
+            self.semaphore.release()
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.4 on 2026-10-19 10:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Chart',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=32)),
+                ('name', models.CharField(blank=True, max_length=40)),
+                ('data', models.TextField()),
+                ('image', models.BinaryField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='chart',
+            constraint=models.UniqueConstraint(fields=('key', 'name'), name='unique_chart_key_name'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.4 on 2026-10-19 10:39
+
+import base64
+import hashlib
+
+from django.db import migrations, models
+
+
+def fill_digests(apps, schema_editor):
+    Chart = apps.get_model('tuvi', 'Chart')
+    for chart in Chart.objects.filter(digest=None).only('key', 'name').iterator():
+        digest = hashlib.blake2b(f'{chart.key}|{chart.name}'.encode(), digest_size=8).digest()
+        chart.digest = base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+        chart.save(update_fields=['digest'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tuvi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chart',
+            name='digest',
+            field=models.CharField(max_length=16, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_digests, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:40
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def fill_last_seen(apps, schema_editor):
+    # Existing charts were last seen, as far as we know, when they were created
+    Chart = apps.get_model('tuvi', 'Chart')
+    Chart.objects.update(last_seen_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tuvi', '0002_chart_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chart',
+            name='last_seen_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(fill_last_seen, migrations.RunPython.noop),
+    ]
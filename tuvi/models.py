@@ -1,3 +1,104 @@
-from django.db import models
+import base64
+import hashlib
+from datetime import timedelta
+from typing import Callable, Iterable, Tuple, Union
 
-# Create your models here.
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+# `last_seen_at` is written at most once per interval, a chart seen more often is not rewritten every time
+SEEN_INTERVAL = timedelta(days=1)
+
+
+class ChartQuerySet(models.QuerySet):
+    def get_or_compute(self, key: str, name: str, compute: Callable[[], Tuple[str, Union[bytes, None]]]) -> 'Chart':
+        """
+        Return the stored chart for (`key`, `name`). On a miss, call `compute` for the serialized chart and
+        the optional PNG image, and insert them. Concurrent misses for the same chart insert only one row.
+        """
+
+        chart = self.filter(key=key, name=name).first()
+        if chart is not None:
+            now = timezone.now()
+            if chart.last_seen_at < now - SEEN_INTERVAL:
+                self.filter(pk=chart.pk).update(last_seen_at=now)
+                chart.last_seen_at = now
+            return chart
+
+        data, image = compute()
+        try:
+            with transaction.atomic():
+                return self.create(key=key, name=name, digest=Chart.make_digest(key, name), data=data, image=image)
+        except IntegrityError:
+            # Another worker inserted the same chart in the meantime
+            return self.get(key=key, name=name)
+
+
+    def mark_seen(self, digest: str) -> int:
+        """
+        Record that the chart of the permalink `digest` was just used, unless it already was during the last
+        `SEEN_INTERVAL`. Return the number of charts updated.
+        """
+
+        now = timezone.now()
+        return self.filter(digest=digest, last_seen_at__lt=now - SEEN_INTERVAL).update(last_seen_at=now)
+
+
+    def bulk_store(self, charts: Iterable['Chart'], batch_size: int = 500) -> None:
+        """
+        Insert many charts at once, skipping those which are already stored.
+        """
+
+        charts = list(charts)
+        for chart in charts:
+            if chart.digest is None:
+                chart.digest = Chart.make_digest(chart.key, chart.name)
+
+        self.bulk_create(charts, batch_size=batch_size, ignore_conflicts=True)
+
+
+class Chart(models.Model):
+    # Canonical chart key, see `LaSoTuVi.make_key`. Indexed by the unique constraint below, which starts with it.
+    key = models.CharField(max_length=32)
+    name = models.CharField(max_length=40, blank=True)
+
+    # Short hash of key and name used in permalinks, see `make_digest`
+    digest = models.CharField(max_length=16, unique=True, null=True)
+
+    # Compact JSON of `LaSoTuVi.to_dict`
+    data = models.TextField()
+
+    # PNG bytes, not stored when TUVI_STORE_IMAGES is off
+    image = models.BinaryField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    # Last time the chart was computed again or its permalink visited, to the day, see `mark_seen`.
+    # `prune_charts` deletes the charts not seen for a while.
+    last_seen_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = ChartQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'name'], name='unique_chart_key_name'),
+        ]
+
+    @staticmethod
+    def make_digest(key: str, name: str) -> str:
+        """
+        Return the 11 characters, URL safe hash of a chart key and name.
+        """
+
+        digest = hashlib.blake2b(f'{key}|{name}'.encode(), digest_size=8).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+    def save(self, *args, **kwargs) -> None:
+        if self.digest is None:
+            self.digest = self.make_digest(self.key, self.name)
+        super().save(*args, **kwargs)
+
+
+    def __str__(self) -> str:
+        return f'{self.key} {self.name}'
@@ -1,3 +1,419 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from unittest import skipIf
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core import export
+from core.caches import CacheRegistry
+from core.mixins import DateMixin
+
+try:
+    import numpy
+    from core.natalindex import NatalIndex
+except ImportError:
+    numpy = None
+
+from . import bulk, warmup
+from .middleware import AdmissionControlMiddleware, RenderRejected, TokenBuckets
+from .models import Chart
+
+
+class WarmupTest(TestCase):
+    @override_settings(TUVI_LUNAR_TABLE_PATH=None, TUVI_NEW_MOON_PATH=None)
+    def test_warmup_report(self):
+        self.addCleanup(setattr, warmup, 'last_report', warmup.last_report)
+        CacheRegistry.clear('core.mixins.*')
+        report = warmup.warmup(years=0)
+        self.assertEqual(set(report.seconds), {'fonts', 'new_moons', 'lunar_table', 'lunar_calendar', 'small_caches', 'chart', 'templates', 'total'})
+        self.assertGreaterEqual(report.seconds['total'], report.seconds['chart'])
+        self.assertEqual(set(report.cache_sizes), set(CacheRegistry.names()))
+        self.assertEqual(report.cache_sizes['core.mixins.DateMixin.days_of_month'], 12)
+        self.assertIs(warmup.last_report, report)
+
+        # Read back by the staff
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        data = self.client.get('/caches/', {'memory': '0'}).json()
+        self.assertEqual(data['warmup'], json.loads(json.dumps(report._asdict())))
+
+
+class ChartStoreTest(TestCase):
+    def test_read_through(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return '{}', b'png'
+
+        first = Chart.objects.get_or_compute('199511221030M2023', 'A', compute)
+        second = Chart.objects.get_or_compute('199511221030M2023', 'A', compute)
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(bytes(second.image), b'png')
+        self.assertEqual(len(calls), 1)
+
+
+    def test_bulk_store_skips_existing(self):
+        Chart.objects.create(key='199511221030M2023', name='A', data='{}')
+        Chart.objects.bulk_store([Chart(key='199511221030M2023', name='A', data='{}'), Chart(key='199511221030F2023', name='A', data='{}')])
+        self.assertEqual(Chart.objects.count(), 2)
+
+
+    def test_form_post_stores_chart(self):
+        data = {'name': 'A', 'gender': 'M', 'year': '1995', 'month': '11', 'day': '22', 'hour': '10', 'minute': '30', 'cur_year': '2023'}
+        response = self.client.post('/', data)
+        self.assertEqual(response.status_code, 200)
+        chart = Chart.objects.get(key='199511221030M2023', name='A')
+        self.assertEqual(json.loads(chart.data)['cuc'], 'Mộc tam cục')
+
+        self.client.post('/', data)
+        self.assertEqual(Chart.objects.count(), 1)
+
+
+class PermalinkTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+    def test_permalink(self):
+        data = {'name': 'A', 'gender': 'M', 'year': '1995', 'month': '11', 'day': '22', 'hour': '10', 'minute': '30', 'cur_year': '2023'}
+        response = self.client.post('/', data)
+        digest = Chart.make_digest('199511221030M2023', 'A')
+        self.assertContains(response, f'/c/{digest}/')
+
+        cache.clear()
+        response = self.client.get(f'/c/{digest}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'"{digest}"')
+        self.assertIn('immutable', response['Cache-Control'])
+
+        response = self.client.get(f'/c/{digest}.png')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+
+        response = self.client.get(f'/c/{digest}/', HTTP_IF_NONE_MATCH=f'"{digest}"')
+        self.assertEqual(response.status_code, 304)
+
+
+    def test_permalink_without_image(self):
+        chart = Chart.objects.create(key='199511221030F2023', name='B', data='{}')
+        response = self.client.get(f'/c/{chart.digest}.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content.startswith(b'\x89PNG'))
+
+
+    def test_prune_charts(self):
+        visited = Chart.objects.create(key='199511221030F2023', name='C', data='{}', image=b'old')
+        recomputed = Chart.objects.create(key='199511221030M2023', name='C', data='{}')
+        unvisited = Chart.objects.create(key='199511221030M2023', name='D', data='{}', image=b'old')
+        Chart.objects.update(created_at=timezone.now() - timedelta(days=200), last_seen_at=timezone.now() - timedelta(days=91))
+
+        # Visited through its permalink, and computed again from the form
+        response = self.client.get(f'/c/{visited.digest}.png')
+        self.assertEqual(response.status_code, 200)
+        Chart.objects.get_or_compute(recomputed.key, recomputed.name, lambda: self.fail('stored'))
+
+        call_command('prune_charts', '--images-only', stdout=io.StringIO())
+        self.assertEqual(Chart.objects.count(), 3)
+        self.assertIsNone(Chart.objects.get(pk=unvisited.pk).image)
+
+        call_command('prune_charts', stdout=io.StringIO())
+        self.assertEqual(set(Chart.objects.values_list('pk', flat=True)), {visited.pk, recomputed.pk})
+        self.assertEqual(self.client.get(f'/c/{unvisited.digest}/').status_code, 404)
+
+        # Seen again from the image cache, written once a day
+        Chart.objects.update(last_seen_at=timezone.now() - timedelta(days=91))
+        self.client.get(f'/c/{visited.digest}.png')
+        self.assertEqual(Chart.objects.filter(last_seen_at__lt=timezone.now() - timedelta(days=1)).count(), 2)
+        cache.delete(f'tuvi:seen:{visited.digest}')
+        self.client.get(f'/c/{visited.digest}.png')
+        self.assertEqual(Chart.objects.filter(last_seen_at__lt=timezone.now() - timedelta(days=1)).count(), 1)
+
+
+    def test_unknown_permalink(self):
+        response = self.client.get('/c/AAAAAAAAAAA/')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+
+
+
+class AdmissionControlTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+
+    def test_token_buckets(self):
+        now = [0.0]
+        buckets = TokenBuckets(rate=0.5, burst=2, max_clients=2, clock=lambda: now[0])
+        self.assertEqual(buckets.take('a'), 0)
+        self.assertEqual(buckets.take('a'), 0)
+        self.assertAlmostEqual(buckets.take('a'), 2.0)
+        self.assertEqual(buckets.take('b'), 0)
+
+        now[0] = 2.0
+        self.assertEqual(buckets.take('a'), 0)
+
+        buckets.take('c')
+        self.assertEqual(len(buckets._buckets), 2)
+
+        buckets.refund('a')
+        self.assertEqual(buckets.take('a'), 0)
+        self.assertGreater(buckets.take('a'), 0)
+
+
+    @override_settings(TUVI_TRUSTED_PROXIES=1)
+    def test_client_behind_proxy(self):
+        middleware = AdmissionControlMiddleware(lambda request: None)
+        request = RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2')
+        # The first address was sent by the client and may be forged, the proxy appended the second one
+        self.assertEqual(middleware.get_client(request), '2.2.2.2')
+        self.assertEqual(middleware.get_client(RequestFactory().get('/', REMOTE_ADDR='10.0.0.1')), '10.0.0.1')
+
+        with self.settings(TUVI_TRUSTED_PROXIES=0):
+            self.assertEqual(AdmissionControlMiddleware(lambda request: None).get_client(request), '10.0.0.1')
+
+
+    @override_settings(TUVI_RENDER_BURST=1, TUVI_RENDER_QUEUE_TIMEOUT=0)
+    def test_busy_render_keeps_token(self):
+        middleware = AdmissionControlMiddleware(lambda request: None)
+        with middleware.render_slot('a'):
+            with self.assertRaises(RenderRejected) as rejected:
+                with middleware.render_slot('b'):
+                    pass
+        self.assertEqual(rejected.exception.status, 503)
+
+        # The single token of b was given back
+        with middleware.render_slot('b'):
+            pass
+
+
+    @override_settings(TUVI_RENDER_BURST=1)
+    def test_renders_are_rate_limited(self):
+        data = {'name': 'A', 'gender': 'M', 'year': '1995', 'month': '11', 'day': '22', 'hour': '10', 'minute': '30', 'cur_year': '2023'}
+        self.assertEqual(self.client.post('/', data).status_code, 200)
+
+        response = self.client.post('/', dict(data, name='B'))
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(response.has_header('Retry-After'))
+        self.assertFalse(Chart.objects.filter(name='B').exists())
+
+        # Stored charts are served without rendering
+        self.assertEqual(self.client.post('/', data).status_code, 200)
+
+
+
+class LunarCalendarTest(TestCase):
+    def test_calendar_page(self):
+        response = self.client.get('/lich/2023/3/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1/2 nhuận')
+        self.assertIn('max-age=86400', response['Cache-Control'])
+
+
+    def test_calendar_json(self):
+        response = self.client.get('/lich/2023/3/', {'format': 'json', 'tz': '8'})
+        data = response.json()
+        self.assertEqual(data['timezone'], 8)
+        self.assertEqual(len(data['cells']), 42)
+        self.assertEqual(data['cells'][0]['solar'], '2023-02-27')
+
+
+    def test_calendar_fractional_timezone(self):
+        data = self.client.get('/lich/2023/1/', {'format': 'json', 'tz': '5.5'}).json()
+        self.assertEqual(data['timezone'], 5.5)
+        new_year = next(cell for cell in data['cells'] if cell['lunar_month'] == 1 and cell['lunar_day'] == 1)
+        self.assertEqual(new_year['solar'], '2023-01-22')
+
+
+    def test_invalid_calendar(self):
+        self.assertEqual(self.client.get('/lich/2023/13/').status_code, 404)
+        self.assertEqual(self.client.get('/lich/2023/3/', {'tz': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/lich/2023/3/', {'tz': '5.3'}).status_code, 400)
+        self.assertEqual(self.client.get('/lich/2023/3/', {'tz': 'nan'}).status_code, 400)
+
+
+class GoodDaysTest(TestCase):
+    def test_good_days(self):
+        response = self.client.get('/lich/ngay-tot/2025/1/', {'months': '3', 'birth_year': '1990', 'avoid_chi': '1,7'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['months'], 3)
+        self.assertTrue(data['days'])
+        self.assertEqual(data['days'][-1]['solar'][:7], '2025-03')
+        self.assertTrue(all(day['score'] >= 0 for day in data['days']))
+        self.assertFalse([day for day in data['days'] if day['can_chi'].split()[-1] in ('Tí', 'Ngọ')])
+
+
+    def test_invalid_good_days(self):
+        self.assertEqual(self.client.get('/lich/ngay-tot/2025/13/').status_code, 404)
+        self.assertEqual(self.client.get('/lich/ngay-tot/2025/1/', {'months': '13'}).status_code, 400)
+        self.assertEqual(self.client.get('/lich/ngay-tot/2025/1/', {'avoid_chi': 'x'}).status_code, 400)
+        for min_score in ('nan', 'inf', '-inf', 'x'):
+            self.assertEqual(self.client.get('/lich/ngay-tot/2025/1/', {'min_score': min_score}).status_code, 400)
+        self.assertEqual(self.client.get('/lich/ngay-tot/2025/1/', {'tz': '5.3'}).status_code, 400)
+
+
+class CachesCommandTest(TestCase):
+    def test_json(self):
+        out = io.StringIO()
+        call_command('caches', 'core.mixins.*', '--json', stdout=out, stderr=io.StringIO())
+        stats = json.loads(out.getvalue())
+        self.assertEqual({s['name'] for s in stats}, {'core.mixins.DateMixin.get_ordinal', 'core.mixins.DateMixin.days_of_month', 'core.mixins.DateMixin.get_month_name'})
+
+
+class CachesViewTest(TestCase):
+    NAME = 'core.mixins.DateMixin.days_of_month'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+
+
+    def test_staff_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get('/caches/').status_code, 302)
+        self.client.force_login(User.objects.create_user('user'))
+        self.assertEqual(self.client.get('/caches/').status_code, 302)
+
+
+    def test_stats(self):
+        data = self.client.get('/caches/', {'pattern': 'core.mixins.*', 'memory': '0'}).json()
+        self.assertEqual(data['pid'], os.getpid())
+        self.assertEqual(len(data['caches']), 3)
+        self.assertEqual(self.client.get('/caches/', {'pattern': 'nothing.*'}).status_code, 400)
+
+
+    def test_clear_and_resize(self):
+        DateMixin.days_of_month(1)
+        data = self.client.post(f'/caches/?pattern={self.NAME}', {'action': 'clear'}).json()
+        self.assertEqual(data['caches'][0]['size'], 0)
+
+        maxsize = CacheRegistry.get(self.NAME).cache_info().maxsize
+        self.addCleanup(CacheRegistry.resize, self.NAME, maxsize)
+        data = self.client.post(f'/caches/?pattern={self.NAME}', {'action': 'resize', 'maxsize': '10'}).json()
+        self.assertEqual(data['caches'][0]['maxsize'], 10)
+        self.assertEqual(DateMixin.days_of_month.cache_info().maxsize, 10)
+
+        self.assertEqual(self.client.post(f'/caches/?pattern={self.NAME}', {'action': 'resize', 'maxsize': '-1'}).status_code, 400)
+        self.assertEqual(self.client.post(f'/caches/?pattern={self.NAME}', {'action': 'drop'}).status_code, 400)
+
+
+class BulkChartsTest(TestCase):
+    ROWS = [
+        {'id': 'a', 'year': 1995, 'month': 11, 'day': 22, 'hour': 10, 'minute': 30, 'gender': 'M', 'cur_year': 2023},
+        {'id': 'b', 'year': 1990, 'month': 2, 'day': 30, 'hour': 8, 'minute': 0, 'gender': 'F'},
+        {'id': 'c', 'year': 1988, 'month': 6, 'day': 1, 'hour': 23, 'minute': 15, 'gender': -1, 'name': 'Lan'},
+        {'id': 'd', 'year': 2001, 'month': 1, 'day': 5, 'hour': 0, 'minute': 0, 'gender': 'x'},
+        {'id': 'e', 'year': 1975, 'month': 9, 'day': 9, 'hour': 14, 'minute': 45, 'gender': 1},
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'births.jsonl')
+        self.output = os.path.join(self.directory.name, 'charts.jsonl')
+        # Table files are looked for here, and never written by the command
+        self.tables = {'TUVI_LUNAR_TABLE_PATH': os.path.join(self.directory.name, 'lunar_table.bin'), 'TUVI_NEW_MOON_PATH': os.path.join(self.directory.name, 'new_moons.bin')}
+        overrides = self.settings(**self.tables)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        with open(self.input, 'w') as f:
+            f.writelines(json.dumps(row) + '\n' for row in self.ROWS)
+
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    def read_output(self):
+        with open(self.output) as f:
+            return [json.loads(line) for line in f]
+
+
+    def test_run(self):
+        stats = bulk.run(bulk.read_rows(self.input), self.output, 2024, processes=2, chunk_size=2, log=lambda line: None)
+        self.assertEqual((stats['rows'], stats['errors']), (5, 2))
+
+        lines = self.read_output()
+        self.assertEqual([line['id'] for line in lines], ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(lines[0]['key'], '199511221030M2023')
+        self.assertEqual(lines[2]['chart']['hoten'], 'Lan')
+        self.assertEqual(lines[4]['key'], '197509091445M2024')
+        self.assertTrue(lines[1]['error'].startswith('ValueError'))
+        self.assertEqual(lines[3]['error'], "ValueError: Invalid gender 'x'")
+
+
+    def test_resume(self):
+        bulk.run(bulk.read_rows(self.input), self.output, 2024, processes=1, chunk_size=2, log=lambda line: None)
+        # Interrupted in the middle of the fourth line
+        with open(self.output, 'rb+') as f:
+            f.truncate(sum(len(line) for line in f.readlines()[:3]) + 5)
+
+        out = io.StringIO()
+        call_command('bulk_charts', self.input, self.output, '--resume', '--processes', '1', '--images', os.path.join(self.directory.name, 'images'), stdout=out, stderr=io.StringIO())
+        self.assertIn('Wrote 2 charts from row 3', out.getvalue())
+
+        lines = self.read_output()
+        self.assertEqual([line['row'] for line in lines], [0, 1, 2, 3, 4])
+        self.assertTrue(os.path.exists(lines[4]['image']))
+        self.assertFalse([path for path in self.tables.values() if os.path.exists(path)])
+
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_columnar(self):
+        path = os.path.join(self.directory.name, 'charts')
+        call_command('bulk_charts', self.input, self.output, '--processes', '2', '--chunk-size', '2', '--columnar', path, '--columnar-format', 'npz', '--batch-size', '2', stdout=io.StringIO(), stderr=io.StringIO())
+
+        arrays, schema = export.read_columns(path)
+        self.assertEqual([key.decode() for key in arrays['key']], [line['key'] for line in self.read_output() if 'key' in line])
+        self.assertEqual(schema['menh'][arrays['menh'][0]], self.read_output()[0]['chart']['menh'])
+
+        with self.assertRaises(CommandError):
+            call_command('bulk_charts', self.input, self.output, '--columnar', path, stdout=io.StringIO(), stderr=io.StringIO())
+
+
+    @skipIf(numpy is None, 'NumPy is not installed')
+    def test_columnar_resume(self):
+        path = os.path.join(self.directory.name, 'charts')
+        call_command('bulk_charts', self.input, self.output, '--processes', '1', '--columnar', path, '--columnar-format', 'npz', stdout=io.StringIO(), stderr=io.StringIO())
+        with open(self.output, 'rb+') as f:
+            f.truncate(sum(len(line) for line in f.readlines()[:3]))
+
+        with self.assertRaisesMessage(CommandError, 'cannot be resumed'):
+            call_command('bulk_charts', self.input, self.output, '--resume', '--columnar', path, '--columnar-format', 'npz', stdout=io.StringIO(), stderr=io.StringIO())
+        self.assertEqual(len(self.read_output()), 3)
+
+        # A new path gets the charts of the remaining rows
+        rest = os.path.join(self.directory.name, 'charts-rest')
+        call_command('bulk_charts', self.input, self.output, '--resume', '--processes', '1', '--columnar', rest, '--columnar-format', 'npz', stdout=io.StringIO(), stderr=io.StringIO())
+        arrays, _ = export.read_columns(rest)
+        self.assertEqual([key.decode() for key in arrays['key']], [line['key'] for line in self.read_output()[3:] if 'key' in line])
+
+
+    def test_csv(self):
+        path = os.path.join(self.directory.name, 'births.csv')
+        with open(path, 'w') as f:
+            f.write('year,month,day,hour,minute,gender\n1995,11,22,10,30,M\n')
+        self.assertEqual(list(bulk.read_rows(path)), [{'year': '1995', 'month': '11', 'day': '22', 'hour': '10', 'minute': '30', 'gender': 'M'}])
+
+
+@skipIf(numpy is None, 'NumPy is not installed')
+class NatalIndexCommandTest(TestCase):
+    def test_query(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'natal_index.bin')
+            NatalIndex.build(1980, 2000, can_chis=[0], months=[1], processes=1, log=lambda line: None).save(path)
+
+            out = io.StringIO()
+            call_command('natal_index', 'Tử Vi@menh', 'Thiên Phủ@menh', '--path', path, '--examples', '2', '--json', stdout=out)
+            result = json.loads(out.getvalue())
+            self.assertGreater(result['count'], 0)
+            self.assertEqual(len(result['examples']), 2)
+            self.assertEqual(result['examples'][0]['key']['can_chi'], 0)
+
+            with self.assertRaises(CommandError):
+                call_command('natal_index', 'Sao Chổi@menh', '--path', path, stdout=io.StringIO())
@@ -5,4 +5,10 @@ app_name = 'tuvi'
 
 urlpatterns = [
     path('', views.input_form, name='input_form'),
+    path('c/<slug:digest>/', views.permalink, name='permalink'),
+    path('c/<slug:digest>.png', views.permalink_image, name='permalink_image'),
+    path('lich/', views.lunar_calendar, name='lunar_calendar_today'),
+    path('lich/<int:year>/<int:month>/', views.lunar_calendar, name='lunar_calendar'),
+    path('lich/ngay-tot/<int:year>/<int:month>/', views.good_days, name='good_days'),
+    path('caches/', views.caches, name='caches'),
 ]
\ No newline at end of file
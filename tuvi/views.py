@@ -1,13 +1,122 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
 from django.shortcuts import render
-from django.http import HttpRequest, HttpResponse, HttpResponseServerError, HttpResponseNotAllowed
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified, HttpResponseServerError, HttpResponseNotAllowed, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_http_methods, require_safe
+from . import warmup
 from .forms import InputForm
+from .middleware import RenderRejected
+from .models import SEEN_INTERVAL, Chart
 
+from core.caches import CacheRegistry
+from core.calendar import CalendarUtil
+from core.compatibility import CompatibilityUtil
+from core.gooddays import DayRules, GoodDayUtil
 from core.main import LaSoTuVi
+from core.utils import ZodiacUtil
 
+import base64
+import json
+import math
+import os
 import traceback
+from datetime import date
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Tuple, Union
 
 # Create your views here.
 
+def _image_cache_key(digest: str) -> str:
+    return f'tuvi:image:{digest}'
+
+
+def _mark_seen(digest: str) -> None:
+    """
+    Record that the chart of `digest`, known to exist, is in use, so `prune_charts` keeps it.
+    Written at most once per `SEEN_INTERVAL` and process, image cache hits included.
+    """
+
+    if cache.add(f'tuvi:seen:{digest}', True, SEEN_INTERVAL.total_seconds()):
+        Chart.objects.mark_seen(digest)
+
+
+def _get_chart_image(year: int, month: int, day: int, hour: int, minute: int, gender: int, cur_year: int, name: str, render_slot: Callable[[], ContextManager] = nullcontext) -> Tuple[str, bytes]:
+    """
+    Return the permalink digest and the PNG image of a chart.
+    The image is read from the cache, then from the chart store, and only rendered when both miss,
+    inside `render_slot()`.
+    """
+
+    key = LaSoTuVi.make_key(year, month, day, hour, minute, gender, cur_year)
+    digest = Chart.make_digest(key, name)
+    image = cache.get(_image_cache_key(digest))
+    if image is not None:
+        _mark_seen(digest)
+        return digest, image
+
+    store_images = getattr(settings, 'TUVI_STORE_IMAGES', True)
+    rendered = {}
+
+    def compute():
+        with render_slot():
+            horoscope = LaSoTuVi(year, month, day, hour, minute, gender=gender, cur_year=cur_year, hoten=name)
+            data = json.dumps(horoscope.to_dict(), ensure_ascii=False, separators=(',', ':'))
+            rendered['image'] = horoscope.get_image_bytes()
+        return data, rendered['image'] if store_images else None
+
+    chart = Chart.objects.get_or_compute(key, name, compute)
+    if chart.image is not None:
+        image = bytes(chart.image)
+    elif 'image' in rendered:
+        image = rendered['image']
+    else:
+        # Stored without its image
+        with render_slot():
+            image = LaSoTuVi.from_key(key, name).get_image_bytes()
+
+    cache.set(_image_cache_key(digest), image, getattr(settings, 'TUVI_IMAGE_CACHE_TIMEOUT', 3600))
+    return digest, image
+
+
+def _get_permalink_image(digest: str, render_slot: Callable[[], ContextManager] = nullcontext) -> Union[bytes, None]:
+    """
+    Return the PNG image of the chart behind a permalink, or None if no chart has this digest.
+    """
+
+    image = cache.get(_image_cache_key(digest))
+    if image is not None:
+        _mark_seen(digest)
+        return image
+
+    chart = Chart.objects.filter(digest=digest).only('key', 'name', 'image').first()
+    if chart is None:
+        return None
+    _mark_seen(digest)
+
+    if chart.image is not None:
+        image = bytes(chart.image)
+    else:
+        with render_slot():
+            image = LaSoTuVi.from_key(chart.key, chart.name).get_image_bytes()
+
+    cache.set(_image_cache_key(digest), image, getattr(settings, 'TUVI_IMAGE_CACHE_TIMEOUT', 3600))
+    return image
+
+
+def _get_render_slot(request: HttpRequest) -> Callable[[], ContextManager]:
+    # Set by AdmissionControlMiddleware, renders are unrestricted without it
+    return getattr(request, 'render_slot', nullcontext)
+
+
+def _set_permanent_cache_headers(response: HttpResponse, digest: str) -> HttpResponse:
+    # A permalink always shows the same chart, so browsers and proxies may keep it for good
+    response['ETag'] = f'"{digest}"'
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'TUVI_PERMALINK_MAX_AGE', 31536000), immutable=True)
+    return response
+
+
 def input_form(request: HttpRequest) -> HttpResponse:
     if request.method == 'GET':
         form = InputForm()
@@ -32,9 +141,11 @@ def input_form(request: HttpRequest) -> HttpResponse:
                 else:
                     gender = -1
 
-                horoscope = LaSoTuVi(year, month, day, hour, minute, gender=gender, cur_year=cur_year, hoten=name)
-                image = horoscope.get_image()
-                return render(request, 'tuvi/horoscope.html', {'image': image})
+                digest, image_bytes = _get_chart_image(year, month, day, hour, minute, gender, cur_year, name, _get_render_slot(request))
+                image = base64.b64encode(image_bytes).decode()
+                return render(request, 'tuvi/horoscope.html', {'image': image, 'digest': digest})
+            except RenderRejected:
+                raise
             except Exception as e:
                 print(traceback.format_exc())
                 return HttpResponseServerError()
@@ -42,3 +153,179 @@ def input_form(request: HttpRequest) -> HttpResponse:
         return render(request, 'tuvi/input_form.html', {'form': form})
     else:
         return HttpResponseNotAllowed()
+
+
+@require_safe
+def permalink(request: HttpRequest, digest: str) -> HttpResponse:
+    if request.headers.get('If-None-Match') == f'"{digest}"':
+        return _set_permanent_cache_headers(HttpResponseNotModified(), digest)
+
+    image = _get_permalink_image(digest, _get_render_slot(request))
+    if image is None:
+        raise Http404('Chart not found.')
+
+    response = render(request, 'tuvi/horoscope.html', {'image': base64.b64encode(image).decode(), 'digest': digest})
+    return _set_permanent_cache_headers(response, digest)
+
+
+@require_safe
+def permalink_image(request: HttpRequest, digest: str) -> HttpResponse:
+    if request.headers.get('If-None-Match') == f'"{digest}"':
+        return _set_permanent_cache_headers(HttpResponseNotModified(), digest)
+
+    image = _get_permalink_image(digest, _get_render_slot(request))
+    if image is None:
+        raise Http404('Chart not found.')
+
+    return _set_permanent_cache_headers(HttpResponse(image, content_type='image/png'), digest)
+
+
+WEEKDAY_NAMES = ['CN', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7']
+
+
+def _timezone(request: HttpRequest) -> Union[float, None]:
+    """
+    Return the timezone of the `tz` parameter, 7 by default, or None if it is invalid.
+    """
+
+    try:
+        timezone = float(request.GET.get('tz', 7))
+    except ValueError:
+        return None
+    # Offsets are whole quarters of an hour, e.g. 5.5 for India or 5.75 for Nepal
+    if not -12 <= timezone <= 14 or (timezone * 4) % 1:
+        return None
+    return int(timezone) if timezone.is_integer() else timezone
+
+
+@require_safe
+def lunar_calendar(request: HttpRequest, year: Union[int, None] = None, month: Union[int, None] = None) -> HttpResponse:
+    if year is None:
+        today = date.today()
+        year, month = today.year, today.month
+        max_age = 3600
+    else:
+        # The page of a given month never changes
+        max_age = getattr(settings, 'TUVI_CALENDAR_MAX_AGE', 86400)
+
+    if not 1 <= year <= 9999 or not 1 <= month <= 12:
+        raise Http404('Invalid month.')
+
+    timezone = _timezone(request)
+    if timezone is None:
+        return HttpResponseBadRequest('Invalid timezone.')
+
+    grid = CalendarUtil.month_grid(year, month, timezone)
+
+    if request.GET.get('format') == 'json':
+        cells = [{
+            'solar': f'{cell.solar.year:04d}-{cell.solar.month:02d}-{cell.solar.day:02d}',
+            'lunar_year': cell.lunar_year,
+            'lunar_month': cell.lunar_month,
+            'lunar_day': cell.lunar_day,
+            'leap': cell.leap,
+            'can_chi': ZodiacUtil.can_chi_name(*cell.can_chi),
+            'weekday': cell.weekday,
+            'in_month': cell.in_month,
+            'first_of_lunar_month': cell.first_of_lunar_month,
+        } for cell in grid]
+        response = JsonResponse({'year': year, 'month': month, 'timezone': timezone, 'cells': cells}, json_dumps_params={'ensure_ascii': False})
+    else:
+        weeks = [[(cell, ZodiacUtil.can_chi_name(*cell.can_chi)) for cell in grid[i:i + 7]] for i in range(0, len(grid), 7)]
+        previous_year, previous_month = (year, month - 1) if month > 1 else (year - 1, 12)
+        next_year, next_month = (year, month + 1) if month < 12 else (year + 1, 1)
+        response = render(request, 'tuvi/calendar.html', {
+            'year': year,
+            'month': month,
+            'timezone': timezone,
+            'weekday_names': [WEEKDAY_NAMES[cell.weekday] for cell in grid[:7]],
+            'weeks': weeks,
+            'previous': (previous_year, previous_month),
+            'next': (next_year, next_month),
+        })
+
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+@require_safe
+def good_days(request: HttpRequest, year: int, month: int) -> HttpResponse:
+    """
+    The good days of `months` solar months (1 by default, at most 12) from `month` of `year`, as JSON.
+    Optional parameters: `birth_year` (lunar year of birth) and `min_score` for the compatibility of the days
+    with it, `avoid_chi` (comma separated chi indices) and `tz`.
+    """
+
+    if not 1 <= year <= 9999 or not 1 <= month <= 12:
+        raise Http404('Invalid month.')
+
+    timezone = _timezone(request)
+    if timezone is None:
+        return HttpResponseBadRequest('Invalid timezone.')
+
+    try:
+        months = int(request.GET.get('months', 1))
+        birth_year = request.GET.get('birth_year')
+        birth_year_code = CompatibilityUtil.year_code(int(birth_year)) if birth_year else None
+        min_score = float(request.GET.get('min_score', 0))
+        avoid_chi = tuple(int(chi) for chi in request.GET.get('avoid_chi', '').split(',') if chi)
+    except ValueError:
+        return HttpResponseBadRequest('Invalid parameters.')
+    if not 1 <= months <= 12 or not math.isfinite(min_score) or not all(1 <= chi <= 12 for chi in avoid_chi):
+        return HttpResponseBadRequest('Invalid parameters.')
+
+    last_year, last_month = year + (month + months - 2) // 12, (month + months - 2) % 12 + 1
+    if last_year > 9999:
+        raise Http404('Invalid month.')
+    rules = DayRules(birth_year_code=birth_year_code, min_score=min_score, avoid_chi=avoid_chi)
+    days = [{
+        'solar': f'{day.solar.year:04d}-{day.solar.month:02d}-{day.solar.day:02d}',
+        'lunar_year': day.lunar_year,
+        'lunar_month': day.lunar_month,
+        'lunar_day': day.lunar_day,
+        'leap': day.leap,
+        'can_chi': ZodiacUtil.can_chi_name(*day.can_chi),
+        'weekday': day.weekday,
+        'score': day.score,
+    } for day in GoodDayUtil.find(year, month, last_year, last_month, rules, timezone)]
+
+    response = JsonResponse({'year': year, 'month': month, 'months': months, 'timezone': timezone, 'days': days}, json_dumps_params={'ensure_ascii': False})
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'TUVI_CALENDAR_MAX_AGE', 86400))
+    return response
+
+
+@staff_member_required
+@require_http_methods(['GET', 'HEAD', 'POST'])
+def caches(request: HttpRequest) -> HttpResponse:
+    """
+    The statistics of the memoization caches of `core` in the worker serving the request, as JSON, staff only.
+    `pattern` selects the caches as in `CacheRegistry`. A POST with `action` "clear", or "resize" and `maxsize`
+    (0 for unbounded), changes the selected caches first. `warmup` is the report of the warmup of the process
+    (see `warmup.warmup`): the seconds of each step and the size of every cache right after, or null without warmup.
+
+    Every worker has its own caches and one request reaches a single worker, whose `pid` is in the response:
+    repeat the request until every worker answered, or set TUVI_CACHE_SIZES and restart them for lasting sizes.
+    """
+
+    pattern = request.GET.get('pattern') or None
+    if not CacheRegistry.names(pattern):
+        return HttpResponseBadRequest('No cache matches the pattern.')
+
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'clear':
+            CacheRegistry.clear(pattern)
+        elif action == 'resize':
+            try:
+                maxsize = int(request.POST.get('maxsize', ''))
+            except ValueError:
+                return HttpResponseBadRequest('Invalid maxsize.')
+            if maxsize < 0:
+                return HttpResponseBadRequest('Invalid maxsize.')
+            CacheRegistry.resize(pattern, maxsize or None)
+        else:
+            return HttpResponseBadRequest('Invalid action.')
+
+    stats = [dict(s._asdict(), hit_rate=s.hit_rate) for s in CacheRegistry.stats(pattern, memory=request.GET.get('memory') != '0')]
+    report = warmup.last_report
+    return JsonResponse({'pid': os.getpid(), 'caches': stats, 'warmup': report._asdict() if report is not None else None})
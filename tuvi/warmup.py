@@ -0,0 +1,170 @@
+import datetime
+import gc
+import logging
+import time
+from typing import Callable, Dict, NamedTuple, Union
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from core.caches import CacheRegistry
+from core.calendar import CalendarUtil
+from core.draw import FONT_PATH, BOLD_FONT_PATH, FontSize, get_font
+from core.localizer import VNLocalizer
+from core.lunaryear import LunarYearUtil
+from core.main import LaSoTuVi
+from core.mixins import DateMixin
+from core.solarterms import SolarTermUtil
+from core.tables import LunarTable, NewMoonEphemeris
+from core.tuvi.elements.can import Can
+from core.tuvi.elements.chi import Chi
+from core.tuvi.elements.gioitinh import GioiTinh
+
+from .forms import InputForm
+
+
+logger = logging.getLogger(__name__)
+
+class WarmupReport(NamedTuple):
+    seconds: Dict[str, float]  # time spent in each step, plus the total
+    cache_sizes: Dict[str, int]  # entries of every cache in `CacheRegistry` once warm
+
+
+# Report of the last warmup run in this process, shown by the staff `caches` view. None until `warmup` is called.
+last_report: Union[WarmupReport, None] = None
+
+
+def _warm_fonts() -> None:
+    for path in [FONT_PATH, BOLD_FONT_PATH]:
+        for size in FontSize:
+            get_font(path, size.value)
+
+
+def _warm_new_moons() -> None:
+    """
+    Map the new moon ephemeris file written by `build_lunar_table` and install it, or build it in memory
+    if the file is missing. The file is never written here.
+    """
+
+    path = getattr(settings, 'TUVI_NEW_MOON_PATH', None)
+    if path is None:
+        return
+
+    first_year, last_year = getattr(settings, 'TUVI_NEW_MOON_YEARS', (1800, 2200))
+    NewMoonEphemeris.install(NewMoonEphemeris.load_or_build(str(path), *NewMoonEphemeris.k_range(first_year, last_year), save=False))
+
+
+def _warm_lunar_table() -> None:
+    """
+    Map the lunar table file of every timezone in `TUVI_LUNAR_TIMEZONES` written by `build_lunar_table`, or build
+    it in memory if the file is missing, install it and describe every lunar year it covers. Tables of other
+    timezones are loaded or built the first time a request needs them. Files are never written here.
+    """
+
+    path = getattr(settings, 'TUVI_LUNAR_TABLE_PATH', None)
+    if path is None:
+        return
+
+    first_year, last_year = getattr(settings, 'TUVI_LUNAR_TABLE_YEARS', (1899, 2100))
+    for timezone in getattr(settings, 'TUVI_LUNAR_TIMEZONES', (7,)):
+        LunarTable.install(LunarTable.load_or_build(LunarTable.path_for_timezone(str(path), timezone), first_year, last_year, timezone, save=False))
+        LunarYearUtil.precompute(first_year + 1, last_year - 1, timezone)
+    LunarTable.enable_lazy(first_year, last_year, str(path))
+
+
+def _warm_lunar_calendar(years: int) -> None:
+    """
+    Build the calendar page of every month around the current year, which also fills the new moon caches,
+    and the solar terms of these years.
+    """
+
+    this_year = datetime.date.today().year
+    SolarTermUtil.precompute(this_year - years - 1, this_year + years + 1)
+    for year in range(this_year - years, this_year + years + 1):
+        for month in range(1, 13):
+            CalendarUtil.month_grid(year, month)
+
+
+def _warm_small_caches() -> None:
+    for can in Can:
+        if can.value is not None:
+            VNLocalizer._localize(can.name.capitalize())
+    for chi in Chi:
+        if chi.value is not None:
+            VNLocalizer._localize(chi.name.capitalize())
+
+    for month in range(1, 13):
+        DateMixin.get_month_name(month)
+        DateMixin.days_of_month(month)
+    for day in range(1, 32):
+        DateMixin.get_ordinal(day)
+
+
+def _warm_chart() -> None:
+    """
+    Build and render one throwaway chart, so every star class and the whole drawing path have run once.
+    """
+
+    today = datetime.date.today()
+    horoscope = LaSoTuVi(2000, 1, 1, 12, 0, gender=GioiTinh.NAM.value, cur_year=today.year)
+    horoscope.get_image()
+
+
+def _warm_templates() -> None:
+    # Only compile the templates, rendering them needs the static files manifest which may not exist yet
+    get_template('tuvi/horoscope.html')
+    get_template('tuvi/input_form.html')
+    get_template('tuvi/calendar.html')
+    str(InputForm())
+
+
+def warmup(years: int = 1) -> WarmupReport:
+    """
+    Run every warmup step and return the time spent in each of them, plus the total, and the number of entries
+    of every cache afterwards. A failing step is logged and skipped, so warmup never prevents the worker from starting.
+    """
+
+    global last_report
+
+    steps: Dict[str, Callable[[], None]] = {
+        'fonts': _warm_fonts,
+        'new_moons': _warm_new_moons,
+        'lunar_table': _warm_lunar_table,
+        'lunar_calendar': lambda: _warm_lunar_calendar(years),
+        'small_caches': _warm_small_caches,
+        'chart': _warm_chart,
+        'templates': _warm_templates,
+    }
+
+    seconds: Dict[str, float] = {}
+    start = time.perf_counter()
+    for name, step in steps.items():
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception('Warmup step %s failed.', name)
+        seconds[name] = time.perf_counter() - step_start
+
+    seconds['total'] = time.perf_counter() - start
+
+    cache_sizes = {stats.name: stats.size for stats in CacheRegistry.stats(memory=False)}
+    last_report = WarmupReport(seconds, cache_sizes)
+    logger.info('Warmup finished in %.3fs (%s), %d cache entries.', seconds['total'], ', '.join(f'{name}={value:.3f}s' for name, value in seconds.items() if name != 'total'), sum(cache_sizes.values()))
+    return last_report
+
+
+def warm_server() -> None:
+    """
+    Prepare the server process before it accepts traffic, called from the WSGI and ASGI modules only, so management
+    commands and tests never pay for it. Under `gunicorn --preload` this runs once, in the master, and every forked
+    worker starts warm.
+    """
+
+    if getattr(settings, 'TUVI_WARMUP', False):
+        warmup(years=getattr(settings, 'TUVI_WARMUP_YEARS', 1))
+
+    # Move everything allocated so far out of the collector's reach. The collector would otherwise
+    # write to the header of every object on each full collection, unsharing the pages after fork.
+    if getattr(settings, 'TUVI_GC_FREEZE', False):
+        gc.freeze()